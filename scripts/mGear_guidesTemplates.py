@@ -16,6 +16,12 @@ def buildFromSelection(*args):
     gui.Guide_UI.buildFromSelection()
 
 
+def updateFromSelection(*args):
+    """Update the rig built from the selected guide root, rebuilding only
+    the modified components"""
+    gui.Guide_UI.updateFromSelection()
+
+
 def updateGuide(*args):
     """Update the guide rig"""
     if pm.selected():
@@ -24,6 +24,7 @@ from mgear.maya.rigbits import (
 from mGear_guidesTemplates import (
     guideUI,
     buildFromSelection,
+    updateFromSelection,
     bipedGuide,
     quadrupedGuide,
     updateGuide
@@ -63,6 +64,8 @@ def createMenu():
     pm.menuItem(divider=True)
     pm.menuItem(label="Build From Selection",
                 command=buildFromSelection)
+    pm.menuItem(label="Update Rig From Selection",
+                command=updateFromSelection)
     pm.menuItem(divider=True)
     pm.menuItem(label="Import Biped Guide",
                 command=bipedGuide)
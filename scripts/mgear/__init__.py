@@ -2,6 +2,10 @@
 
 import os
 import sys
+import json
+import time
+import contextlib
+import collections
 import exceptions
 
 # Debug mode for the logger
@@ -15,6 +19,12 @@ sev_info = 8
 sev_verbose = 16
 sev_comment = 32
 
+# Messages with a severity value above the level are not logged
+logLevel = sev_comment
+
+# The last logged messages are kept in memory, see getLogRecords()
+logBufferSize = 1000
+
 # gear version
 VERSION = [2, 6, 1]
 
@@ -122,6 +132,41 @@ def toggleDebug():
     return logDebug
 
 
+def setLogLevel(level):
+    """Set the severity level of the logged messages.
+
+    The messages with a less important severity are ignored, before the
+    message is formatted.
+
+    Args:
+        level (int): The severity level, ie. mgear.sev_warning logs the
+            fatal, error and warning messages.
+
+    Returns:
+        int: The previous level
+
+    """
+    global logLevel
+    original_value = logLevel
+    logLevel = level
+    return original_value
+
+
+def isLogged(severity):
+    """Check if the messages of a severity are logged.
+
+    Used to skip building an expensive message.
+
+    Args:
+        severity (int): Severity level.
+
+    Returns:
+        bool: True if the messages are logged
+
+    """
+    return severity <= logLevel
+
+
 def log(message, severity=sev_comment, infos=False):
     """Log a message using severity and additional info from the file itself.
 
@@ -133,6 +178,10 @@ def log(message, severity=sev_comment, infos=False):
         * 16. Verbose
         * 32. Comment
 
+    Inside a bufferedLog block the messages are written when the block
+    ends or when flushLog is called. Fatal and error messages are always
+    written immediately.
+
     Args:
         messages(str): The message
         severity (int): Severity level.
@@ -140,12 +189,101 @@ def log(message, severity=sev_comment, infos=False):
             line number.
 
     """
+    if severity > logLevel:
+        return
+
     message = str(message)
 
     if infos or logDebug:
         message = getInfos(1) + "\n" + message
 
-    sys.stdout.write(message + "\n")
+    record = (time.time(), severity, message)
+    _logRecords.append(record)
+    _logPending.append(record)
+
+    if not _logBufferDepth or severity <= sev_error:
+        flushLog()
+
+
+def flushLog():
+    """Write the pending messages to the output and to the log file."""
+    if not _logPending:
+        return
+
+    sys.stdout.write("".join([r[2] + "\n" for r in _logPending]))
+    if _logFile is not None:
+        _logFile.write("".join([json.dumps({"time": t,
+                                            "severity": sev,
+                                            "message": msg}) + "\n"
+                                for t, sev, msg in _logPending]))
+        _logFile.flush()
+
+    del _logPending[:]
+
+
+@contextlib.contextmanager
+def bufferedLog():
+    """Defer the output of the logged messages to the end of the block.
+
+    The blocks can be nested, the messages are written when the outer
+    block ends.
+
+    >>> with mgear.bufferedLog():
+    ...     mgear.log("Written at the end of the block")
+
+    """
+    global _logBufferDepth
+    _logBufferDepth += 1
+    try:
+        yield
+    finally:
+        _logBufferDepth -= 1
+        if not _logBufferDepth:
+            flushLog()
+
+
+def setLogFile(filePath=None):
+    """Write the logged messages to a file too, as JSON lines.
+
+    Each line is an object with the time, severity and message keys.
+
+    Args:
+        filePath (str, optional): The file path, the messages are appended
+            to an existing file. None closes the current log file.
+
+    """
+    global _logFile
+    flushLog()
+    if _logFile is not None:
+        _logFile.close()
+        _logFile = None
+    if filePath:
+        _logFile = open(filePath, "a")
+
+
+def getLogRecords(severity=sev_comment):
+    """Get the last logged messages.
+
+    Args:
+        severity (int, optional): Only get the messages of this severity
+            level and the more important ones.
+
+    Returns:
+        list: (time, severity, message) tuples. The number of messages is
+            limited by mgear.logBufferSize.
+
+    """
+    global _logRecords
+    if _logRecords.maxlen != logBufferSize:
+        _logRecords = collections.deque(_logRecords, logBufferSize)
+
+    return [r for r in _logRecords if r[1] <= severity]
+
+
+_logRecords = collections.deque(maxlen=logBufferSize)
+_logPending = []
+_logBufferDepth = 0
+_logFile = None
 
 # ========================================================
 # Exception
@@ -137,8 +137,11 @@ def list_crank_layer_nodes():
     Returns:
         dagNode list: List of all the Crank layer nodes
     """
-    return [sm for sm in cmds.ls(type="transform") if cmds.attributeQuery(
-        CRANK_TAG, node=sm, exists=True)]
+    # the attribute lookup doesn't need to check every transform
+    return cmds.ls("*." + CRANK_TAG,
+                   objectsOnly=True,
+                   recursive=True,
+                   type="transform")
 
 
 def get_layer_affected_elements(layer_node):
@@ -240,19 +243,9 @@ def add_frame_sculpt(layer_node, anim=False, keyf=[1, 0, 0, 1]):
                            outTangentType="linear")
 
     for obj, bsn in zip(objs, bs_node):
-        dup = pm.duplicate(obj)[0]
-        # bst_name = "_".join([obj.name(), frame_name])
         bst_name = "_".join([obj.stripNamespace(), frame_name])
-        pm.rename(dup, bst_name)
         indx = bsn.weight.getNumElements()
-        pm.blendShape(bsn,
-                      edit=True,
-                      t=(obj, indx, dup, 1.0),
-                      ts=True,
-                      tc=True,
-                      w=(indx, 1))
-        pm.delete(dup)
-        pm.blendShape(bsn, e=True, rtd=(0, indx))
+        _add_delta_target(bsn.name(), indx, bst_name)
         # is same as: bs.inputTarget[0].sculptTargetIndex.set(3)
         pm.sculptTarget(bsn, e=True, t=indx)
 
@@ -260,6 +253,32 @@ def add_frame_sculpt(layer_node, anim=False, keyf=[1, 0, 0, 1]):
         pm.connectAttr(master_chn, bsn.attr(bst_name))
 
 
+def _add_delta_target(bs_name, indx, target_name):
+    """Add an empty target to a blendshape node
+
+    The target is stored as delta arrays, only the sculpted vertices are
+    stored. So we don't need to duplicate the mesh to create the target and
+    the size of the file doesn't grow with the number of sculpt frames.
+
+    Args:
+        bs_name (str): The blendshape node name
+        indx (int): The target index
+        target_name (str): The target name (weight alias)
+    """
+    weight = "{}.weight[{}]".format(bs_name, indx)
+    cmds.setAttr(weight, 1.0)
+    cmds.aliasAttr(target_name, weight)
+
+    group = "{}.inputTarget[0].inputTargetGroup[{}]".format(bs_name, indx)
+    item = group + ".inputTargetItem[6000]"
+    cmds.setAttr(item + ".inputPointsTarget", 0, type="pointArray")
+    cmds.setAttr(item + ".inputComponentsTarget", 0, type="componentList")
+
+    # tangent space deltas, same as blendShape -tangentSpace
+    if cmds.objExists(group + ".postDeformersMode"):
+        cmds.setAttr(group + ".postDeformersMode", 1)
+
+
 def edit_sculpt_frame():
     """Edit the sculpt frame selected in the channel box.
     Multiple layers can be edited at the same time.
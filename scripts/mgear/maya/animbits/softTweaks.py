@@ -13,6 +13,7 @@ http://bindpose.com/help-animators-fix-intersections-softmod-deformer/
 
 import json
 
+from maya import cmds
 import pymel.core as pm
 from pymel.core import datatypes
 
@@ -353,66 +354,88 @@ def _listSoftModTweaks(is_asset=False):
         tag_name = ASSET_TAG
     else:
         tag_name = SHOT_TAG
-    return [sm for sm in pm.ls(type="softMod") if sm.hasAttr(tag_name)]
+    # the attribute lookup doesn't need to check every softMod
+    return [pm.PyNode(sm) for sm in cmds.ls("*." + tag_name,
+                                            objectsOnly=True,
+                                            recursive=True,
+                                            type="softMod")]
+
+
+def _getLocalMatrix(node):
+    # local matrix as a 4x4 nested list, like datatypes.Matrix.get()
+    m = cmds.getAttr(node + ".matrix")
+    return [m[i:i + 4] for i in range(0, 16, 4)]
 
 
 def _buildConfigDict(softMods=[]):
     """build the config dictionary softMod list
 
+    The controls and groups connections of all the softMods are resolved
+    with a single query for each relation.
+
     Returns:
         dic: SoftMod tweaks configuration
     """
     configDict = {}
 
     # Softmods list
-    configDict["softMods"] = [sm.name() for sm in softMods]
-
-    for sm in softMods:
+    smNames = [str(sm) for sm in softMods]
+    configDict["softMods"] = smNames
+
+    # controls connections
+    plugs = ["{}.{}".format(sm, at) for sm in smNames
+             for at in ("ctlRoot", "ctlBase", "ctlTweak")]
+    cnx = cmds.listConnections(plugs,
+                               source=True,
+                               destination=False,
+                               connections=True) if plugs else None
+    cnx = cnx or []
+    ctlDict = dict(zip(cnx[::2], cnx[1::2]))
+
+    # grp connections
+    ctls = [ctlDict["{}.ctlTweak".format(sm)] for sm in smNames]
+    plugs = [ctl + ".instObjGroups" for ctl in ctls]
+    cnx = cmds.listConnections(plugs,
+                               source=False,
+                               destination=True,
+                               connections=True) if plugs else None
+    cnx = cnx or []
+    grpDict = {}
+    for plug, grp in zip(cnx[::2], cnx[1::2]):
+        grpDict.setdefault(plug.split(".")[0], []).append(grp)
+
+    for sm, ctl in zip(smNames, ctls):
         softModConfig = {}
-        root = sm.ctlRoot.listConnections(p=True)[0].node()
-        baseCtl = sm.ctlBase.listConnections(p=True)[0].node()
-        ctl = sm.ctlTweak.listConnections(p=True)[0].node()
+        root = ctlDict["{}.ctlRoot".format(sm)]
+        baseCtl = ctlDict["{}.ctlBase".format(sm)]
 
         # base name without the extension_softMod
-        # softModConfig["name"] = sm.name().replace("_softMod", "")
-        softModConfig["name"] = "_".join(sm.name().split("_")[:-1])
+        softModConfig["name"] = "_".join(sm.split("_")[:-1])
         # name extension
-        softModConfig["nameExt"] = sm.name().split("_")[-1]
+        softModConfig["nameExt"] = sm.split("_")[-1]
         # is asset
-        softModConfig["isAsset"] = sm.hasAttr(ASSET_TAG)
+        softModConfig["isAsset"] = cmds.attributeQuery(ASSET_TAG,
+                                                       node=sm,
+                                                       exists=True)
         # fallof value
-        softModConfig["falloff"] = ctl.falloff.get()
+        softModConfig["falloff"] = cmds.getAttr(ctl + ".falloff")
         # affected objects
-        # print _getAffectedObjects(sm)
-        softModConfig["affected"] = _getAffectedObjects(sm)
+        shapes = cmds.softMod(sm, q=True, geometry=True) or []
+        softModConfig["affected"] = cmds.listRelatives(
+            shapes, parent=True) if shapes else []
         # root parent
-        if root.getParent():
-            parentName = root.getParent().name()
-        else:
-            parentName = None
-        softModConfig["rootParent"] = parentName
+        parent = cmds.listRelatives(root, parent=True)
+        softModConfig["rootParent"] = parent[0] if parent else None
         # icons size
-        softModConfig["iconSize"] = root.iconSize.get()
-        # root matrix
-        m = root.getMatrix(objectSpace=True)
-        softModConfig["rootMatrix"] = m.get()
-        # ctl base matrix
-        m = baseCtl.getMatrix(objectSpace=True)
-        softModConfig["baseCtlMatrix"] = m.get()
-        # ctl matrix
-        m = ctl.getMatrix(objectSpace=True)
-        softModConfig["ctlMatrix"] = m.get()
+        softModConfig["iconSize"] = cmds.getAttr(root + ".iconSize")
+        # root, ctl base and ctl matrix
+        softModConfig["rootMatrix"] = _getLocalMatrix(root)
+        softModConfig["baseCtlMatrix"] = _getLocalMatrix(baseCtl)
+        softModConfig["ctlMatrix"] = _getLocalMatrix(ctl)
         # grp name
-        # oSet = root.grp.listConnections(p=True)
-        oSet = ctl.instObjGroups.listConnections()
-        if oSet:
-            # grp = oSet[0].node().name()
-            grp = [g.name() for g in oSet]
-        else:
-            grp = None
-        softModConfig["grpName"] = grp
+        softModConfig["grpName"] = grpDict.get(ctl) or None
 
-        configDict[sm.name()] = softModConfig
+        configDict[sm] = softModConfig
 
     return configDict
 
@@ -442,14 +465,20 @@ def exportConfiguration(softMods):
 
 
 def _importConfiguration(configDict):
+    # resolve all the affected objects at once
+    affected = set()
+    for sm in configDict["softMods"]:
+        affected.update(configDict[sm]["affected"])
+    existing = set(cmds.ls(list(affected)) or []) if affected else set()
+
     with pm.UndoChunk():
         for sm in configDict["softMods"]:
             smConfig = configDict[sm]
             targets = []
             for t in smConfig["affected"]:
-                try:
+                if t in existing:
                     targets.append(pm.PyNode(t))
-                except pm.MayaNodeError:
+                else:
                     pm.displayWarning("{}: has not been found in the scene "
                                       "and will be skipped".format(t))
 
@@ -459,24 +488,27 @@ def _importConfiguration(configDict):
             grp = smConfig["grpName"]
             is_asset = smConfig["isAsset"]
             nameExt = smConfig["nameExt"]
-            rootMatrix = datatypes.Matrix(smConfig["rootMatrix"])
-            softModNode, baseCtl, tweakCtl = createSoftTweak(name,
-                                                             targets=targets,
-                                                             parent=parent,
-                                                             t=rootMatrix,
-                                                             grp=grp,
-                                                             size=size,
-                                                             nameExt=nameExt,
-                                                             is_asset=is_asset)
+            # the matrices are stored in local space, so the tweak is
+            # created at the origin and the local matrices are set once
+            softModNode, baseCtl, tweakCtl = createSoftTweak(
+                name,
+                targets=targets,
+                parent=parent,
+                t=datatypes.Matrix(),
+                grp=grp,
+                size=size,
+                nameExt=nameExt,
+                is_asset=is_asset)
             if softModNode:
-                ctlBaseMatrix = datatypes.Matrix(smConfig["baseCtlMatrix"])
-                ctlMatrix = datatypes.Matrix(smConfig["ctlMatrix"])
-                baseCtl.setMatrix(ctlBaseMatrix, objectSpace=True)
-                tweakCtl.setMatrix(ctlMatrix, objectSpace=True)
-                tweakCtl.falloff.set(smConfig["falloff"])
-                # we have to set the matrix again on the root because is stored
-                # in local space
-                baseCtl.getParent().setMatrix(rootMatrix, objectSpace=True)
+                for n, key in ((baseCtl, "baseCtlMatrix"),
+                               (tweakCtl, "ctlMatrix"),
+                               (baseCtl.getParent(), "rootMatrix")):
+                    m = smConfig[key]
+                    if isinstance(m[0], list):
+                        m = [v for row in m for v in row]
+                    cmds.xform(n.name(), matrix=m, objectSpace=True)
+                cmds.setAttr(tweakCtl.name() + ".falloff",
+                             smConfig["falloff"])
 
 # import softTweaker configuration from file
 
@@ -13,7 +13,8 @@ Operators are any node that connected to other nodes creates a rig behaviour::
 # GLOBAL
 #############################################
 import pymel.core as pm
-from pymel.core import datatypes
+
+from . import node as nod
 
 #############################################
 # BUILT IN NODES
@@ -303,26 +304,14 @@ def gear_mulmatrix_op(mA, mB, target=False, transform='srt'):
         pyNode: Newly created mGear_multMatrix node
 
     """
-    node = pm.createNode("mgear_mulMatrix")
+    nb = nod.getNetworkBuilder()
+    node = nb.createNode("mgear_mulMatrix")
     for m, mi in zip([mA, mB], ['matrixA', 'matrixB']):
-        if isinstance(m, datatypes.Matrix):
-            pm.setAttr(node.attr(mi), m)
-        else:
-            pm.connectAttr(m, node.attr(mi))
+        nod.connectSet(nb, m, node + "." + mi)
     if target:
-        dm_node = pm.createNode("decomposeMatrix")
-        pm.connectAttr(node + ".output", dm_node + ".inputMatrix")
-        if 't' in transform:
-            pm.connectAttr(dm_node + ".outputTranslate",
-                           target.attr("translate"), f=True)
-        if 'r' in transform:
-            pm.connectAttr(dm_node + ".outputRotate",
-                           target.attr("rotate"), f=True)
-        if 's' in transform:
-            pm.connectAttr(dm_node + ".outputScale",
-                           target.attr("scale"), f=True)
+        nod.connectDecomposedMatrix(nb, node + ".output", target, transform)
 
-    return node
+    return nod.getBuiltNode(nb, node)
 
 
 def gear_intmatrix_op(mA, mB, blend=0):
@@ -337,19 +326,15 @@ def gear_intmatrix_op(mA, mB, blend=0):
     Returns:
         pyNode: Newly created mGear_intMatrix node
     """
-    node = pm.createNode("mgear_intMatrix")
+    nb = nod.getNetworkBuilder()
+    node = nb.createNode("mgear_intMatrix")
 
-    pm.connectAttr(mA, node + ".matrixA")
-    pm.connectAttr(mB, node + ".matrixB")
+    nb.connect(mA, node + ".matrixA")
+    nb.connect(mB, node + ".matrixB")
 
-    if (isinstance(blend, str)
-        or isinstance(blend, unicode)
-            or isinstance(blend, pm.Attribute)):
-        pm.connectAttr(blend, node + ".blend")
-    else:
-        pm.setAttr(node + ".blend", blend)
+    nod.connectSet(nb, blend, node + ".blend")
 
-    return node
+    return nod.getBuiltNode(nb, node)
 
 
 def gear_curvecns_op(crv, inputs=[]):
@@ -4,9 +4,11 @@
 # GLOBAL
 #############################################
 import collections
+import datetime
 import mgear
 import pymel.core as pm
 import maya.cmds as cmds
+import maya.OpenMaya as OpenMaya
 import pymel.core.datatypes as datatypes
 
 
@@ -206,6 +208,315 @@ def addEnumAttribute(node,
     return node.attr(longName)
 
 
+_NUMERIC_TYPES = {"bool": OpenMaya.MFnNumericData.kBoolean,
+                  "long": OpenMaya.MFnNumericData.kLong,
+                  "short": OpenMaya.MFnNumericData.kShort,
+                  "byte": OpenMaya.MFnNumericData.kByte,
+                  "char": OpenMaya.MFnNumericData.kChar,
+                  "float": OpenMaya.MFnNumericData.kFloat,
+                  "double": OpenMaya.MFnNumericData.kDouble}
+
+_UNIT_TYPES = {"doubleAngle": OpenMaya.MAngle,
+               "doubleLinear": OpenMaya.MDistance,
+               "time": OpenMaya.MTime}
+
+
+class AttributeBatch(object):
+    """Create the attributes of one or more nodes in a single pass.
+
+    The attributes are defined with the same arguments as addAttribute,
+    addEnumAttribute and addColorAttribute, then doIt() creates all of them
+    with their default values and flags with a single MDGModifier. The plugs
+    are returned as names, no PyMEL Attribute is created.
+
+    NOTE: The changes done by the modifier are not in Maya undo queue, use
+    undoIt() to remove the attributes.
+
+    Example:
+        >>> batch = attribute.AttributeBatch()
+        >>> plugs = batch.add(ctls, "invTx", "bool", 0, keyable=False)
+        >>> batch.doIt()
+
+    """
+
+    def __init__(self):
+        self.attributes = []
+        self.modifier = None
+        self.timings = []
+        self._nodes = {}
+        self._planned = set()
+        self._pending = []
+
+    def _resolveNode(self, node):
+        key = node if isinstance(node, basestring) else node.name()
+        if key not in self._nodes:
+            sel = OpenMaya.MSelectionList()
+            sel.add(key)
+            mobject = OpenMaya.MObject()
+            sel.getDependNode(0, mobject)
+            if mobject.hasFn(OpenMaya.MFn.kDagNode):
+                dagPath = OpenMaya.MDagPath()
+                sel.getDagPath(0, dagPath)
+                name = dagPath.partialPathName()
+            else:
+                name = OpenMaya.MFnDependencyNode(mobject).name()
+            self._nodes[key] = (mobject, name)
+        return self._nodes[key]
+
+    def hasAttr(self, node, longName):
+        """Check if the node has the attribute or if it is already planned
+
+        Arguments:
+            node (dagNode or str): The node
+            longName (str): The attribute name
+
+        Returns:
+            bool: True if the attribute exists or is planned
+
+        """
+        mobject, name = self._resolveNode(node)
+        if (name, longName) in self._planned:
+            return True
+        return OpenMaya.MFnDependencyNode(mobject).hasAttribute(longName)
+
+    def _add(self, nodes, longName, definition):
+        if isinstance(nodes, (list, tuple)):
+            return [self._add(n, longName, definition) for n in nodes]
+
+        mobject, name = self._resolveNode(nodes)
+        if self.hasAttr(nodes, longName):
+            mgear.log("Attribute '{}.{}' already exists".format(
+                name, longName), mgear.sev_warning)
+            return
+
+        attr = dict(definition)
+        attr["node"] = mobject
+        attr["nodeName"] = name
+        attr["longName"] = longName
+        self._planned.add((name, longName))
+        self.attributes.append(attr)
+        self._pending.append(attr)
+        return "{}.{}".format(name, longName)
+
+    def add(self,
+            nodes,
+            longName,
+            attributeType,
+            value=None,
+            niceName=None,
+            shortName=None,
+            minValue=None,
+            maxValue=None,
+            keyable=True,
+            readable=True,
+            storable=True,
+            writable=True,
+            channelBox=False):
+        """Plan an attribute, same arguments as addAttribute
+
+        Arguments:
+            nodes (dagNode, str or list): The node or the nodes to add the
+                new attribute.
+            longName (str): The attribute name.
+            attributeType (str): The Attribute Type. Exp: 'string', 'bool',
+                'long', 'double', 'doubleAngle'...
+            value (float or int): The default value.
+            niceName (str): The attribute nice name. (optional)
+            shortName (str): The attribute short name. (optional)
+            minValue (float or int): minimum value. (optional)
+            maxValue (float or int): maximum value. (optional)
+            keyable (bool): Set if the attribute is keyable or not.
+            readable (bool): Set if the attribute is readable or not.
+            storable (bool): Set if the attribute is storable or not.
+            writable (bool): Set if the attribute is writable or not.
+            channelBox (bool): Set if the attribute is in the channelBox or
+                not, when the attribute is not keyable.
+
+        Returns:
+            str or list: The plug name. i.e: "arm_L0_fk0_ctl.invTx", or a
+                list of names if a list of nodes is given. None if the
+                attribute already exists.
+
+        """
+        if (attributeType != "string"
+                and attributeType not in _NUMERIC_TYPES
+                and attributeType not in _UNIT_TYPES):
+            raise ValueError("Unsupported attribute type: " + attributeType)
+
+        if minValue is False:
+            minValue = None
+        if maxValue is False:
+            maxValue = None
+
+        return self._add(nodes, longName, {"type": attributeType,
+                                           "value": value,
+                                           "niceName": niceName,
+                                           "shortName": shortName,
+                                           "min": minValue,
+                                           "max": maxValue,
+                                           "keyable": keyable,
+                                           "readable": readable,
+                                           "storable": storable,
+                                           "writable": writable,
+                                           "channelBox": channelBox})
+
+    def addEnum(self,
+                nodes,
+                longName,
+                value,
+                enum,
+                niceName=None,
+                shortName=None,
+                keyable=True,
+                readable=True,
+                storable=True,
+                writable=True):
+        """Plan an enum attribute, same arguments as addEnumAttribute
+
+        Returns:
+            str or list: The plug name or names
+
+        """
+        return self._add(nodes, longName, {"type": "enum",
+                                           "value": value,
+                                           "enum": enum,
+                                           "niceName": niceName,
+                                           "shortName": shortName,
+                                           "keyable": keyable,
+                                           "readable": readable,
+                                           "storable": storable,
+                                           "writable": writable,
+                                           "channelBox": False})
+
+    def addColor(self,
+                 nodes,
+                 longName,
+                 value=False,
+                 keyable=True,
+                 readable=True,
+                 storable=True,
+                 writable=True,
+                 niceName=None,
+                 shortName=None):
+        """Plan a color attribute, same arguments as addColorAttribute
+
+        Returns:
+            str or list: The plug name or names
+
+        """
+        return self._add(nodes, longName, {"type": "float3",
+                                           "value": value,
+                                           "niceName": niceName,
+                                           "shortName": shortName,
+                                           "keyable": keyable,
+                                           "readable": readable,
+                                           "storable": storable,
+                                           "writable": writable,
+                                           "channelBox": False})
+
+    def doIt(self):
+        """Create the planned attributes
+
+        doIt can be called again after planning more attributes, only the
+        new ones are created.
+
+        Returns:
+            MDGModifier: The modifier
+
+        """
+        if self.modifier is None:
+            self.modifier = OpenMaya.MDGModifier()
+
+        pending = self._pending
+        self._pending = []
+
+        start = datetime.datetime.now()
+        for attr in pending:
+            self.modifier.addAttribute(attr["node"], _createAttribute(attr))
+        self.modifier.doIt()
+
+        # the string default values are not saved with the scene, the value
+        # is set on the plug like addAttribute does
+        strings = [a for a in pending if a["type"] == "string" and a["value"]]
+        for attr in strings:
+            plug = OpenMaya.MFnDependencyNode(attr["node"]).findPlug(
+                attr["longName"], False)
+            self.modifier.newPlugValueString(plug, attr["value"])
+        if strings:
+            self.modifier.doIt()
+        self.timings.append(("Create {} attributes".format(len(pending)),
+                             datetime.datetime.now() - start))
+
+        return self.modifier
+
+    def undoIt(self):
+        """Remove the created attributes"""
+        if self.modifier:
+            self.modifier.undoIt()
+            self.modifier = None
+        self._pending = []
+        self._planned = set()
+        self.attributes = []
+
+
+def _createAttribute(attr):
+    longName = attr["longName"]
+    shortName = attr["shortName"] or longName
+    attrType = attr["type"]
+    value = attr["value"]
+
+    if attrType == "enum":
+        fn = OpenMaya.MFnEnumAttribute()
+        attrObj = fn.create(longName, shortName, value or 0)
+        for i, field in enumerate(attr["enum"]):
+            fn.addField(field, i)
+
+    elif attrType == "string":
+        fn = OpenMaya.MFnTypedAttribute()
+        attrObj = fn.create(longName, shortName, OpenMaya.MFnData.kString)
+
+    elif attrType == "float3":
+        children = []
+        for s, v in zip("rgb", value or [0, 0, 0]):
+            childName = "{}_{}".format(longName, s)
+            children.append(OpenMaya.MFnNumericAttribute().create(
+                childName, childName, OpenMaya.MFnNumericData.kFloat, v))
+        fn = OpenMaya.MFnNumericAttribute()
+        attrObj = fn.create(longName, shortName, *children)
+        fn.setUsedAsColor(True)
+
+    elif attrType in _UNIT_TYPES:
+        # the values are in UI units, like the setAttr of addAttribute
+        unit = _UNIT_TYPES[attrType]
+        fn = OpenMaya.MFnUnitAttribute()
+        attrObj = fn.create(longName, shortName,
+                            unit(value or 0, unit.uiUnit()))
+        if attr["min"] is not None:
+            fn.setMin(unit(attr["min"], unit.uiUnit()))
+        if attr["max"] is not None:
+            fn.setMax(unit(attr["max"], unit.uiUnit()))
+
+    else:
+        fn = OpenMaya.MFnNumericAttribute()
+        attrObj = fn.create(longName, shortName,
+                            _NUMERIC_TYPES[attrType], value or 0)
+        if attr["min"] is not None:
+            fn.setMin(attr["min"])
+        if attr["max"] is not None:
+            fn.setMax(attr["max"])
+
+    fn.setKeyable(attr["keyable"])
+    fn.setReadable(attr["readable"])
+    fn.setStorable(attr["storable"])
+    fn.setWritable(attr["writable"])
+    if attr["channelBox"] and not attr["keyable"]:
+        fn.setChannelBox(True)
+    if attr["niceName"] is not None:
+        fn.setNiceNameOverride(attr["niceName"])
+
+    return attrObj
+
+
 def addProxyAttribute(sourceAttrs, targets, duplicatedPolicy=None):
     """Add proxy paramenter to a list of target dagNode
     Duplicated channel policy, stablish the rule in case the channel already
@@ -377,6 +688,435 @@ def moveChannel(attr, sourceNode, targetNode, duplicatedPolicy=None):
                           "types." % atType)
 
 
+def _getPlug(name):
+    sel = OpenMaya.MSelectionList()
+    try:
+        sel.add(name)
+    except RuntimeError:
+        return None
+    plug = OpenMaya.MPlug()
+    sel.getPlug(0, plug)
+    return plug
+
+
+class ChannelOperations(object):
+    """Plan channel moves and proxies, then apply them in a single pass.
+
+    All the nodes and channels are resolved and the moves, proxies and
+    reconnections are planned before any change is done in the scene. The
+    moves are applied by a single MDGModifier, diff() returns the planned
+    changes without applying them (dry run).
+
+    NOTE: The changes done by the MDGModifier are not in Maya undo queue,
+    use undoIt() to revert them. moveChannel() and addProxyAttribute() are
+    still available for single undoable operations.
+
+    Arguments:
+        nodes (list of str, optional): The names of the nodes to resolve
+            before planning the operations.
+
+    Example:
+        >>> ops = att.ChannelOperations(["armUI_R0_ctl", "armUI_L0_ctl"])
+        >>> ops.addMove("shoulder_ik", "armUI_R0_ctl", "armUI_L0_ctl")
+        >>> print "\n".join(ops.diff())
+        >>> ops.doIt()
+
+    """
+
+    def __init__(self, nodes=None):
+        self.moves = []
+        self.proxies = []
+        self.warnings = []
+        self.timings = []
+        self.modifier = None
+        self._nodes = {}
+        self._planned = {}
+        if nodes:
+            self.resolveNodes(nodes)
+
+    def _warning(self, message):
+        self.warnings.append(message)
+        pm.displayWarning(message)
+
+    def resolveNodes(self, names):
+        """Resolve the nodes used by the operations
+
+        Arguments:
+            names (list of str): The node names
+
+        """
+        start = datetime.datetime.now()
+        sel = OpenMaya.MSelectionList()
+        for name in set(str(n) for n in names):
+            if name in self._nodes:
+                continue
+            sel.clear()
+            try:
+                sel.add(name)
+            except RuntimeError:
+                self._nodes[name] = None
+                continue
+            mobject = OpenMaya.MObject()
+            sel.getDependNode(0, mobject)
+            self._nodes[name] = mobject
+        self.timings.append(("Resolve nodes",
+                             datetime.datetime.now() - start))
+
+    def _getNode(self, name):
+        if name not in self._nodes:
+            self.resolveNodes([name])
+        return self._nodes[name]
+
+    def hasAttr(self, node, attr):
+        """Check if a node has a channel once the planned operations are done
+
+        Arguments:
+            node (str): The node name
+            attr (str): The channel name
+
+        Returns:
+            bool: True if the channel exists
+
+        """
+        if (node, attr) in self._planned:
+            return self._planned[(node, attr)]
+        mobject = self._getNode(node)
+        if mobject is None:
+            return False
+        return OpenMaya.MFnDependencyNode(mobject).hasAttribute(attr)
+
+    def _findDuplicatedName(self, attr, sourceName, targetName,
+                            duplicatedPolicy):
+        if duplicatedPolicy == "index":
+            i = 0
+            while self.hasAttr(targetName, attr + str(i)):
+                i += 1
+            return attr + str(i)
+        elif duplicatedPolicy == "fullName":
+            return "{}_{}".format(sourceName, attr)
+
+    def addMove(self, attr, sourceNode, targetNode, duplicatedPolicy=None):
+        """Plan a channel move keeping the output connections.
+
+        Same rules and duplicated channel policies than moveChannel()
+
+        Arguments:
+            attr (str): Name of the channel to move
+            sourceNode (PyNode or str): The source node with the channel
+            targetNode (PyNode or str): The target node for the channel
+            duplicatedPolicy (None, str): Set the duplicated channel policy
+
+        Returns:
+            dict: The planned move. None if the move is not possible and
+                False if the channel already exist on the target without
+                duplicated policy.
+
+        """
+        sourceName = str(sourceNode)
+        targetName = str(targetNode)
+        source = self._getNode(sourceName)
+        # a channel moved or removed by a previous operation
+        if source is None or self._planned.get((sourceName, attr)) is False:
+            self._warning("Looks like the {} is not in the source: {}"
+                          .format(attr, sourceName))
+            return
+        if self._getNode(targetName) is None:
+            self._warning("Looks like the target {} of {} doesn't exist"
+                          .format(targetName, attr))
+            return
+
+        # a channel created by a previous move is moved again
+        previous = self._getPlannedMove(sourceName, attr)
+        if previous is not None and not previous["merge"]:
+            return self._chainMove(previous, targetName, duplicatedPolicy)
+
+        sourceFn = OpenMaya.MFnDependencyNode(source)
+        if not sourceFn.hasAttribute(attr):
+            self._warning("Looks like the {} is not in the source: {}"
+                          .format(attr, sourceName))
+            return
+        plug = sourceFn.findPlug(attr, False)
+        if cmds.addAttr(plug.name(), q=True, usedAsProxy=True):
+            self._warning("{} is a proxy channel and move operation is "
+                          "not yet supported.".format(attr))
+            return
+
+        attrObj = plug.attribute()
+        move = {"attr": attr,
+                "source": sourceName,
+                "target": targetName,
+                "name": attr,
+                "merge": False}
+        if attrObj.hasFn(OpenMaya.MFn.kEnumAttribute):
+            move["type"] = "enum"
+            move["value"] = plug.asShort()
+            move["enum"] = _getEnumFields(attrObj)
+        elif (attrObj.hasFn(OpenMaya.MFn.kNumericAttribute)
+              and OpenMaya.MFnNumericAttribute(attrObj).unitType()
+              == OpenMaya.MFnNumericData.kDouble):
+            move["type"] = "double"
+            move["value"] = plug.asDouble()
+            move["min"], move["max"] = _getNumericRange(attrObj)
+        else:
+            self._warning("MoveChannel function can't handle an attribute "
+                          "of type: %s. Only supported 'double' adn 'enum' "
+                          "types." % attrObj.apiTypeStr())
+            return
+
+        # define duplicated attribute policy
+        # this policy doesn't apply for rearrange channels
+        if sourceName != targetName and self.hasAttr(targetName, attr):
+            if duplicatedPolicy == "merge":
+                move["merge"] = True
+            elif duplicatedPolicy in ("index", "fullName"):
+                move["name"] = self._findDuplicatedName(
+                    attr, sourceName, targetName, duplicatedPolicy)
+            else:
+                self._warning("Duplicated channel policy, is not "
+                              "defined. Move channel operation will "
+                              "fail if the channel already exist on "
+                              "the target.")
+                return False
+
+        move["niceName"] = cmds.attributeQuery(attr,
+                                               node=sourceName,
+                                               niceName=True)
+        outputs = OpenMaya.MPlugArray()
+        plug.connectedTo(outputs, False, True)
+        move["outputs"] = [outputs[i].name() for i in range(outputs.length())]
+        if previous is not None:
+            # the outputs merged in this channel by a previous move
+            move["outputs"] = previous["outputs"] + move["outputs"]
+            previous["outputs"] = []
+
+        self._planned[(sourceName, attr)] = False
+        self._planned[(targetName, move["name"])] = True
+        self.moves.append(move)
+        return move
+
+    def _getPlannedMove(self, node, attr):
+        # the last planned move to the channel
+        for move in reversed(self.moves):
+            if move["target"] == node and move["name"] == attr:
+                return move
+
+    def _chainMove(self, move, targetName, duplicatedPolicy):
+        # the move goes to the new target, the channel is not created on the
+        # intermediate node
+        sourceName = move["target"]
+        attr = move["name"]
+        self._planned[(sourceName, attr)] = False
+        move["target"] = targetName
+        if sourceName != targetName and self.hasAttr(targetName, attr):
+            if duplicatedPolicy == "merge":
+                move["merge"] = True
+            elif duplicatedPolicy in ("index", "fullName"):
+                attr = self._findDuplicatedName(
+                    attr, sourceName, targetName, duplicatedPolicy)
+            else:
+                self._warning("Duplicated channel policy, is not "
+                              "defined. Move channel operation will "
+                              "fail if the channel already exist on "
+                              "the target.")
+                move["target"] = sourceName
+                self._planned[(sourceName, attr)] = True
+                return False
+
+        move["name"] = attr
+        self._planned[(targetName, attr)] = True
+        return move
+
+    def addProxy(self, sourceAttr, targetNode, duplicatedPolicy=None):
+        """Plan a proxy channel.
+
+        Same rules and duplicated channel policies than addProxyAttribute()
+
+        Arguments:
+            sourceAttr (attr or str): The channel to be connected as proxy.
+                i.e: "armUI_R0_ctl.shoulder_ik"
+            targetNode (dagNode or str): The node to add the proxy channel
+            duplicatedPolicy (string, optional): Set the duplicated channel
+                policy
+
+        Returns:
+            dict: The planned proxy. None if the proxy is not possible
+
+        """
+        plug = _getPlug(str(sourceAttr))
+        targetName = str(targetNode)
+        if plug is None:
+            self._warning("Looks like the source channel {} doesn't exist"
+                          .format(sourceAttr))
+            return
+        if self._getNode(targetName) is None:
+            self._warning("Looks like the target {} of {} doesn't exist"
+                          .format(targetName, sourceAttr))
+            return
+
+        longName = OpenMaya.MFnAttribute(plug.attribute()).name()
+        sourceName = OpenMaya.MFnDependencyNode(plug.node()).name()
+        attrName = longName
+        if self.hasAttr(targetName, longName):
+            attrName = self._findDuplicatedName(
+                longName, sourceName, targetName, duplicatedPolicy) \
+                or longName
+
+        if self.hasAttr(targetName, attrName):
+            self._warning("The proxy channel %s already exist on: %s."
+                          % (longName, targetName))
+            return
+
+        proxy = {"source": "{}.{}".format(sourceName, longName),
+                 "target": targetName,
+                 "name": attrName}
+        self._planned[(targetName, attrName)] = True
+        self.proxies.append(proxy)
+        return proxy
+
+    def diff(self):
+        """Get the planned changes
+
+        Returns:
+            list of str: One line for each planned change
+
+        """
+        lines = []
+        for move in self.moves:
+            operation = "merge" if move["merge"] else "move"
+            lines.append("{} {}.{} -> {}.{}".format(operation,
+                                                    move["source"],
+                                                    move["attr"],
+                                                    move["target"],
+                                                    move["name"]))
+            for output in move["outputs"]:
+                lines.append("    connect {}.{} -> {}".format(
+                    move["target"], move["name"], output))
+        for proxy in self.proxies:
+            lines.append("proxy {} -> {}.{}".format(proxy["source"],
+                                                    proxy["target"],
+                                                    proxy["name"]))
+        for warning in self.warnings:
+            lines.append("skip: {}".format(warning))
+        return lines
+
+    def doIt(self):
+        """Apply the planned operations
+
+        Returns:
+            MDGModifier: The modifier used to apply the moves
+
+        """
+        self.modifier = OpenMaya.MDGModifier()
+
+        # remove and rebuild the channels
+        start = datetime.datetime.now()
+        for move in self.moves:
+            source = self._nodes[move["source"]]
+            self.modifier.removeAttribute(
+                source,
+                OpenMaya.MFnDependencyNode(source).attribute(move["attr"]))
+            if not move["merge"]:
+                self.modifier.addAttribute(self._nodes[move["target"]],
+                                           _createChannel(move))
+        self.modifier.doIt()
+        self.timings.append(("Move channels",
+                             datetime.datetime.now() - start))
+
+        # reconnect the outputs, the new channels plugs exist now
+        start = datetime.datetime.now()
+        for move in self.moves:
+            newName = "{}.{}".format(move["target"], move["name"])
+            newPlug = _getPlug(newName)
+            for output in move["outputs"]:
+                outPlug = _getPlug(output)
+                if newPlug is None or outPlug is None:
+                    pm.displayError("There is a problem connecting the "
+                                    "channel %s  maybe is already move? "
+                                    "Please check your configuration"
+                                    % newName)
+                    continue
+                inputs = OpenMaya.MPlugArray()
+                outPlug.connectedTo(inputs, True, False)
+                if inputs.length():
+                    self.modifier.disconnect(inputs[0], outPlug)
+                self.modifier.connect(newPlug, outPlug)
+        self.modifier.doIt()
+        self.timings.append(("Reconnect outputs",
+                             datetime.datetime.now() - start))
+
+        # proxy channels can't be created by the modifier
+        start = datetime.datetime.now()
+        for proxy in self.proxies:
+            cmds.addAttr(proxy["target"],
+                         ln=proxy["name"],
+                         proxy=proxy["source"])
+        self.timings.append(("Add proxy channels",
+                             datetime.datetime.now() - start))
+
+        return self.modifier
+
+    def undoIt(self):
+        """Revert the applied operations"""
+        for proxy in reversed(self.proxies):
+            plug = "{}.{}".format(proxy["target"], proxy["name"])
+            if cmds.objExists(plug):
+                cmds.deleteAttr(plug)
+        if self.modifier:
+            self.modifier.undoIt()
+            self.modifier = None
+
+
+def _getNumericRange(attrObj):
+    fn = OpenMaya.MFnNumericAttribute(attrObj)
+    util = OpenMaya.MScriptUtil()
+    ptr = util.asDoublePtr()
+    minValue = maxValue = None
+    if fn.hasMin():
+        fn.getMin(ptr)
+        minValue = OpenMaya.MScriptUtil.getDouble(ptr)
+    if fn.hasMax():
+        fn.getMax(ptr)
+        maxValue = OpenMaya.MScriptUtil.getDouble(ptr)
+    return minValue, maxValue
+
+
+def _getEnumFields(attrObj):
+    fn = OpenMaya.MFnEnumAttribute(attrObj)
+    util = OpenMaya.MScriptUtil()
+    ptr = util.asShortPtr()
+    fn.getMin(ptr)
+    minIndex = OpenMaya.MScriptUtil.getShort(ptr)
+    fn.getMax(ptr)
+    maxIndex = OpenMaya.MScriptUtil.getShort(ptr)
+    fields = []
+    for i in range(minIndex, maxIndex + 1):
+        try:
+            fields.append((fn.fieldName(i), i))
+        except RuntimeError:
+            # not all the indexes have a field
+            pass
+    return fields
+
+
+def _createChannel(move):
+    if move["type"] == "enum":
+        fn = OpenMaya.MFnEnumAttribute()
+        attrObj = fn.create(move["name"], move["name"], move["value"])
+        for field, index in move["enum"]:
+            fn.addField(field, index)
+    else:
+        fn = OpenMaya.MFnNumericAttribute()
+        attrObj = fn.create(move["name"], move["name"],
+                            OpenMaya.MFnNumericData.kDouble, move["value"])
+        if move["min"] is not None:
+            fn.setMin(move["min"])
+        if move["max"] is not None:
+            fn.setMax(move["max"])
+    fn.setKeyable(True)
+    fn.setNiceNameOverride(move["niceName"])
+    return attrObj
+
+
 def lockAttribute(node,
                   attributes=["tx", "ty", "tz",
                               "rx", "ry", "rz",
@@ -973,63 +1713,39 @@ def get_next_available_index(attr):
 ##########################################################
 
 
-def add_mirror_config_channels(ctl, conf=[0, 0, 0, 0, 0, 0, 0, 0, 0]):
+def add_mirror_config_channels(ctl, conf=[0, 0, 0, 0, 0, 0, 0, 0, 0],
+                               batch=False):
     """Add channels to configure the mirror posing
 
     Args:
-     ctl (dagNode): Control Object
+     ctl (dagNode or list): Control Object or list of Control Objects
+     conf (list of bool): The invert value of each channel
+     batch (bool): If True, the channels of all the controls are created in
+        a single pass with AttributeBatch. This is not undoable, and
+        should only be used on build.
     """
-    addAttribute(ctl,
-                 "invTx",
-                 "bool",
-                 conf[0],
-                 keyable=False,
-                 niceName="Invert Mirror TX")
-    addAttribute(ctl,
-                 "invTy",
-                 "bool",
-                 conf[1],
-                 keyable=False,
-                 niceName="Invert Mirror TY")
-    addAttribute(ctl,
-                 "invTz",
-                 "bool",
-                 conf[2],
-                 keyable=False,
-                 niceName="Invert Mirror TZ")
-    addAttribute(ctl,
-                 "invRx",
-                 "bool",
-                 conf[3],
-                 keyable=False,
-                 niceName="Invert Mirror RX")
-    addAttribute(ctl,
-                 "invRy",
-                 "bool",
-                 conf[4],
-                 keyable=False,
-                 niceName="Invert Mirror RY")
-    addAttribute(ctl,
-                 "invRz",
-                 "bool",
-                 conf[5],
-                 keyable=False,
-                 niceName="Invert Mirror RZ")
-    addAttribute(ctl,
-                 "invSx",
-                 "bool",
-                 conf[6],
-                 keyable=False,
-                 niceName="Invert Mirror SX")
-    addAttribute(ctl,
-                 "invSy",
-                 "bool",
-                 conf[7],
-                 keyable=False,
-                 niceName="Invert Mirror SY")
-    addAttribute(ctl,
-                 "invSz",
-                 "bool",
-                 conf[8],
-                 keyable=False,
-                 niceName="Invert Mirror SZ")
+    axes = ["Tx", "Ty", "Tz", "Rx", "Ry", "Rz", "Sx", "Sy", "Sz"]
+    if batch:
+        attrBatch = AttributeBatch()
+        for value, axis in zip(conf, axes):
+            attrBatch.add(ctl,
+                          "inv" + axis,
+                          "bool",
+                          value,
+                          keyable=False,
+                          niceName="Invert Mirror " + axis.upper())
+        attrBatch.doIt()
+        return
+
+    if not isinstance(ctl, (list, tuple)):
+        ctl = [ctl]
+    with pm.UndoChunk():
+        for c in ctl:
+            c = pm.PyNode(c)
+            for value, axis in zip(conf, axes):
+                addAttribute(c,
+                             "inv" + axis,
+                             "bool",
+                             value,
+                             keyable=False,
+                             niceName="Invert Mirror " + axis.upper())
@@ -0,0 +1,418 @@
+"""Benchmarks of the rig building functions
+
+Each benchmark runs in a new scene, logs a timing report and returns the
+timings so the results can be compared between versions.
+"""
+
+import datetime
+import json
+import os
+import re
+
+from maya import cmds
+import pymel.core as pm
+
+import mgear
+
+from . import attribute
+from . import node as nod
+from . import utils
+
+
+BIPED_GUIDE = os.path.join(os.path.dirname(__file__), "shifter",
+                           "component", "_templates", "biped_guide.ma")
+
+# evaluation manager modes, keyed by the name used in the reports
+EVALUATION_MODES = [("dg", "off"), ("serial", "serial"),
+                    ("parallel", "parallel")]
+
+# ie. "arm_L0_fk0_ctl" is a node of the "arm_L0" component
+COMPONENT_NAME = re.compile(r"^([^_]+_[CLR]\d+)_")
+
+
+def _network(count):
+    # a small network using the most common helpers
+    ctl = cmds.createNode("transform", name="bench_ctl")
+    for i in range(count):
+        mul_node = nod.createMulNode(ctl + ".tx", 2)
+        rev_node = nod.createReverseNode(mul_node + ".outputX")
+        nod.createConditionNode(rev_node + ".outputX", 0, 2, 1, 0)
+
+
+def nodeCreation(count=1000):
+    """Compare the node creation throughput of the immediate helpers and
+    of a NetworkBuilder batch.
+
+    Arguments:
+        count (int, optional): The number of networks to create. Each
+            network has 3 nodes.
+
+    Returns:
+        list: (step name, timedelta) tuples
+
+    >>> benchmark.nodeCreation(5000)
+
+    """
+    cmds.file(new=True, force=True)
+    start = datetime.datetime.now()
+    _network(count)
+    immediate = [("Create {} nodes".format(count * 3),
+                  datetime.datetime.now() - start)]
+    utils.logTimingReport("IMMEDIATE NODE CREATION", immediate)
+
+    cmds.file(new=True, force=True)
+    start = datetime.datetime.now()
+    with nod.NetworkBuilder() as nb:
+        _network(count)
+        batch = [("Collect {} nodes".format(count * 3),
+                  datetime.datetime.now() - start)]
+    batch.extend(nb.timings)
+    utils.logTimingReport("BATCH NODE CREATION", batch)
+
+    cmds.file(new=True, force=True)
+
+    return [("Immediate " + s, d) for s, d in immediate] + \
+        [("Batch " + s, d) for s, d in batch]
+
+
+def attributeCreation(count=1000):
+    """Compare the creation of the mirror channels one attribute at a time
+    with addAttribute and in a single pass with AttributeBatch.
+
+    Arguments:
+        count (int, optional): The number of controls. Each control has 9
+            mirror channels.
+
+    Returns:
+        list: (step name, timedelta) tuples
+
+    """
+    axes = ["Tx", "Ty", "Tz", "Rx", "Ry", "Rz", "Sx", "Sy", "Sz"]
+
+    cmds.file(new=True, force=True)
+    ctls = [cmds.createNode("transform") for i in range(count)]
+    start = datetime.datetime.now()
+    for ctl in ctls:
+        node = pm.PyNode(ctl)
+        for axis in axes:
+            attribute.addAttribute(node, "inv" + axis, "bool", False,
+                                   keyable=False)
+    immediate = [("Create {} attributes".format(count * 9),
+                  datetime.datetime.now() - start)]
+    utils.logTimingReport("ADD ATTRIBUTE", immediate)
+
+    cmds.file(new=True, force=True)
+    ctls = [cmds.createNode("transform") for i in range(count)]
+    start = datetime.datetime.now()
+    batch = attribute.AttributeBatch()
+    for axis in axes:
+        batch.add(ctls, "inv" + axis, "bool", False, keyable=False)
+    planned = [("Plan {} attributes".format(count * 9),
+                datetime.datetime.now() - start)]
+    batch.doIt()
+    planned.extend(batch.timings)
+    utils.logTimingReport("ATTRIBUTE BATCH", planned)
+
+    cmds.file(new=True, force=True)
+
+    return [("Immediate " + s, d) for s, d in immediate] + \
+        [("Batch " + s, d) for s, d in planned]
+
+
+def _timed(func, timing):
+    def wrapper(*args, **kwargs):
+        start = datetime.datetime.now()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            timing[0] += datetime.datetime.now() - start
+            timing[1] += 1
+    return wrapper
+
+
+def bipedBuild(guidePath=BIPED_GUIDE):
+    """Build the biped template and report the time spent in the
+    attribute creation functions.
+
+    Arguments:
+        guidePath (str, optional): The guide scene to build
+
+    Returns:
+        list: (step name, timedelta) tuples
+
+    """
+    from mgear.maya import shifter
+
+    cmds.file(new=True, force=True)
+    cmds.file(guidePath, i=True)
+    cmds.select("guide")
+
+    names = ["addAttribute", "addEnumAttribute", "addColorAttribute",
+             "add_mirror_config_channels"]
+    originals = dict((n, getattr(attribute, n)) for n in names)
+    counters = dict((n, [datetime.timedelta(), 0]) for n in names)
+    for n in names:
+        setattr(attribute, n, _timed(originals[n], counters[n]))
+
+    start = datetime.datetime.now()
+    try:
+        shifter.Rig().buildFromSelection()
+    finally:
+        for n in names:
+            setattr(attribute, n, originals[n])
+    timings = [("Build", datetime.datetime.now() - start)]
+
+    for n in names:
+        duration, calls = counters[n]
+        timings.append(("{} ({} calls)".format(n, calls), duration))
+
+    # the attribute times are included in the build time
+    mgear.log("\n" + "= BIPED BUILD " + "=" * 46)
+    for step, duration in timings:
+        mgear.log("{} : [ {} ]".format(step, duration))
+
+    return timings
+
+
+def _measureFps(frames, evaluation="parallel"):
+    # evaluate each frame of the playback range and refresh the viewport
+    mode = cmds.evaluationManager(query=True, mode=True)[0]
+    cmds.evaluationManager(mode=evaluation)
+    try:
+        cmds.currentTime(0)
+        start = datetime.datetime.now()
+        for frame in range(frames):
+            cmds.currentTime(frame, update=True)
+            cmds.refresh(force=True)
+        seconds = (datetime.datetime.now() - start).total_seconds()
+    finally:
+        cmds.evaluationManager(mode=mode)
+    return frames / max(seconds, 1e-6)
+
+
+def controllerTagPlayback(guidePath=BIPED_GUIDE, frames=100):
+    """Build the biped template with and without the controller tags
+    hierarchy and prepopulate options and measure the playback fps.
+
+    Arguments:
+        guidePath (str, optional): The guide scene to build
+        frames (int, optional): The number of frames to play
+
+    Returns:
+        list: (options, fps) tuples
+
+    """
+    from mgear.maya import shifter
+
+    results = []
+    # (True, False) is the tags layout of the previous versions
+    for hierarchy, prepopulate in ((False, False),
+                                   (True, False),
+                                   (True, True)):
+        cmds.file(new=True, force=True)
+        cmds.file(guidePath, i=True)
+        cmds.setAttr("guide.ctlTagHierarchy", hierarchy)
+        cmds.setAttr("guide.ctlTagPrepopulate", prepopulate)
+        cmds.select("guide")
+        shifter.Rig().buildFromSelection()
+
+        # animate the top control, all the rig is evaluated
+        ctl = (cmds.ls("world_ctl") or cmds.ls("global_C0_ctl"))[0]
+        cmds.setKeyframe(ctl, attribute="ry", time=0, value=0)
+        cmds.setKeyframe(ctl, attribute="ry", time=frames, value=360)
+
+        options = "hierarchy={} prepopulate={}".format(hierarchy,
+                                                       prepopulate)
+        results.append((options, _measureFps(frames)))
+
+    mgear.log("\n" + "= CONTROLLER TAGS PLAYBACK " + "=" * 46)
+    for options, fps in results:
+        mgear.log("{} : [ {:.2f} fps ]".format(options, fps))
+
+    return results
+
+
+def _animateControls(model, frames):
+    # deterministic keys on the rotation channels of the controls
+    ctlSet = model + "_controllers_grp"
+    ctls = []
+    if cmds.objExists(ctlSet):
+        ctls = cmds.ls(cmds.sets(ctlSet, query=True) or [], type="transform")
+
+    for i, ctl in enumerate(sorted(ctls)):
+        for j, axis in enumerate("xyz"):
+            attr = "{}.r{}".format(ctl, axis)
+            if (not cmds.getAttr(attr, keyable=True)
+                    or cmds.getAttr(attr, lock=True)):
+                continue
+            value = 15.0 if (i + j) % 2 else -15.0
+            cmds.setKeyframe(ctl, attribute="r" + axis, time=0, value=0)
+            cmds.setKeyframe(ctl, attribute="r" + axis, time=frames // 2,
+                             value=value)
+            cmds.setKeyframe(ctl, attribute="r" + axis, time=frames,
+                             value=0)
+
+    return len(ctls)
+
+
+def _componentNodes(model):
+    # the nodes of each component, from the components stored in the rig or
+    # from the node names for the rigs built by older versions
+    components = {}
+    if cmds.attributeQuery("rigComponents", node=model, exists=True):
+        roots = cmds.listConnections(model + ".rigComponents",
+                                     source=True,
+                                     destination=False) or []
+        for root in roots:
+            nodes = [root] + (cmds.listRelatives(root,
+                                                 allDescendents=True,
+                                                 fullPath=True) or [])
+            if cmds.attributeQuery("componentBuildData", node=root,
+                                   exists=True):
+                data = json.loads(cmds.getAttr(root + ".componentBuildData"))
+                if data.get("nodes"):
+                    nodes.extend(cmds.ls(data["nodes"], long=True))
+            name = "_".join(root.split("|")[-1].split("_")[:2])
+            components[name] = nodes
+
+    if not components:
+        for n in cmds.ls(long=True):
+            match = COMPONENT_NAME.match(n.split("|")[-1].split(":")[-1])
+            if match:
+                components.setdefault(match.group(1), []).append(n)
+
+    return components
+
+
+def _componentTimes(components, frames):
+    # DG compute time of the nodes of each component, from dgtimer
+    mode = cmds.evaluationManager(query=True, mode=True)[0]
+    cmds.evaluationManager(mode="off")
+    # timerOn/timerOff only enable the timers per node, on/off start and
+    # stop the timing
+    cmds.dgtimer(on=True, reset=True)
+    try:
+        for frame in range(frames):
+            cmds.currentTime(frame, update=True)
+            cmds.refresh(force=True)
+    finally:
+        cmds.dgtimer(off=True)
+        cmds.evaluationManager(mode=mode)
+
+    times = {}
+    for name, nodes in components.items():
+        times[name] = sum([cmds.dgtimer(query=True,
+                                        name=n,
+                                        returnType="total") or 0.0
+                           for n in nodes])
+    return times
+
+
+def rigPlayback(model=None, guidePath=BIPED_GUIDE, frames=100,
+                outputPath=None):
+    """Measure the playback speed of a built rig.
+
+    The controls of the rig are animated with deterministic keys. The fps
+    are measured in DG, serial and parallel evaluation, and the number of
+    nodes and the DG compute time of each component are reported.
+
+    Arguments:
+        model (str, optional): The model of a built rig. If None, the guide
+            is built in a new scene.
+        guidePath (str, optional): The guide scene to build
+        frames (int, optional): The number of frames to play
+        outputPath (str, optional): The JSON file to write the result, to
+            compare it with comparePlayback
+
+    Returns:
+        dict: The result
+
+    >>> benchmark.rigPlayback(outputPath="/tmp/biped_2.6.1.json")
+
+    """
+    if model is None:
+        from mgear.maya import shifter
+
+        cmds.file(new=True, force=True)
+        cmds.file(guidePath, i=True)
+        cmds.select("guide")
+        rig = shifter.Rig()
+        rig.buildFromSelection()
+        model = rig.model
+    model = str(model)
+
+    controls = _animateControls(model, frames)
+    components = _componentNodes(model)
+
+    fps = {}
+    for name, mode in EVALUATION_MODES:
+        # the first frames build the evaluation graph
+        _measureFps(min(frames, 5), mode)
+        fps[name] = _measureFps(frames, mode)
+
+    times = _componentTimes(components, frames)
+    result = {"mgear_version": mgear.getVersion(),
+              "maya_version": cmds.about(version=True),
+              "rig": model,
+              "frames": frames,
+              "controls": controls,
+              "fps": fps,
+              "components": dict((name, {"nodes": len(nodes),
+                                         "time": times[name]})
+                                 for name, nodes in components.items())}
+
+    mgear.log("\n" + "= RIG PLAYBACK " + "=" * 46)
+    for name, mode in EVALUATION_MODES:
+        mgear.log("{} : [ {:.2f} fps ]".format(name, fps[name]))
+    for name, data in sorted(result["components"].items(),
+                             key=lambda item: -item[1]["time"]):
+        mgear.log("{} : {} nodes [ {:.4f} s ]".format(
+            name, data["nodes"], data["time"]))
+
+    if outputPath:
+        with open(outputPath, "w") as f:
+            json.dump(result, f, indent=4, sort_keys=True)
+
+    return result
+
+
+def comparePlayback(previousPath, currentPath, tolerance=.05):
+    """Compare two rig playback results and log the regressions.
+
+    Arguments:
+        previousPath (str): The JSON result of the reference version
+        currentPath (str): The JSON result to check
+        tolerance (float, optional): The fps ratio below which a mode is
+            reported as slower
+
+    Returns:
+        list: The names of the slower evaluation modes
+
+    """
+    with open(previousPath, "r") as f:
+        previous = json.load(f)
+    with open(currentPath, "r") as f:
+        current = json.load(f)
+
+    mgear.log("\n" + "= RIG PLAYBACK {} > {} ".format(
+        previous["mgear_version"], current["mgear_version"]) + "=" * 30)
+    slower = []
+    for name, mode in EVALUATION_MODES:
+        if name not in previous["fps"] or name not in current["fps"]:
+            continue
+        ratio = current["fps"][name] / max(previous["fps"][name], 1e-6)
+        severity = mgear.sev_comment
+        if ratio < 1 - tolerance:
+            slower.append(name)
+            severity = mgear.sev_warning
+        mgear.log("{} : [ {:.2f} > {:.2f} fps ] {:+.1%}".format(
+            name, previous["fps"][name], current["fps"][name], ratio - 1),
+            severity)
+
+    for name, data in sorted(current["components"].items()):
+        before = previous["components"].get(name)
+        if before and data["nodes"] != before["nodes"]:
+            mgear.log("{} : {} > {} nodes".format(
+                name, before["nodes"], data["nodes"]))
+
+    return slower
@@ -395,8 +395,12 @@ def create_curve_from_data(data,
         data (TYPE): Description
         replaceShape (bool, optional): Description
         rebuildHierarchy (bool, optional): Description
+
+    Returns:
+        list of dagNode: The built curves, in the order of the data
     """
 
+    curves = []
     for crv in data["curves_names"]:
         crv_dict = data[crv]
 
@@ -445,6 +449,8 @@ def create_curve_from_data(data,
                     first_shape.addChild(extra_shp, add=True, shape=True)
                     pm.delete(obj)
 
+        curves.append(first_shape)
+
     # parenting
     if rebuildHierarchy:
         for crv in data["curves_names"]:
@@ -453,6 +459,8 @@ def create_curve_from_data(data,
             if crv_parent:
                 pm.parent(crv, crv_parent)
 
+    return curves
+
 
 def update_curve_from_data(data):
     """update the curves from a given curve data dict
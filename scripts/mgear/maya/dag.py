@@ -1,7 +1,10 @@
 """Nvigate the DAG hierarchy"""
 
 
+import collections
+
 import maya.cmds as cmds
+import maya.OpenMaya as OpenMaya
 import pymel.core as pm
 
 #############################################
@@ -53,7 +56,10 @@ def findChild(node, name):
 
     """
     # return __findChildren(node, name, True)
-    return __findChild(node, name)
+    children = _getHierarchyIndex().find(node, name, HierarchyIndex.NAME)
+    if not children:
+        return False
+    return children[0]
 
 
 def findChildren(node, name):
@@ -67,7 +73,9 @@ def findChildren(node, name):
         dagNode list: The children dagNodes
 
     """
-    return __findChildren(node, name, False)
+    # return __findChildren(node, name, False)
+    children = _getHierarchyIndex().find(node, name, HierarchyIndex.NAME)
+    return children or False
 
 
 def findChildrenPartial(node, name):
@@ -82,7 +90,9 @@ def findChildrenPartial(node, name):
         dagNode list: The children dagNodes
 
     """
-    return __findChildren(node, name, False, True)
+    # return __findChildren(node, name, False, True)
+    children = _getHierarchyIndex().find(node, name, HierarchyIndex.SUFFIX)
+    return children or False
 
 
 def __findChildren(node, name, firstOnly=False, partialName=False):
@@ -182,20 +192,15 @@ def findComponentChildren(node, name, sideIndex):
                                              oldSideIndex)
 
     """
-    children = []
-    for item in node.listRelatives(allDescendents=True,
-                                   type="transform"):
-        checkName = item.name().split("|")[-1].split("_")
-        if checkName[0] == name and checkName[1] == sideIndex:
-            children.append(item)
-
-    return children
+    return _getHierarchyIndex().find(node,
+                                     (name, sideIndex),
+                                     HierarchyIndex.COMPONENT)
 
 
 def findComponentChildren2(node, name, sideIndex):
     """Returns the component children of input component root.
 
-    This function is using Maya cmds instead of PyMel
+    Same as findComponentChildren, kept for backward compatibility.
 
     Note:
         This method is specific to work with shifter guides naming conventions
@@ -213,11 +218,209 @@ def findComponentChildren2(node, name, sideIndex):
                                              oldSideIndex)
 
     """
-    children = []
-    for item in cmds.listRelatives(node.name(), allDescendents=True,
-                                   type="transform"):
-        checkName = item.split("|")[-1].split("_")
-        if checkName[0] == name and checkName[1] == sideIndex:
-            children.append(item)
+    return findComponentChildren(node, name, sideIndex)
 
-    return [pm.PyNode(x) for x in children]
+
+#############################################
+# HIERARCHY INDEX
+#############################################
+
+class HierarchyIndex(object):
+    """Scene wide index of the transforms, keyed by short name.
+
+    The index is built once from a single pass over the dependency graph and
+    then kept up to date incrementally from node added and name changed
+    callbacks. Deleted or reparented nodes don't need any bookkeeping, every
+    candidate is validated against the current scene when queried.
+
+    Besides the short name, each node is also indexed by its name suffix
+    (last "_" token) and by its component (first and second "_" tokens), so
+    all the dag.find* functions can be resolved without listing the
+    descendants of the searched node.
+
+    """
+
+    NAME = 0
+    SUFFIX = 1
+    COMPONENT = 2
+
+    # over this number of nodes added or renamed, the index is rebuilt
+    MAX_PENDING = 10000
+
+    def __init__(self):
+        self._indexes = None
+        self._pending = {}
+        self._callbackIds = []
+
+    # ================================================
+    # Callbacks
+
+    def addCallbacks(self):
+        """Register the callbacks that keep the index up to date."""
+        if self._callbackIds:
+            return
+
+        ids = [OpenMaya.MDGMessage.addNodeAddedCallback(self._nodeAdded,
+                                                        "transform"),
+               OpenMaya.MNodeMessage.addNameChangedCallback(
+                   OpenMaya.MObject(), self._nameChanged)]
+        for msg in (OpenMaya.MSceneMessage.kBeforeNew,
+                    OpenMaya.MSceneMessage.kBeforeOpen,
+                    OpenMaya.MSceneMessage.kAfterCreateReference,
+                    OpenMaya.MSceneMessage.kAfterLoadReference,
+                    OpenMaya.MSceneMessage.kAfterUnloadReference,
+                    OpenMaya.MSceneMessage.kAfterRemoveReference):
+            ids.append(OpenMaya.MSceneMessage.addCallback(msg, self._reset))
+
+        self._callbackIds = ids
+
+    def removeCallbacks(self):
+        """Remove the callbacks registered by this index."""
+        for cbId in self._callbackIds:
+            try:
+                OpenMaya.MMessage.removeCallback(cbId)
+            except RuntimeError:
+                pass
+        self._callbackIds = []
+
+    def _addPending(self, mobject):
+        handle = OpenMaya.MObjectHandle(mobject)
+        self._pending[handle.hashCode()] = handle
+        if len(self._pending) > self.MAX_PENDING:
+            self.clear()
+
+    def _nodeAdded(self, mobject, *args):
+        if self._indexes is not None:
+            self._addPending(mobject)
+
+    def _nameChanged(self, mobject, *args):
+        if self._indexes is not None \
+                and mobject.hasFn(OpenMaya.MFn.kTransform):
+            self._addPending(mobject)
+
+    def _reset(self, *args):
+        self.clear()
+
+    # ================================================
+    # Index
+
+    def clear(self):
+        """Drop the index. It will be rebuilt on the next query."""
+        self._indexes = None
+        self._pending = {}
+
+    def _build(self):
+        self._indexes = ({}, {}, {})
+        self._pending = {}
+        it = OpenMaya.MItDependencyNodes(OpenMaya.MFn.kTransform)
+        while not it.isDone():
+            self._add(OpenMaya.MObjectHandle(it.thisNode()))
+            it.next()
+
+    def _update(self):
+        pending = self._pending
+        self._pending = {}
+        for handle in pending.values():
+            if handle.isValid():
+                self._add(handle)
+
+    def _add(self, handle):
+        name = OpenMaya.MFnDependencyNode(handle.object()).name()
+        tokens = name.split("_")
+        keys = [name, tokens[-1]]
+        if len(tokens) > 1:
+            keys.append((tokens[0], tokens[1]))
+
+        # the buckets are keyed by handle hash code, a node is only indexed
+        # once. The nodes are kept in the indexing order.
+        for index, key in zip(self._indexes, keys):
+            bucket = index.get(key)
+            if bucket is None:
+                bucket = index[key] = collections.OrderedDict()
+            bucket[handle.hashCode()] = handle
+
+    @staticmethod
+    def _keyMatch(name, key, mode):
+        tokens = name.split("_")
+        if mode == HierarchyIndex.NAME:
+            return name == key
+        elif mode == HierarchyIndex.SUFFIX:
+            return tokens[-1] == key
+        return len(tokens) > 1 and (tokens[0], tokens[1]) == key
+
+    def find(self, node, key, mode=NAME):
+        """Returns the descendants of node matching the key.
+
+        Arguments:
+            node (dagNode or str): The input node to search
+            key (str or tuple): The short name, the suffix or the
+                (name, sideIndex) tuple, depending on the mode.
+            mode (int): HierarchyIndex.NAME, SUFFIX or COMPONENT
+
+        Returns:
+            dagNode list: The matching descendants
+
+        """
+        if self._indexes is None:
+            self.addCallbacks()
+            self._build()
+        elif self._pending:
+            self._update()
+
+        bucket = self._indexes[mode].get(key)
+        if not bucket:
+            return []
+
+        sel = OpenMaya.MSelectionList()
+        sel.add(node.name() if isinstance(node, pm.PyNode) else node)
+        rootPath = OpenMaya.MDagPath()
+        sel.getDagPath(0, rootPath)
+        prefix = rootPath.fullPathName() + "|"
+
+        children = []
+        stale = []
+        for hashCode, handle in bucket.items():
+            if not handle.isValid():
+                # deleted nodes are kept while they can come back from undo
+                if not handle.isAlive():
+                    stale.append(hashCode)
+                continue
+
+            mobject = handle.object()
+            if not self._keyMatch(OpenMaya.MFnDependencyNode(mobject).name(),
+                                  key,
+                                  mode):
+                stale.append(hashCode)
+                continue
+
+            paths = OpenMaya.MDagPathArray()
+            OpenMaya.MDagPath.getAllPathsTo(mobject, paths)
+            for i in range(paths.length()):
+                fullPath = paths[i].fullPathName()
+                if fullPath.startswith(prefix):
+                    children.append(pm.PyNode(fullPath))
+
+        for hashCode in stale:
+            del bucket[hashCode]
+
+        return children
+
+
+_hierarchyIndex = None
+
+
+def _getHierarchyIndex():
+    global _hierarchyIndex
+    if _hierarchyIndex is None:
+        _hierarchyIndex = HierarchyIndex()
+    return _hierarchyIndex
+
+
+def clearHierarchyIndex():
+    """Drop the cached hierarchy index used by the dag.find* functions.
+
+    The index is rebuilt on the next query. This is only needed if the
+    scene has been modified while callbacks were not available.
+
+    """
+    _getHierarchyIndex().clear()
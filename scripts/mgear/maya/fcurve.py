@@ -1,9 +1,172 @@
+import bisect
+
+from maya import cmds
 import pymel.core as pm
 
 
+# Pre and post infinity types supported by FCurve.evaluate
+INFINITY_CONSTANT = 0
+INFINITY_LINEAR = 1
+
+
+class FCurve(object):
+    """Keys and tangents of an animCurve, evaluated without the DG.
+
+    The keys and tangents are read once from the curve and any number of
+    samples can be evaluated in a single pass with the same cubic
+    interpolation as Maya: Hermite for non weighted curves and Bezier for
+    weighted curves.
+
+    Only the curves driven by a unitless input (animCurveU*) are evaluated
+    in Python, time based curves are still evaluated by Maya.
+
+    Arguments:
+        fcv_node (pyNode or str): The animCurve to read.
+
+    >>> fcv = fcurve.FCurve(self.settings["st_profile"])
+    >>> values = fcv.evaluate([0, .25, .5, .75, 1])
+
+    """
+
+    def __init__(self, fcv_node):
+        self.name = str(fcv_node)
+        self.useDG = not cmds.nodeType(self.name).startswith("animCurveU")
+
+        self.inputs = []
+        if not self.useDG:
+            self.inputs = cmds.keyframe(self.name, q=True,
+                                        floatChange=True) or []
+        self.values = cmds.keyframe(self.name, q=True, valueChange=True) or []
+
+        if self.inputs:
+            self.inTanX = cmds.keyTangent(self.name, q=True, ix=True)
+            self.inTanY = cmds.keyTangent(self.name, q=True, iy=True)
+            self.outTanX = cmds.keyTangent(self.name, q=True, ox=True)
+            self.outTanY = cmds.keyTangent(self.name, q=True, oy=True)
+            self.outTanType = cmds.keyTangent(self.name, q=True,
+                                              outTangentType=True)
+            self.weighted = cmds.keyTangent(self.name, q=True,
+                                            weightedTangents=True)[0]
+
+        self.preInfinity = cmds.getAttr(self.name + ".preInfinity")
+        self.postInfinity = cmds.getAttr(self.name + ".postInfinity")
+
+    def evaluate(self, inputs):
+        """Evaluate the curve at the given inputs.
+
+        Arguments:
+            inputs (list of float): The inputs to evaluate.
+
+        Returns:
+            list of float: The values, in the same order as the inputs.
+
+        """
+        if self.useDG:
+            values = []
+            for x in inputs:
+                pm.setAttr(self.name + ".input", x)
+                values.append(pm.getAttr(self.name + ".output"))
+            return values
+
+        if not self.inputs:
+            return [0.0] * len(inputs)
+
+        last = len(self.inputs) - 1
+        values = []
+        for x in inputs:
+            if x <= self.inputs[0] or x >= self.inputs[last]:
+                values.append(self._extrapolate(x))
+                continue
+            i = bisect.bisect_right(self.inputs, x) - 1
+            values.append(self._evaluateSegment(i, x))
+
+        return values
+
+    def _extrapolate(self, x):
+        if x <= self.inputs[0]:
+            i = 0
+            infinity = self.preInfinity
+            slope = self._slope(self.inTanX[0], self.inTanY[0])
+        else:
+            i = len(self.inputs) - 1
+            infinity = self.postInfinity
+            slope = self._slope(self.outTanX[i], self.outTanY[i])
+
+        if x == self.inputs[i] or infinity == INFINITY_CONSTANT:
+            return self.values[i]
+        if infinity == INFINITY_LINEAR:
+            return self.values[i] + slope * (x - self.inputs[i])
+
+        # cycle and oscillate modes are left to Maya
+        pm.setAttr(self.name + ".input", x)
+        return pm.getAttr(self.name + ".output")
+
+    @staticmethod
+    def _slope(tx, ty):
+        if abs(tx) < 1e-10:
+            return 1e10 if ty >= 0 else -1e10
+        return ty / tx
+
+    def _evaluateSegment(self, i, x):
+        x0 = self.inputs[i]
+        x1 = self.inputs[i + 1]
+        y0 = self.values[i]
+        y1 = self.values[i + 1]
+
+        if self.outTanType[i] == "step":
+            return y0
+        if self.outTanType[i] == "stepnext":
+            return y1
+
+        dx = x1 - x0
+        if not self.weighted:
+            # Hermite with the tangents slopes
+            u = (x - x0) / dx
+            u2 = u * u
+            u3 = u2 * u
+            m0 = self._slope(self.outTanX[i], self.outTanY[i]) * dx
+            m1 = self._slope(self.inTanX[i + 1], self.inTanY[i + 1]) * dx
+            return ((2 * u3 - 3 * u2 + 1) * y0 +
+                    (u3 - 2 * u2 + u) * m0 +
+                    (-2 * u3 + 3 * u2) * y1 +
+                    (u3 - u2) * m1)
+
+        # Bezier with the weighted tangents as control points
+        cx0 = x0 + self.outTanX[i] / 3.0
+        cy0 = y0 + self.outTanY[i] / 3.0
+        cx1 = x1 - self.inTanX[i + 1] / 3.0
+        cy1 = y1 - self.inTanY[i + 1] / 3.0
+
+        # find the bezier parameter for x, the control points x are
+        # monotonic so bisection always converges
+        lo = 0.0
+        hi = 1.0
+        t = (x - x0) / dx
+        for n in range(50):
+            bx = _bezier(x0, cx0, cx1, x1, t)
+            if abs(bx - x) < 1e-9:
+                break
+            if bx < x:
+                lo = t
+            else:
+                hi = t
+            t = (lo + hi) * .5
+
+        return _bezier(y0, cy0, cy1, y1, t)
+
+
+def _bezier(p0, p1, p2, p3, t):
+    s = 1.0 - t
+    return s * s * s * p0 + 3 * s * s * t * p1 + 3 * s * t * t * p2 + \
+        t * t * t * p3
+
+
 def getFCurveValues(fcv_node, division, factor=1):
     """Get X values evenly spaced on the FCurve.
 
+    The keys of the FCurve are read once and the values are evaluated
+    without setting the input of the curve.
+
     Arguments:
         fcv_node (pyNode or str): The FCurve to evaluate.
         division (int): The number of division you want to evaluate on
@@ -19,9 +182,6 @@ def getFCurveValues(fcv_node, division, factor=1):
     """
     incr = 1 / (division - 1.0)
 
-    values = []
-    for i in range(division):
-        pm.setAttr(fcv_node + ".input", i * incr)
-        values.append(pm.getAttr(fcv_node + ".output") * factor)
+    values = FCurve(fcv_node).evaluate([i * incr for i in range(division)])
 
-    return values
+    return [v * factor for v in values]
@@ -1,11 +1,399 @@
 """Functions to create and connect nodes."""
 
 
+import datetime
+
+from maya import cmds
+import maya.OpenMaya as OpenMaya
 import pymel.core as pm
 from pymel import versions
 import pymel.core.datatypes as datatypes
 from . import attribute
 
+#############################################
+# NETWORK BUILDER
+#############################################
+
+
+class PlugHandle(object):
+    """A plug of a node created by a NetworkBuilder
+
+    Arguments:
+        node (NodeHandle): The node
+        attr (str): The attribute name. i.e: "outputX" or "input1D[0]"
+
+    """
+
+    def __init__(self, node, attr):
+        self.node = node
+        self.attr = attr
+
+    def __add__(self, other):
+        return PlugHandle(self.node, self.attr + other)
+
+    def name(self):
+        return "{}.{}".format(self.node.name(), self.attr)
+
+    def __str__(self):
+        return self.name()
+
+    def __repr__(self):
+        return "PlugHandle('{}')".format(self.name())
+
+
+class NodeHandle(object):
+    """A node created by a NetworkBuilder
+
+    The handle is used like a node name to get the plugs before the node
+    exists: handle + ".outputX"
+
+    Arguments:
+        nodeType (str): The node type
+        name (str, optional): The requested node name
+
+    """
+
+    def __init__(self, nodeType, name=None):
+        self.nodeType = nodeType
+        self.requestedName = name
+        self.mobject = None
+
+    def __add__(self, other):
+        if other.startswith("."):
+            return PlugHandle(self, other[1:])
+        return self.name() + other
+
+    def attr(self, attr):
+        return PlugHandle(self, attr)
+
+    def name(self):
+        if self.mobject is not None:
+            return OpenMaya.MFnDependencyNode(self.mobject).name()
+        return self.requestedName or self.nodeType
+
+    def pyNode(self):
+        """Get the PyNode of the node, once the network is committed"""
+        return pm.PyNode(self.name())
+
+    def __str__(self):
+        return self.name()
+
+    def __repr__(self):
+        return "NodeHandle('{}')".format(self.name())
+
+
+def _isPlug(item):
+    return isinstance(item, (basestring, pm.Attribute, PlugHandle))
+
+
+def _plugName(item):
+    if isinstance(item, basestring):
+        return item
+    return item.name()
+
+
+def _getMPlug(name):
+    sel = OpenMaya.MSelectionList()
+    sel.add(name)
+    plug = OpenMaya.MPlug()
+    sel.getPlug(0, plug)
+    return plug
+
+
+def _setPlugValue(modifier, plug, value):
+    """Queue a setAttr in the modifier, the values are in UI units"""
+    if isinstance(value, datatypes.Matrix):
+        value = [v for row in value.get() for v in row]
+    if isinstance(value, (list, tuple)):
+        if len(value) == 16 and not plug.isCompound():
+            m = OpenMaya.MMatrix()
+            OpenMaya.MScriptUtil.createMatrixFromList(value, m)
+            modifier.newPlugValue(plug, OpenMaya.MFnMatrixData().create(m))
+        else:
+            for i, v in enumerate(value):
+                _setPlugValue(modifier, plug.child(i), v)
+        return
+
+    attr = plug.attribute()
+    if attr.hasFn(OpenMaya.MFn.kUnitAttribute):
+        unitType = OpenMaya.MFnUnitAttribute(attr).unitType()
+        if unitType == OpenMaya.MFnUnitAttribute.kAngle:
+            modifier.newPlugValueMAngle(
+                plug, OpenMaya.MAngle(value, OpenMaya.MAngle.uiUnit()))
+        elif unitType == OpenMaya.MFnUnitAttribute.kDistance:
+            modifier.newPlugValueMDistance(
+                plug, OpenMaya.MDistance(value, OpenMaya.MDistance.uiUnit()))
+        elif unitType == OpenMaya.MFnUnitAttribute.kTime:
+            modifier.newPlugValueMTime(
+                plug, OpenMaya.MTime(value, OpenMaya.MTime.uiUnit()))
+        else:
+            modifier.newPlugValueDouble(plug, value)
+    elif attr.hasFn(OpenMaya.MFn.kEnumAttribute):
+        modifier.newPlugValueInt(plug, int(value))
+    elif attr.hasFn(OpenMaya.MFn.kNumericAttribute):
+        numType = OpenMaya.MFnNumericAttribute(attr).unitType()
+        if numType == OpenMaya.MFnNumericData.kBoolean:
+            modifier.newPlugValueBool(plug, bool(value))
+        elif numType in (OpenMaya.MFnNumericData.kInt,
+                         OpenMaya.MFnNumericData.kShort,
+                         OpenMaya.MFnNumericData.kLong,
+                         OpenMaya.MFnNumericData.kByte,
+                         OpenMaya.MFnNumericData.kChar):
+            modifier.newPlugValueInt(plug, int(value))
+        elif numType == OpenMaya.MFnNumericData.kFloat:
+            modifier.newPlugValueFloat(plug, value)
+        else:
+            modifier.newPlugValueDouble(plug, value)
+    else:
+        modifier.newPlugValueDouble(plug, value)
+
+
+def _cmdsSetAttr(plug, value):
+    if isinstance(value, datatypes.Matrix):
+        value = [v for row in value.get() for v in row]
+    if isinstance(value, (list, tuple)):
+        if len(value) == 16:
+            cmds.setAttr(plug, *value, type="matrix")
+        else:
+            cmds.setAttr(plug, *value)
+    else:
+        cmds.setAttr(plug, value)
+
+
+class NetworkBuilder(object):
+    """Collect node creations, attribute sets and connections and commit
+    them in a single MDagModifier.
+
+    While a builder is used as context, the node creation functions of this
+    module and applyop add their nodes to the builder and return NodeHandle
+    instead of PyNode. The network is committed at the end of the context.
+    NodeHandle and PlugHandle can be used as inputs of the other creation
+    functions, but not by PyMEL or cmds until the network is committed.
+
+    Outside of a builder context, the creation functions execute each
+    operation immediately and stay undoable. The Shifter component steps
+    don't use a builder, they use the created nodes with PyMEL and cmds
+    right away.
+
+    NOTE: The changes done by the modifier are not in Maya undo queue, use
+    undoIt() to revert them.
+
+    Arguments:
+        batch (bool, optional): If False, the operations are executed
+            immediately with cmds.
+
+    Example:
+        >>> with nod.NetworkBuilder() as nb:
+        >>>     mul_node = nod.createMulNode(self.ctl + ".tx", 2)
+        >>>     nod.createReverseNode(mul_node + ".outputX",
+        >>>                           self.ctl + ".ty")
+        >>> mul_node.pyNode()
+
+    """
+
+    _active = []
+
+    def __init__(self, batch=True):
+        self.batch = batch
+        self.nodes = []
+        self.modifier = None
+        self.timings = []
+        self._setAttrs = []
+        self._connections = []
+
+    def __enter__(self):
+        NetworkBuilder._active.append(self)
+        return self
+
+    def __exit__(self, excType, excValue, tb):
+        NetworkBuilder._active.remove(self)
+        if excType is None:
+            self.commit()
+
+    @classmethod
+    def current(cls):
+        """Get the builder of the current context
+
+        Returns:
+            NetworkBuilder: The builder or None if there is no builder
+                context.
+
+        """
+        if cls._active:
+            return cls._active[-1]
+
+    def createNode(self, nodeType, name=None):
+        """Create a node
+
+        Arguments:
+            nodeType (str): The node type
+            name (str, optional): The node name
+
+        Returns:
+            NodeHandle or str: The node handle or the node name if the
+                builder is not in batch mode.
+
+        """
+        if not self.batch:
+            if name:
+                return cmds.createNode(nodeType, name=name)
+            return cmds.createNode(nodeType)
+
+        handle = NodeHandle(nodeType, name)
+        self.nodes.append(handle)
+        return handle
+
+    def setAttr(self, plug, value):
+        """Set the value of a plug
+
+        Arguments:
+            plug (PlugHandle, attr or str): The plug
+            value (float, bool, int, list or matrix): The value in UI units
+
+        """
+        if not self.batch:
+            _cmdsSetAttr(_plugName(plug), value)
+            return
+        self._setAttrs.append((plug, value))
+
+    def connect(self, source, destination, force=False):
+        """Connect two plugs
+
+        Like connectAttr, connecting a destination with an input fails
+        unless force is used.
+
+        Arguments:
+            source (PlugHandle, attr or str): The source plug
+            destination (PlugHandle, attr or str): The destination plug
+            force (bool, optional): Replace the destination existing input
+
+        """
+        if not self.batch:
+            cmds.connectAttr(_plugName(source), _plugName(destination),
+                             force=force)
+            return
+        self._connections.append((source, destination, force))
+
+    def commit(self):
+        """Create the nodes, set the values and connect the plugs
+
+        Returns:
+            MDagModifier: The modifier
+
+        """
+        if not self.batch or self.modifier is not None:
+            return self.modifier
+
+        self.modifier = OpenMaya.MDagModifier()
+
+        start = datetime.datetime.now()
+        for handle in self.nodes:
+            if "dagNode" in cmds.nodeType(handle.nodeType,
+                                          inherited=True,
+                                          isTypeName=True):
+                handle.mobject = self.modifier.createNode(handle.nodeType)
+            else:
+                handle.mobject = OpenMaya.MDGModifier.createNode(
+                    self.modifier, handle.nodeType)
+        self.modifier.doIt()
+        for handle in self.nodes:
+            if handle.requestedName:
+                OpenMaya.MFnDependencyNode(handle.mobject).setName(
+                    handle.requestedName)
+        self.timings.append(("Create nodes",
+                             datetime.datetime.now() - start))
+
+        # the plugs of the new nodes can be resolved now
+        start = datetime.datetime.now()
+        for plug, value in self._setAttrs:
+            _setPlugValue(self.modifier, _getMPlug(_plugName(plug)), value)
+
+        # the last forced connection to a destination wins
+        inputs = {}
+        order = []
+        for source, destination, force in self._connections:
+            dstName = _plugName(destination)
+            if dstName not in inputs:
+                order.append(dstName)
+            elif not force:
+                raise RuntimeError("{} is already connected".format(dstName))
+            inputs[dstName] = (_plugName(source), force)
+
+        for dstName in order:
+            srcName, force = inputs[dstName]
+            srcPlug = _getMPlug(srcName)
+            dstPlug = _getMPlug(dstName)
+            # a compound source to a child connects the parent, like
+            # createMulDivNode did with the vector inputs
+            if (srcPlug.isCompound() and not dstPlug.isCompound()
+                    and dstPlug.isChild()):
+                dstPlug = dstPlug.parent()
+            existing = OpenMaya.MPlugArray()
+            dstPlug.connectedTo(existing, True, False)
+            if existing.length():
+                if not force:
+                    raise RuntimeError(
+                        "{} is already connected".format(dstPlug.name()))
+                self.modifier.disconnect(existing[0], dstPlug)
+            self.modifier.connect(srcPlug, dstPlug)
+        self.modifier.doIt()
+        self.timings.append(("Set and connect",
+                             datetime.datetime.now() - start))
+
+        return self.modifier
+
+    def undoIt(self):
+        """Revert the committed network"""
+        if self.modifier:
+            self.modifier.undoIt()
+
+
+_immediateBuilder = NetworkBuilder(batch=False)
+
+
+def getNetworkBuilder():
+    """Get the builder used by the node creation functions
+
+    Returns:
+        NetworkBuilder: The builder of the current context or a builder
+            executing each operation immediately.
+
+    """
+    return NetworkBuilder.current() or _immediateBuilder
+
+
+def getBuiltNode(builder, node):
+    """Get the value returned by the node creation functions
+
+    Arguments:
+        builder (NetworkBuilder): The builder used to create the node
+        node (NodeHandle or str): The created node
+
+    Returns:
+        PyNode or NodeHandle: The PyNode or the handle if the builder is in
+            batch mode.
+
+    """
+    if builder.batch:
+        return node
+    return pm.PyNode(node)
+
+
+def connectSet(builder, item, plug):
+    """Connect the item to the plug if it is a plug, else set the value
+
+    Arguments:
+        builder (NetworkBuilder): The builder
+        item (attr, str or value): The input plug or value
+        plug (PlugHandle, attr or str): The destination plug
+
+    """
+    if _isPlug(item):
+        builder.connect(item, plug)
+    else:
+        builder.setAttr(plug, item)
+
+
 #############################################
 # CREATE SIMPLE NODES
 #############################################
@@ -29,27 +417,34 @@ def createMultMatrixNode(mA, mB, target=False, transform='srt'):
         pyNode: Newly created mGear_multMatrix node
 
     """
-    node = pm.createNode("multMatrix")
+    nb = getNetworkBuilder()
+    node = nb.createNode("multMatrix")
     for m, mi in zip([mA, mB], ['matrixIn[0]', 'matrixIn[1]']):
-        if isinstance(m, datatypes.Matrix):
-            pm.setAttr(node.attr(mi), m)
-        else:
-            pm.connectAttr(m, node.attr(mi))
+        connectSet(nb, m, node + "." + mi)
     if target:
-        dm_node = pm.createNode("decomposeMatrix")
-        pm.connectAttr(node + ".matrixSum",
-                       dm_node + ".inputMatrix")
-        if 't' in transform:
-            pm.connectAttr(dm_node + ".outputTranslate",
-                           target.attr("translate"), f=True)
-        if 'r' in transform:
-            pm.connectAttr(dm_node + ".outputRotate",
-                           target.attr("rotate"), f=True)
-        if 's' in transform:
-            pm.connectAttr(dm_node + ".outputScale",
-                           target.attr("scale"), f=True)
+        connectDecomposedMatrix(nb, node + ".matrixSum", target, transform)
+
+    return getBuiltNode(nb, node)
 
-    return node
+
+def connectDecomposedMatrix(nb, m, target, transform):
+    """Decompose a matrix and connect the SRT to a target
+
+    Arguments:
+        nb (NetworkBuilder): The builder
+        m (attr or str): The matrix plug
+        target (dagNode): The object to drive
+        transform (str): The channels to connect, s r t
+
+    """
+    dm_node = nb.createNode("decomposeMatrix")
+    nb.connect(m, dm_node + ".inputMatrix")
+    if 't' in transform:
+        nb.connect(dm_node + ".outputTranslate", target.attr("translate"))
+    if 'r' in transform:
+        nb.connect(dm_node + ".outputRotate", target.attr("rotate"))
+    if 's' in transform:
+        nb.connect(dm_node + ".outputScale", target.attr("scale"))
 
 
 def createDecomposeMatrixNode(m):
@@ -65,11 +460,12 @@ def createDecomposeMatrixNode(m):
     >>> dm_node = nod.createDecomposeMatrixNode(mulmat_node+".output")
 
     """
-    node = pm.createNode("decomposeMatrix")
+    nb = getNetworkBuilder()
+    node = nb.createNode("decomposeMatrix")
 
-    pm.connectAttr(m, node + ".inputMatrix")
+    nb.connect(m, node + ".inputMatrix")
 
-    return node
+    return getBuiltNode(nb, node)
 
 
 def createDistNode(objA, objB, output=None):
@@ -86,21 +482,22 @@ def createDistNode(objA, objB, output=None):
     >>> distA_node = nod.createDistNode(self.tws0_loc, self.tws1_loc)
 
     """
-    node = pm.createNode("distanceBetween")
+    nb = getNetworkBuilder()
+    node = nb.createNode("distanceBetween")
 
-    dm_nodeA = pm.createNode("decomposeMatrix")
-    dm_nodeB = pm.createNode("decomposeMatrix")
+    dm_nodeA = nb.createNode("decomposeMatrix")
+    dm_nodeB = nb.createNode("decomposeMatrix")
 
-    pm.connectAttr(objA + ".worldMatrix", dm_nodeA + ".inputMatrix")
-    pm.connectAttr(objB + ".worldMatrix", dm_nodeB + ".inputMatrix")
+    nb.connect(objA + ".worldMatrix", dm_nodeA + ".inputMatrix")
+    nb.connect(objB + ".worldMatrix", dm_nodeB + ".inputMatrix")
 
-    pm.connectAttr(dm_nodeA + ".outputTranslate", node + ".point1")
-    pm.connectAttr(dm_nodeB + ".outputTranslate", node + ".point2")
+    nb.connect(dm_nodeA + ".outputTranslate", node + ".point1")
+    nb.connect(dm_nodeB + ".outputTranslate", node + ".point2")
 
     if output:
-        pm.connectAttr(node + ".distance", output)
+        nb.connect(node + ".distance", output)
 
-    return node
+    return getBuiltNode(nb, node)
 
 
 def createConditionNode(firstTerm=False,
@@ -142,22 +539,22 @@ def createConditionNode(firstTerm=False,
                                              plusTotalLength_node+".output1D")
 
     """
-    check_list = (pm.Attribute, unicode, str)
-    node = pm.createNode("condition")
-    pm.setAttr(node + ".operation", operator)
+    nb = getNetworkBuilder()
+    node = nb.createNode("condition")
+    nb.setAttr(node + ".operation", operator)
     if firstTerm:
-        attribute.connectSet(firstTerm, node + ".firstTerm", check_list)
+        connectSet(nb, firstTerm, node + ".firstTerm")
 
     if secondTerm:
-        attribute.connectSet(secondTerm, node + ".secondTerm", check_list)
+        connectSet(nb, secondTerm, node + ".secondTerm")
 
     if ifTrue:
-        attribute.connectSet(ifTrue, node + ".colorIfTrueR", check_list)
+        connectSet(nb, ifTrue, node + ".colorIfTrueR")
 
     if ifFalse:
-        attribute.connectSet(ifFalse, node + ".colorIfFalseR", check_list)
+        connectSet(nb, ifFalse, node + ".colorIfFalseR")
 
-    return node
+    return getBuiltNode(nb, node)
 
 
 def createBlendNode(inputA, inputB, blender=.5):
@@ -179,7 +576,8 @@ def createBlendNode(inputA, inputB, blender=.5):
             self.lock_ori_att)
 
     """
-    node = pm.createNode("blendColors")
+    nb = getNetworkBuilder()
+    node = nb.createNode("blendColors")
 
     if not isinstance(inputA, list):
         inputA = [inputA]
@@ -188,29 +586,14 @@ def createBlendNode(inputA, inputB, blender=.5):
         inputB = [inputB]
 
     for item, s in zip(inputA, "RGB"):
-        if (isinstance(item, str)
-                or isinstance(item, unicode)
-                or isinstance(item, pm.Attribute)):
-            pm.connectAttr(item, node + ".color1" + s)
-        else:
-            pm.setAttr(node + ".color1" + s, item)
+        connectSet(nb, item, node + ".color1" + s)
 
     for item, s in zip(inputB, "RGB"):
-        if (isinstance(item, str)
-                or isinstance(item, unicode)
-                or isinstance(item, pm.Attribute)):
-            pm.connectAttr(item, node + ".color2" + s)
-        else:
-            pm.setAttr(node + ".color2" + s, item)
+        connectSet(nb, item, node + ".color2" + s)
 
-    if (isinstance(blender, str)
-            or isinstance(blender, unicode)
-            or isinstance(blender, pm.Attribute)):
-        pm.connectAttr(blender, node + ".blender")
-    else:
-        pm.setAttr(node + ".blender", blender)
+    connectSet(nb, blender, node + ".blender")
 
-    return node
+    return getBuiltNode(nb, node)
 
 
 def createPairBlend(inputA=None,
@@ -248,35 +631,31 @@ def createPairBlend(inputA=None,
             pm.connectAttr(blend_node + ".outTranslate", x+".translate")
 
     """
-    node = pm.createNode("pairBlend")
-    node.attr("rotInterpolation").set(rotInterpolation)
+    nb = getNetworkBuilder()
+    node = nb.createNode("pairBlend")
+    nb.setAttr(node + ".rotInterpolation", rotInterpolation)
 
     if inputA:
         if trans:
-            pm.connectAttr(inputA + ".translate", node + ".inTranslate1")
+            nb.connect(inputA + ".translate", node + ".inTranslate1")
         if rot:
-            pm.connectAttr(inputA + ".rotate", node + ".inRotate1")
+            nb.connect(inputA + ".rotate", node + ".inRotate1")
 
     if inputB:
         if trans:
-            pm.connectAttr(inputB + ".translate", node + ".inTranslate2")
+            nb.connect(inputB + ".translate", node + ".inTranslate2")
         if rot:
-            pm.connectAttr(inputB + ".rotate", node + ".inRotate2")
+            nb.connect(inputB + ".rotate", node + ".inRotate2")
 
-    if (isinstance(blender, str)
-            or isinstance(blender, unicode)
-            or isinstance(blender, pm.Attribute)):
-        pm.connectAttr(blender, node + ".weight")
-    else:
-        pm.setAttr(node + ".weight", blender)
+    connectSet(nb, blender, node + ".weight")
 
     if output:
         if rot:
-            pm.connectAttr(node + ".outRotate", output + ".rotate")
+            nb.connect(node + ".outRotate", output + ".rotate")
         if trans:
-            pm.connectAttr(node + ".outTranslate", output + ".translate")
+            nb.connect(node + ".outTranslate", output + ".translate")
 
-    return node
+    return getBuiltNode(nb, node)
 
 
 def createSetRangeNode(input,
@@ -288,54 +667,26 @@ def createSetRangeNode(input,
                        name="setRange"):
     """Create Set Range Node"""
 
-    node = pm.createNode("setRange", n=name)
+    nb = getNetworkBuilder()
+    node = nb.createNode("setRange", name)
 
     if not isinstance(input, list):
         input = [input]
 
     for item, s in zip(input, "XYZ"):
-        if (isinstance(item, str)
-                or isinstance(item, unicode)
-                or isinstance(item, pm.Attribute)):
-            pm.connectAttr(item, node + ".value" + s)
-        else:
-            pm.setAttr(node + ".value" + s, item)
-
-        if (isinstance(oldMin, str)
-                or isinstance(oldMin, unicode)
-                or isinstance(oldMin, pm.Attribute)):
-            pm.connectAttr(oldMin, node + ".oldMin" + s)
-        else:
-            pm.setAttr(node + ".oldMin" + s, oldMin)
-
-        if (isinstance(oldMax, str)
-                or isinstance(oldMax, unicode)
-                or isinstance(oldMax, pm.Attribute)):
-            pm.connectAttr(oldMax, node + ".oldMax" + s)
-        else:
-            pm.setAttr(node + ".oldMax" + s, oldMax)
-
-        if (isinstance(newMin, str)
-                or isinstance(newMin, unicode)
-                or isinstance(newMin, pm.Attribute)):
-            pm.connectAttr(newMin, node + ".min" + s)
-        else:
-            pm.setAttr(node + ".min" + s, newMin)
-
-        if (isinstance(newMax, str)
-                or isinstance(newMax, unicode)
-                or isinstance(newMax, pm.Attribute)):
-            pm.connectAttr(newMax, node + ".max" + s)
-        else:
-            pm.setAttr(node + ".max" + s, newMax)
+        connectSet(nb, item, node + ".value" + s)
+        connectSet(nb, oldMin, node + ".oldMin" + s)
+        connectSet(nb, oldMax, node + ".oldMax" + s)
+        connectSet(nb, newMin, node + ".min" + s)
+        connectSet(nb, newMax, node + ".max" + s)
 
     if output:
         if not isinstance(output, list):
             output = [output]
         for out, s in zip(output, "XYZ"):
-            pm.connectAttr(node + ".outValue" + s, out, f=True)
+            nb.connect(node + ".outValue" + s, out, force=True)
 
-    return node
+    return getBuiltNode(nb, node)
 
 
 def createReverseNode(input, output=None):
@@ -352,26 +703,22 @@ def createReverseNode(input, output=None):
     >>> fkvis_node = nod.createReverseNode(self.blend_att)
 
     """
-    node = pm.createNode("reverse")
+    nb = getNetworkBuilder()
+    node = nb.createNode("reverse")
 
     if not isinstance(input, list):
         input = [input]
 
     for item, s in zip(input, "XYZ"):
-        if (isinstance(item, str)
-                or isinstance(item, unicode)
-                or isinstance(item, pm.Attribute)):
-            pm.connectAttr(item, node + ".input" + s)
-        else:
-            pm.setAttr(node + ".input" + s, item)
+        connectSet(nb, item, node + ".input" + s)
 
     if output:
         if not isinstance(output, list):
             output = [output]
         for out, s in zip(output, "XYZ"):
-            pm.connectAttr(node + ".output" + s, out, f=True)
+            nb.connect(node + ".output" + s, out, force=True)
 
-    return node
+    return getBuiltNode(nb, node)
 
 
 def createCurveInfoNode(crv):
@@ -386,13 +733,14 @@ def createCurveInfoNode(crv):
     >>> crv_node = nod.createCurveInfoNode(self.slv_crv)
 
     """
-    node = pm.createNode("curveInfo")
+    nb = getNetworkBuilder()
+    node = nb.createNode("curveInfo")
 
-    shape = pm.listRelatives(crv, shapes=True)[0]
+    shape = cmds.listRelatives(str(crv), shapes=True, fullPath=True)[0]
 
-    pm.connectAttr(shape + ".local", node + ".inputCurve")
+    nb.connect(shape + ".local", node + ".inputCurve")
 
-    return node
+    return getBuiltNode(nb, node)
 
 
 # TODO: update using plusMinusAverage node
@@ -409,23 +757,13 @@ def createAddNode(inputA, inputB):
     >>> add_node = nod.createAddNode(self.roundness_att, .001)
 
     """
-    node = pm.createNode("addDoubleLinear")
+    nb = getNetworkBuilder()
+    node = nb.createNode("addDoubleLinear")
 
-    if (isinstance(inputA, str)
-            or isinstance(inputA, unicode)
-            or isinstance(inputA, pm.Attribute)):
-        pm.connectAttr(inputA, node + ".input1")
-    else:
-        pm.setAttr(node + ".input1", inputA)
+    connectSet(nb, inputA, node + ".input1")
+    connectSet(nb, inputB, node + ".input2")
 
-    if (isinstance(inputB, str)
-            or isinstance(inputB, unicode)
-            or isinstance(inputB, pm.Attribute)):
-        pm.connectAttr(inputB, node + ".input2")
-    else:
-        pm.setAttr(node + ".input2", inputB)
-
-    return node
+    return getBuiltNode(nb, node)
 
 
 # TODO: update using plusMinusAverage node
@@ -442,26 +780,20 @@ def createSubNode(inputA, inputB):
     >>> sub_nod = nod.createSubNode(self.roll_att, angle_outputs[i-1])
 
     """
-    node = pm.createNode("addDoubleLinear")
+    nb = getNetworkBuilder()
+    node = nb.createNode("addDoubleLinear")
 
-    if (isinstance(inputA, str)
-            or isinstance(inputA, unicode)
-            or isinstance(inputA, pm.Attribute)):
-        pm.connectAttr(inputA, node + ".input1")
-    else:
-        pm.setAttr(node + ".input1", inputA)
-
-    if (isinstance(inputB, str)
-            or isinstance(inputB, unicode)
-            or isinstance(inputB, pm.Attribute)):
-        neg_node = pm.createNode("multiplyDivide")
-        pm.connectAttr(inputB, neg_node + ".input1X")
-        pm.setAttr(neg_node + ".input2X", -1)
-        pm.connectAttr(neg_node + ".outputX", node + ".input2")
+    connectSet(nb, inputA, node + ".input1")
+
+    if _isPlug(inputB):
+        neg_node = nb.createNode("multiplyDivide")
+        nb.connect(inputB, neg_node + ".input1X")
+        nb.setAttr(neg_node + ".input2X", -1)
+        nb.connect(neg_node + ".outputX", node + ".input2")
     else:
-        pm.setAttr(node + ".input2", -inputB)
+        nb.setAttr(node + ".input2", -inputB)
 
-    return node
+    return getBuiltNode(nb, node)
 
 
 def createPowNode(inputA, inputB, output=None):
@@ -539,8 +871,9 @@ def createMulDivNode(inputA, inputB, operation=1, output=None):
         pyNode: the newly created node.
 
     """
-    node = pm.createNode("multiplyDivide")
-    pm.setAttr(node + ".operation", operation)
+    nb = getNetworkBuilder()
+    node = nb.createNode("multiplyDivide")
+    nb.setAttr(node + ".operation", operation)
 
     if not isinstance(inputA, list):
         inputA = [inputA]
@@ -549,42 +882,38 @@ def createMulDivNode(inputA, inputB, operation=1, output=None):
         inputB = [inputB]
 
     for item, s in zip(inputA, "XYZ"):
-        if (isinstance(item, str)
-                or isinstance(item, unicode)
-                or isinstance(item, pm.Attribute)):
+        if _isPlug(item):
             try:
-                pm.connectAttr(item, node + ".input1" + s, f=True)
+                nb.connect(item, node + ".input1" + s, force=True)
             except(UnicodeEncodeError, RuntimeError):
                 # Maya in Japanese have an issue with unicodeEndoce
                 # UnicodeEncodeError is a workaround
-                pm.connectAttr(item, node + ".input1", f=True)
+                nb.connect(item, node + ".input1", force=True)
                 break
 
         else:
-            pm.setAttr(node + ".input1" + s, item)
+            nb.setAttr(node + ".input1" + s, item)
 
     for item, s in zip(inputB, "XYZ"):
-        if (isinstance(item, str)
-                or isinstance(item, unicode)
-                or isinstance(item, pm.Attribute)):
+        if _isPlug(item):
             try:
-                pm.connectAttr(item, node + ".input2" + s, f=True)
+                nb.connect(item, node + ".input2" + s, force=True)
             except(UnicodeEncodeError, RuntimeError):
                 # Maya in Japanese have an issue with unicodeEndoce
                 # UnicodeEncodeError is a workaround
-                pm.connectAttr(item, node + ".input2", f=True)
+                nb.connect(item, node + ".input2", force=True)
                 break
         else:
-            pm.setAttr(node + ".input2" + s, item)
+            nb.setAttr(node + ".input2" + s, item)
 
     if output:
         if not isinstance(output, list):
             output = [output]
 
         for item, s in zip(output, "XYZ"):
-            pm.connectAttr(node + ".output" + s, item, f=True)
+            nb.connect(node + ".output" + s, item, force=True)
 
-    return node
+    return getBuiltNode(nb, node)
 
 
 def createClampNode(input, in_min, in_max):
@@ -604,7 +933,8 @@ def createClampNode(input, in_min, in_max):
         [180,0,180])
 
     """
-    node = pm.createNode("clamp")
+    nb = getNetworkBuilder()
+    node = nb.createNode("clamp")
 
     if not isinstance(input, list):
         input = [input]
@@ -614,29 +944,11 @@ def createClampNode(input, in_min, in_max):
         in_max = [in_max]
 
     for in_item, min_item, max_item, s in zip(input, in_min, in_max, "RGB"):
+        connectSet(nb, in_item, node + ".input" + s)
+        connectSet(nb, min_item, node + ".min" + s)
+        connectSet(nb, max_item, node + ".max" + s)
 
-        if (isinstance(in_item, str)
-                or isinstance(in_item, unicode)
-                or isinstance(in_item, pm.Attribute)):
-            pm.connectAttr(in_item, node + ".input" + s)
-        else:
-            pm.setAttr(node + ".input" + s, in_item)
-
-        if (isinstance(min_item, str)
-                or isinstance(min_item, unicode)
-                or isinstance(min_item, pm.Attribute)):
-            pm.connectAttr(min_item, node + ".min" + s)
-        else:
-            pm.setAttr(node + ".min" + s, min_item)
-
-        if (isinstance(max_item, str)
-                or isinstance(max_item, unicode)
-                or isinstance(max_item, pm.Attribute)):
-            pm.connectAttr(max_item, node + ".max" + s)
-        else:
-            pm.setAttr(node + ".max" + s, max_item)
-
-    return node
+    return getBuiltNode(nb, node)
 
 
 def createPlusMinusAverage1D(input, operation=1, output=None):
@@ -654,19 +966,17 @@ def createPlusMinusAverage1D(input, operation=1, output=None):
     if not isinstance(input, list):
         input = [input]
 
-    node = pm.createNode("plusMinusAverage")
-    node.attr("operation").set(operation)
+    nb = getNetworkBuilder()
+    node = nb.createNode("plusMinusAverage")
+    nb.setAttr(node + ".operation", operation)
 
     for i, x in enumerate(input):
-        try:
-            pm.connectAttr(x, node + ".input1D[%s]" % str(i))
-        except RuntimeError:
-            pm.setAttr(node + ".input1D[%s]" % str(i), x)
+        connectSet(nb, x, node + ".input1D[%s]" % str(i))
 
     if output:
-        pm.connectAttr(node + ".output1D", output)
+        nb.connect(node + ".output1D", output)
 
-    return node
+    return getBuiltNode(nb, node)
 
 
 def createVertexPositionNode(inShape,
@@ -910,3 +1220,125 @@ def controller_tag_connect(ctt, tagParent):
     pm.disconnectAttr(ctt.parent)
     pm.connectAttr(ctt.parent, tpTagNode.attr(
                    "children[%s]" % str(ni)))
+
+
+def _getControllerTag(name):
+    sel = OpenMaya.MSelectionList()
+    sel.add(name)
+    mobject = OpenMaya.MObject()
+    sel.getDependNode(0, mobject)
+    plug = OpenMaya.MFnDependencyNode(mobject).findPlug("message", False)
+    plugs = OpenMaya.MPlugArray()
+    plug.connectedTo(plugs, False, True)
+    for i in range(plugs.length()):
+        fn = OpenMaya.MFnDependencyNode(plugs[i].node())
+        if fn.typeName() == "controller":
+            return fn.name()
+
+
+def add_controller_tags(ctlTags, hierarchy=True, prepopulate=None):
+    """Add the controller tags of several controls in a single pass
+
+    The tags are created and connected by one NetworkBuilder. The tag parent
+    can be one of the other controls, the controls already tagged keep
+    their tag.
+
+    Args:
+        ctlTags (list): (control, tag parent) tuples. The tag parent can be
+            None
+        hierarchy (bool, optional): If False the tags are not parented
+        prepopulate (bool, optional): The prepopulate value of the tags
+            without parent. The children tags are connected to the
+            prepopulate of their parent.
+
+    Returns:
+        list: The tags names, in the order of the controls
+    """
+    if versions.current() < 201650:
+        return []
+
+    # the last tag parent of a control wins
+    names = []
+    parents = {}
+    for ctl, tagParent in ctlTags:
+        name = str(ctl)
+        if name not in parents:
+            names.append(name)
+        parents[name] = str(tagParent) if tagParent else None
+
+    clean_orphan_controller_tags(
+        [name for name in names if not _getControllerTag(name)])
+
+    tags = {}
+    nextIndex = {}
+    with NetworkBuilder() as nb:
+        for name in names:
+            tag = _getControllerTag(name)
+            if tag and hierarchy and parents[name]:
+                # re-parent the tag, like controller_tag_connect
+                for plug in cmds.listConnections(tag + ".parent",
+                                                 source=False,
+                                                 plugs=True) or []:
+                    cmds.disconnectAttr(tag + ".parent", plug)
+            elif not tag:
+                tag = nb.createNode("controller",
+                                    name.split("|")[-1] + "_tag")
+                nb.connect(name + ".message", tag + ".controllerObject")
+            tags[name] = tag
+
+        for name in names:
+            tag = tags[name]
+            tagParent = parents[name]
+            parentTag = None
+            if hierarchy and tagParent:
+                parentTag = tags.get(tagParent) \
+                    or _getControllerTag(tagParent)
+
+            if parentTag is None:
+                if prepopulate is not None:
+                    nb.setAttr(tag + ".prepopulate", prepopulate)
+                continue
+
+            if parentTag not in nextIndex:
+                nb.setAttr(parentTag + ".cycleWalkSibling", True)
+                index = 0
+                if isinstance(parentTag, basestring):
+                    indices = cmds.getAttr(parentTag + ".children",
+                                           multiIndices=True)
+                    if indices:
+                        index = indices[-1] + 1
+                nextIndex[parentTag] = index
+            nb.connect(parentTag + ".prepopulate", tag + ".prepopulate",
+                       force=True)
+            nb.connect(tag + ".parent",
+                       parentTag + ".children[%s]" % nextIndex[parentTag])
+            nextIndex[parentTag] += 1
+
+    return [str(tags[name]) for name in names]
+
+
+def clean_orphan_controller_tags(ctls):
+    """Delete the "<control>_tag" controller tags without control
+
+    Maya doesn't delete the controller tag of a deleted control, so the tag
+    of a control built again would be renamed. The referenced tags are
+    kept.
+
+    Args:
+        ctls (list of str): The controls names
+
+    Returns:
+        list: The deleted tags names
+    """
+    if versions.current() < 201650:
+        return []
+
+    tags = cmds.ls([str(ctl).split("|")[-1] + "_tag" for ctl in ctls],
+                   type="controller") if ctls else []
+    orphans = [tag for tag in tags
+               if not cmds.referenceQuery(tag, isNodeReferenced=True)
+               and not cmds.listConnections(tag + ".controllerObject",
+                                            destination=False)]
+    if orphans:
+        cmds.delete(orphans)
+    return orphans
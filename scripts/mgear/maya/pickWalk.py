@@ -1,6 +1,8 @@
 """Custom Pick walk"""
 
 import pymel.core as pm
+import maya.OpenMaya as OpenMaya
+from maya import cmds
 
 from mgear import string
 
@@ -23,71 +25,170 @@ def getWalkTag(node):
         return tag[0]
 
 
-def reorderControllerChildrenTags(tag):
-    """Clean the order on the children connection.
+##########################################################
+# WALK GRAPH
+##########################################################
+
+class WalkGraph(object):
+    """Pick walk graph of a rig, built from the controller tags.
+
+    The graph stores for each control of the rig its parent, its ordered
+    children, its left and right siblings and its mirror contrapart. So
+    each pick walk step is a dictionary lookup.
 
-    This is important for the Left and right pick walk.
-    Becasue is using the index of the connection.
+    Orphan tags (without controller object) are skipped when the graph is
+    built. The controls are stored as PyNodes, so the graph is still valid
+    after renaming or reparenting them.
 
     Arguments:
-        tag (controller tag): The tag to clean the children order
+        root (str): The long name of the rig top node. If None the graph is
+            empty.
 
     """
-    ch = tag.children.connections()
-    for i, c in enumerate(ch):
-        d = c.children.connections(c.parent, p=True)[0]
-        pm.disconnectAttr(c.parent, d)
-        pm.connectAttr(c.parent, tag.attr("children[%s]" % str(i)))
 
-
-def cleanOrphaneControllerTags(tag):
-    """Security check, delete tags without controlObject plug
+    def __init__(self, root):
+        self.root = root
+        self.nodes = {}
+        if root:
+            self._build()
+
+    def _build(self):
+        tags = cmds.ls(type="controller")
+        if not tags:
+            return
+
+        # all the tag inputs in one graph query:
+        # tag.controllerObject <- ctl.message
+        # tag.children[i] <- childTag.parent
+        cnx = cmds.listConnections(tags,
+                                   connections=True,
+                                   plugs=True,
+                                   source=True,
+                                   destination=False) or []
+        tagCtl = {}
+        tagChildren = {}
+        for dst, src in zip(cnx[::2], cnx[1::2]):
+            tag, attr = dst.split(".", 1)
+            if attr == "controllerObject":
+                tagCtl[tag] = src.split(".")[0]
+            elif attr.startswith("children["):
+                index = int(attr[len("children["):attr.index("]")])
+                tagChildren.setdefault(tag, []).append(
+                    (index, src.split(".")[0]))
+
+        # keep only the controls under the rig top node
+        prefix = self.root + "|"
+        tagNode = {}
+        for tag, ctl in tagCtl.items():
+            sel = OpenMaya.MSelectionList()
+            try:
+                sel.add(ctl)
+                dagPath = OpenMaya.MDagPath()
+                sel.getDagPath(0, dagPath)
+            except RuntimeError:
+                continue
+            fullPath = dagPath.fullPathName()
+            if fullPath == self.root or fullPath.startswith(prefix):
+                tagNode[tag] = pm.PyNode(dagPath)
+
+        for tag, n in tagNode.items():
+            self.nodes[n] = {"parent": None,
+                             "children": [],
+                             "siblings": [],
+                             "left": None,
+                             "right": None,
+                             "mirror": None}
+
+        for tag, n in tagNode.items():
+            children = [tagNode[c] for i, c in sorted(tagChildren.get(tag, []))
+                        if c in tagNode]
+            self.nodes[n]["children"] = children
+            for i, c in enumerate(children):
+                self.nodes[c]["parent"] = n
+                self.nodes[c]["siblings"] = children
+                self.nodes[c]["left"] = children[i - 1]
+                self.nodes[c]["right"] = children[(i + 1) % len(children)]
+
+        names = dict((n.nodeName(), n) for n in self.nodes)
+        for name, n in names.items():
+            self.nodes[n]["mirror"] = names.get(string.convertRLName(name))
+
+    def get(self, node, key):
+        """Get the walk data of a node
+
+        Arguments:
+            node (dagNode): The control
+            key (str): "parent", "children", "siblings", "left", "right"
+                or "mirror"
+
+        Returns:
+            The walk data or None if the node is not in the graph
+
+        """
+        data = self.nodes.get(node)
+        if data:
+            return data[key]
+
+
+_walkGraphs = {}
+_callbackIds = []
+
+
+def _tagConnectionChanged(srcPlug, dstPlug, *args):
+    if _walkGraphs and OpenMaya.MFnDependencyNode(
+            dstPlug.node()).typeName() == "controller":
+        clearWalkGraphs()
+
+
+def _tagRemoved(*args):
+    if _walkGraphs:
+        clearWalkGraphs()
+
+
+def _addCallbacks():
+    if _callbackIds:
+        return
+    _callbackIds.append(
+        OpenMaya.MDGMessage.addConnectionCallback(_tagConnectionChanged))
+    _callbackIds.append(
+        OpenMaya.MDGMessage.addNodeRemovedCallback(_tagRemoved, "controller"))
+    for msg in (OpenMaya.MSceneMessage.kBeforeNew,
+                OpenMaya.MSceneMessage.kBeforeOpen):
+        _callbackIds.append(
+            OpenMaya.MSceneMessage.addCallback(msg, _tagRemoved))
+
+
+def clearWalkGraphs():
+    """Clear the cached walk graphs. They are rebuilt on the next walk."""
+    _walkGraphs.clear()
+
+
+def getWalkGraph(node):
+    """Get the walk graph of the rig of the node
+
+    The graph is built once and cached until a controller tag connection
+    changes.
 
     Arguments:
-        tag (controllers tag list): The tags to check
+        node (dagNode): A node of the rig
 
     Returns:
-        list: The valid tags with controller object plugged
+        WalkGraph: The walk graph
 
     """
-    if not isinstance(tag, list):
-        tag = [tag]
-    validTags = []
-    for t in tag:
-        if not t.controllerObject.connections():
-            pm.displayWarning("The controller tag: %s have not controller "
-                              "object input. Auto Deleted!" % t.name())
-            pm.delete(t)
-            reorderControllerChildrenTags(t)
-        else:
-            validTags.append(t)
-    return validTags
+    if not isinstance(node, pm.nt.DagNode):
+        return WalkGraph(None)
+    root = "|" + node.longName().split("|")[1]
+    if root not in _walkGraphs:
+        _addCallbacks()
+        _walkGraphs[root] = WalkGraph(root)
+    return _walkGraphs[root]
 
 
 ##########################################################
 # PICK WALK
 ##########################################################
 
-def _getControllerWalkNodes(tag):
-    """Get the node conneted to a controllers tag as a controller object
-
-    Arguments:
-        tag (controller list): Maya's controller tag
-
-    Returns:
-        dagNode: The list of controller objects
-
-    """
-    nodes = []
-    if not isinstance(tag, list):
-        tag = [tag]
-    for t in tag:
-        cnx = t.controllerObject.connections()
-        if cnx:
-            nodes.append(cnx[0])
-    return nodes
-
-
 def controllerWalkUp(node, add=False):
     """Walk up in the hierachy using the controller tag
 
@@ -100,16 +201,16 @@ def controllerWalkUp(node, add=False):
     if not isinstance(node, list):
         node = [node]
     for n in node:
-        tag = getWalkTag(n)
-        if tag:
-            cnx = tag.parent.connections()
-            if cnx:
-                oParent.append(cnx[0])
+        graph = getWalkGraph(n)
+        if n in graph.nodes:
+            p = graph.get(n, "parent")
+            if p:
+                oParent.append(p)
         else:
             pm.displayWarning("The selected object: %s without Controller tag "
                               "will be skipped" % n.name())
     if oParent:
-        pm.select(_getControllerWalkNodes(oParent), add=add)
+        pm.select(oParent, add=add)
     else:
         pm.displayWarning("No parent to walk Up.")
 
@@ -126,10 +227,9 @@ def controllerWalkDown(node, add=False, multi=False):
     if not isinstance(node, list):
         node = [node]
     for n in node:
-        tag = getWalkTag(n)
-        if tag:
-            cnx = cleanOrphaneControllerTags(tag.children.connections())
-        else:
+        graph = getWalkGraph(n)
+        cnx = graph.get(n, "children")
+        if cnx is None:
             pm.displayWarning("The selected object: %s without Controller tag "
                               "will be skipped" % n.name())
         if cnx:
@@ -138,13 +238,13 @@ def controllerWalkDown(node, add=False, multi=False):
             else:
                 oChild.append(cnx[0])
     if oChild:
-        pm.select(_getControllerWalkNodes(oChild), add=add)
+        pm.select(oChild, add=add)
     else:
         pm.displayWarning("No child to walk Down.")
 
 
 def _getControllerWalkSiblings(node, direction="right", multi=False):
-    """Get the sibling tag of the controller tag
+    """Get the sibling of the controller, from the walk graph
 
     Arguments:
         node (dagNode or list of dagNode): Node with the controller tag
@@ -153,46 +253,29 @@ def _getControllerWalkSiblings(node, direction="right", multi=False):
         multi (bool, optional): If true, selects all the siblings
 
     Returns:
-        TYPE: Description
+        dagNode list: The siblings
 
     """
-    if direction == "right":
-        d = 1
-    else:
-        d = -1
-
     if not isinstance(node, list):
         node = [node]
 
-    siblingsTags = []
+    siblingsNode = []
 
     for n in node:
-        tag = getWalkTag(n)
-        if tag:
-            pTag = tag.parent.connections()
-            if pTag:
-                siblings = cleanOrphaneControllerTags(
-                    pTag[0].children.connections())
-
+        graph = getWalkGraph(n)
+        if n in graph.nodes:
+            if graph.get(n, "parent"):
                 if multi:
-                    siblingsTags = siblingsTags + siblings
+                    siblingsNode = siblingsNode + graph.get(n, "siblings")
                 else:
-                    i = siblings.index(tag)
-                    if i <= len(siblings) - 2:
-                        siblingsTags.append(siblings[i + d])
-                    else:
-                        siblingsTags.append(siblings[0])
+                    siblingsNode.append(graph.get(n, direction))
             else:
-                pm.displayWarning("The tag: %s doesn't have parent "
-                                  "tag" % tag.name())
+                pm.displayWarning("The controller: %s doesn't have parent "
+                                  "tag" % n.name())
         else:
             pm.displayWarning("The selected object: %s without Controller tag"
                               " will be skipped" % n.name())
 
-    siblingsNode = []
-    for t in siblingsTags:
-        siblingsNode.append(t.controllerObject.connections()[0])
-
     return siblingsNode
 
 
@@ -352,6 +435,10 @@ def getMirror(node):
         node = [node]
     mirrorNodes = []
     for n in node:
+        mirror = getWalkGraph(n).get(n, "mirror")
+        if mirror:
+            mirrorNodes.append(mirror)
+            continue
         try:
             mirrorNodes.append(pm.PyNode(string.convertRLName(n.name())))
         except Exception:
@@ -398,8 +485,7 @@ def _walk(node, direction, add=False, multi=False):
     """
     if not isinstance(node, list):
         node = [node]
-    tag = getWalkTag(node[0])
-    if tag:
+    if node[0] in getWalkGraph(node[0]).nodes:
         pm.displayInfo("Controller Tag PickWalk")
         if direction == "up":
             controllerWalkUp(node, add)
@@ -1,12 +1,14 @@
 """Channel wrangler tool, to manage user channel"""
 
 import json
+import datetime
 
 import pymel.core as pm
 from maya.app.general.mayaMixin import MayaQWidgetDockableMixin
 
 
-from mgear.maya import attribute, pyqt
+import mgear
+from mgear.maya import attribute, pyqt, utils
 import mgear.maya.rigbits.channelWranglerUI as channelWranglerUI
 from mgear.vendor.Qt import QtWidgets, QtCore
 
@@ -16,11 +18,29 @@ from mgear.vendor.Qt import QtWidgets, QtCore
 ######################################################################
 
 
-# apply the channel configuration from a dictionary
-def _applyChannelConfig(configDic):
+def planChannelConfig(configDic):
+    """Resolve and plan all the operations of a channel configuration
+
+    Nothing is changed in the scene until the returned operations are
+    applied.
+
+    Args:
+        configDic (dict): The channel wrangler configuration
+
+    Returns:
+        attribute.ChannelOperations: The planned operations
+    """
     tableMap = configDic["map"]
     movePolicy = configDic["movePolicy"]
     proxyPolicy = configDic["proxyPolicy"]
+
+    # resolve all the nodes at once
+    nodes = set()
+    for rule in tableMap:
+        nodes.update(rule[1:3])
+    ops = attribute.ChannelOperations(nodes)
+
+    start = datetime.datetime.now()
     for rule in tableMap:
         attr = rule[0]
         sourceNode = rule[1]
@@ -28,27 +48,77 @@ def _applyChannelConfig(configDic):
         option = rule[3]
         # proxy
         if option:
-            node = pm.PyNode(sourceNode)
-            sourceAttrs = node.attr(attr)
-            target = pm.PyNode(targetNode)
-            attribute.addProxyAttribute(sourceAttrs, target, proxyPolicy)
+            ops.addProxy("{}.{}".format(sourceNode, attr),
+                         targetNode,
+                         proxyPolicy)
         # move
         else:
-            attribute.moveChannel(attr, sourceNode, targetNode, movePolicy)
+            ops.addMove(attr, sourceNode, targetNode, movePolicy)
+    ops.timings.append(("Plan operations", datetime.datetime.now() - start))
+
+    return ops
+
+
+def _dryRunChannelConfig(configDic):
+    ops = planChannelConfig(configDic)
+    mgear.log("\n".join(["Channel wrangler dry run:"] + ops.diff()))
+    utils.logTimingReport("CHANNEL WRANGLER", ops.timings)
+    return ops
+
+
+# apply the channel configuration from a dictionary
+def _applyChannelConfig(configDic, dryRun=False):
+    if dryRun:
+        _dryRunChannelConfig(configDic)
+        return
+
+    start = datetime.datetime.now()
+    with pm.UndoChunk():
+        for rule in configDic["map"]:
+            if not pm.objExists(rule[1]) or not pm.objExists(rule[2]):
+                pm.displayWarning("Skipped {}: {} or {} doesn't exist"
+                                  .format(rule[0], rule[1], rule[2]))
+                continue
+            # proxy
+            if rule[3]:
+                sourceAttr = "{}.{}".format(rule[1], rule[0])
+                if not pm.objExists(sourceAttr):
+                    pm.displayWarning("Looks like the source channel {} "
+                                      "doesn't exist".format(sourceAttr))
+                    continue
+                attribute.addProxyAttribute(pm.PyNode(sourceAttr),
+                                            pm.PyNode(rule[2]),
+                                            configDic["proxyPolicy"])
+            # move
+            else:
+                attribute.moveChannel(rule[0],
+                                      pm.PyNode(rule[1]),
+                                      pm.PyNode(rule[2]),
+                                      configDic["movePolicy"])
+    utils.logTimingReport("CHANNEL WRANGLER",
+                          [("Apply rules", datetime.datetime.now() - start)])
 
 # apply the configuration stored in a  json file. This will be to use outside
 # the interface
 
 
-def applyChannelConfig(filePath):
+def applyChannelConfig(filePath, dryRun=False):
     """Apply the configuration stored in a  json file.
 
-    This will be to use outside the interface
+    This will be to use outside the interface. The rules are applied in one
+    undo chunk.
 
     Args:
         filePath (str): Path to the  channel wrangler configuration file
+        dryRun (bool, optional): If True, only log the planned changes
+
+    Returns:
+        attribute.ChannelOperations: The planned operations of a dry run,
+            else None
     """
     configDict = json.load(open(filePath))
+    if dryRun:
+        return _dryRunChannelConfig(configDict)
     _applyChannelConfig(configDict)
 
 
@@ -398,27 +468,9 @@ class channelWrangler(MayaQWidgetDockableMixin, QtWidgets.QDialog):
             oCombo.setCurrentIndex(rule[3])
 
     # apply the current configuration in the dialog
+    # the interface uses the undoable commands, one rule at the time
     def applyChannelConfig(self):
-        with pm.UndoChunk():
-            configDict = self._buildConfigDict()
-            # TODO add checker to avoid error if the datas is not
-            # found in the scene
-            for rule in configDict["map"]:
-                # proxy
-                if rule[3]:
-                    source = pm.PyNode("{}.{}".format(rule[1], rule[0]))
-                    target = pm.PyNode(rule[2])
-                    attribute.addProxyAttribute(source,
-                                                target,
-                                                configDict["proxyPolicy"])
-                # move
-                else:
-                    source = pm.PyNode(rule[1])
-                    target = pm.PyNode(rule[2])
-                    attribute.moveChannel(rule[0],
-                                          source,
-                                          target,
-                                          configDict["movePolicy"])
+        _applyChannelConfig(self._buildConfigDict())
 
     def _setOperator(self, operator):
         """set the channel wrangle operator
@@ -1,9 +1,15 @@
 """Shifters Rig Main class."""
 import os.path
+import sys
+import imp
+import json
 import datetime
 import getpass
+import traceback
 
 # Maya
+from maya import cmds
+import maya.OpenMaya as OpenMaya
 import pymel.core as pm
 from pymel.core import datatypes
 from pymel import versions
@@ -33,51 +39,211 @@ SYNOPTIC_PATH = os.path.abspath(os.path.join(
 SHIFTER_COMPONENT_ENV_KEY = "MGEAR_SHIFTER_COMPONENT_PATH"
 
 
+class ComponentRegistry(object):
+    """Registry of the Shifter components.
+
+    The default and custom component directories are scanned once and the
+    component modules are imported lazily, the first time they are
+    requested, and cached by type. The directory of a custom component is only
+    added to sys.path while the component is imported, so the component can
+    import the modules next to it.
+
+    Reload only re-imports the components with modified files.
+
+    Attributes:
+        envKey (str): Environment variable with the custom directories
+        defaultPath (str): Default component directory
+        importTimes (dict): Import time in seconds, keyed by module name
+
+    """
+
+    def __init__(self, envKey, defaultPath):
+        self.envKey = envKey
+        self.defaultPath = defaultPath
+        self.importTimes = {}
+        self._envValue = None
+        self._directories = None
+        self._basePaths = {}
+        # module name: (module, mtime)
+        self._modules = {}
+
+    def getDirectories(self):
+        """Get the component directories
+
+        The directories are scanned again only if the environment variable
+        has changed.
+
+        Returns:
+            dict: The component names, keyed by directory
+
+        """
+        envValue = os.environ.get(self.envKey, "")
+        if self._directories is None or envValue != self._envValue:
+            self._envValue = envValue
+            self._directories = mgear.maya.utils.gatherCustomModuleDirectories(
+                self.envKey, self.defaultPath)
+
+            # default components have priority over custom ones
+            self._basePaths = {}
+            for path, comps in self._directories.items():
+                for comp in comps:
+                    if path == self.defaultPath \
+                            or comp not in self._basePaths:
+                        self._basePaths[comp] = path
+
+        return self._directories
+
+    def getBasePath(self, comp_type):
+        """Get the directory of a component
+
+        Args:
+            comp_type (str): The component type
+
+        Returns:
+            str: The directory containing the component
+
+        """
+        self.getDirectories()
+        basePath = self._basePaths.get(comp_type)
+        if not basePath:
+            raise ImportError("Shifter component not found: " + comp_type)
+        return basePath
+
+    def _getMTime(self, comp_type):
+        compPath = os.path.join(self.getBasePath(comp_type), comp_type)
+        return max([os.path.getmtime(os.path.join(compPath, f))
+                    for f in os.listdir(compPath) if f.endswith(".py")]
+                   or [0])
+
+    def _load(self, comp_type, guide=False):
+        basePath = self.getBasePath(comp_type)
+        startTime = datetime.datetime.now()
+
+        if basePath == self.defaultPath:
+            moduleName = "mgear.maya.shifter.component." + comp_type
+            if guide:
+                moduleName += ".guide"
+            module = __import__(moduleName, globals(), locals(), ["*"], -1)
+            if (comp_type, guide) in self._modules:
+                module = reload(module)
+        else:
+            # import the custom component as a top level package.
+            # imp.load_module reloads it if it is already imported
+            dirPath = pm.dirmap(cd=basePath)
+            path = [dirPath]
+            moduleName = comp_type
+            if guide:
+                path = self.getModule(comp_type).__path__
+                moduleName = comp_type + ".guide"
+            addPath = dirPath not in sys.path
+            if addPath:
+                sys.path.append(dirPath)
+            try:
+                modFile, pathname, desc = imp.find_module(
+                    moduleName.split(".")[-1], path)
+                try:
+                    module = imp.load_module(
+                        moduleName, modFile, pathname, desc)
+                finally:
+                    if modFile:
+                        modFile.close()
+            finally:
+                if addPath:
+                    sys.path.remove(dirPath)
+
+        self.importTimes[moduleName] = (
+            datetime.datetime.now() - startTime).total_seconds()
+        self._modules[(comp_type, guide)] = (module,
+                                             self._getMTime(comp_type))
+
+        return module
+
+    def getModule(self, comp_type, guide=False):
+        """Get the component module, importing it if needed
+
+        Args:
+            comp_type (str): The component type
+            guide (bool, optional): If True returns the guide module
+
+        Returns:
+            module: The component module
+
+        """
+        cached = self._modules.get((comp_type, guide))
+        if cached:
+            return cached[0]
+        return self._load(comp_type, guide)
+
+    def reload(self, compTypes=None, force=False):
+        """Reload the imported components with modified files
+
+        Args:
+            compTypes (list, optional): The components to reload. If None
+                all the imported components are checked.
+            force (bool, optional): Reload even if the files are not
+                modified
+
+        Returns:
+            list: The reloaded component types
+
+        """
+        # pick up new components and directories
+        self._directories = None
+        self.getDirectories()
+
+        reloaded = []
+        for key, (module, mtime) in sorted(self._modules.items()):
+            comp_type, guide = key
+            if compTypes is not None and comp_type not in compTypes:
+                continue
+            if comp_type not in self._basePaths:
+                del self._modules[key]
+                continue
+            if force or self._getMTime(comp_type) != mtime:
+                self._load(comp_type, guide)
+                if comp_type not in reloaded:
+                    reloaded.append(comp_type)
+
+        return reloaded
+
+
+_componentRegistry = ComponentRegistry(SHIFTER_COMPONENT_ENV_KEY,
+                                       COMPONENT_PATH)
+
+# last plan of each component of the last built guide, keyed by component
+# fullname
+_planCache = {}
+
+
+def getComponentRegistry():
+    """Get the Shifter component registry"""
+    return _componentRegistry
+
+
 def getComponentDirectories():
     """Get the components directory"""
-    return mgear.maya.utils.gatherCustomModuleDirectories(
-        SHIFTER_COMPONENT_ENV_KEY,
-        os.path.join(os.path.dirname(__file__), "component"))
+    return _componentRegistry.getDirectories()
 
 
 def importComponentGuide(comp_type):
     """Import the Component guide"""
-    dirs = getComponentDirectories()
-    defFmt = "mgear.maya.shifter.component.{}.guide"
-    customFmt = "{}.guide"
-
-    module = mgear.maya.utils.importFromStandardOrCustomDirectories(
-        dirs, defFmt, customFmt, comp_type)
-    return module
+    return _componentRegistry.getModule(comp_type, guide=True)
 
 
 def importComponent(comp_type):
     """Import the Component """
-    dirs = getComponentDirectories()
-    defFmt = "mgear.maya.shifter.component.{}"
-    customFmt = "{}"
-
-    module = mgear.maya.utils.importFromStandardOrCustomDirectories(
-        dirs, defFmt, customFmt, comp_type)
-    return module
+    return _componentRegistry.getModule(comp_type)
 
 
 def reloadComponents(*args):
-    """Reload all componets
+    """Reload the componets with modified files
 
     Args:
         *args: Dummy
     """
-    compDir = getComponentDirectories()
-
-    for x in compDir:
-        for com in compDir[x]:
-            try:
-                reload(importComponent(com))
-                reload(importComponentGuide(com))
-                print "reload : {}.{}".format(os.path.basename(x), com)
-            except ImportError:
-                pass
+    for com in _componentRegistry.reload():
+        print "reload : {}.{}".format(
+            os.path.basename(_componentRegistry.getBasePath(com)), com)
 
 
 class Rig(object):
@@ -104,8 +270,30 @@ class Rig(object):
 
         self.customStepDic = {}
 
-    def buildFromSelection(self):
-        """Build the rig from selected guides."""
+        # controller tags created once per step
+        self.ctlTags = []
+        self._pendingCtlTags = []
+        self.deferControllerTags = False
+
+        # incremental build
+        self.rebuiltComponents = []
+        self._buildingComponent = None
+        self._createdNodes = {}
+        # None when the whole rig is built
+        self.changedComponents = None
+
+        # custom steps
+        self.customStepHashes = {}
+        self.previousCustomStepHashes = {}
+        self.customStepTimings = []
+
+    def buildFromSelection(self, incremental=False):
+        """Build the rig from selected guides.
+
+        Args:
+            incremental (bool, optional): Update the rig built from the
+                selected guide model, see build()
+        """
 
         startTime = datetime.datetime.now()
         mgear.log("\n" + "= SHIFTER RIG SYSTEM " + "=" * 46)
@@ -127,13 +315,22 @@ class Rig(object):
         if not self.stopBuild:
             mgear.log("\n" + "= GUIDE VALIDATION " + "=" * 46)
             # Check guide is valid
-            self.guide.setFromSelection()
+            with mgear.bufferedLog():
+                self.guide.setFromSelection()
             if not self.guide.valid:
                 return
 
+            if incremental and not ismodel:
+                mgear.log("The incremental build needs the guide model, "
+                          "building the selected components",
+                          mgear.sev_warning)
+                incremental = False
+
             # Build
             mgear.log("\n" + "= BUILDING RIG " + "=" * 46)
-            self.build()
+            # the messages are written at the end of each build phase
+            with mgear.bufferedLog():
+                self.build(incremental)
             if ismodel:
                 self.postCustomStep()
 
@@ -150,20 +347,386 @@ class Rig(object):
                 "=" * 7
             ))
 
-    def build(self):
-        """Build the rig."""
+    def build(self, incremental=False):
+        """Build the rig.
+
+        The guide fingerprints are stored in the rig for the next incremental
+        build.
+
+        Args:
+            incremental (bool, optional): Update the rig built from the same
+                guide. Only the components with a modified guide, and the
+                components depending on them, are built again. The rig is
+                built from scratch if the rig options have changed.
+        """
+        if self.guide.fromSnapshot:
+            mgear.log("A guide loaded from a snapshot can't be built. "
+                      "Draw the guide and build the drawn guide.",
+                      mgear.sev_error)
+            return
 
         self.options = self.guide.values
         self.guides = self.guide.components
 
         self.customStepDic["mgearRun"] = self
+        self.fingerprint = self.guide.getFingerprint(mgear.getVersion())
 
-        self.initialHierarchy()
-        self.processComponents()
+        if incremental:
+            try:
+                if self.incrementalBuild():
+                    return self.model
+            except Exception:
+                mgear.log(traceback.format_exc(), mgear.sev_error)
+                mgear.log("Incremental build failed, the rig {} is kept and "
+                          "the full rig is built next to it".format(
+                              getattr(self, "model", "")),
+                          mgear.sev_warning)
+                self.resetBuild(keepModel=True)
+
+        self.rebuiltComponents = list(self.guide.componentsIndex)
+        self.deferControllerTags = True
+        try:
+            self.initialHierarchy()
+            self.processComponents()
+            self.commitControllerTags()
+        finally:
+            self.deferControllerTags = False
         self.finalize()
+        self.storeBuildData()
 
         return self.model
 
+    def incrementalBuild(self):
+        """Update the rig built from the guide.
+
+        The components with a modified guide fingerprint are deleted and
+        built again, with the components depending on them: children,
+        components referencing them in their settings and the parents of the
+        components with a custom connector. The other components are reused.
+
+        Returns:
+            bool: False if the rig must be built from scratch. If the rig
+                options have changed the outdated rig is deleted.
+
+        """
+        model = self.findBuiltModel()
+        if model is None:
+            mgear.log("No rig built from this guide, building the full rig")
+            return False
+        if model.attr("guide_fingerprint").get() != self.fingerprint:
+            mgear.log("The rig options have changed, building the full rig")
+            self.deleteRig(model)
+            return False
+
+        builtRoots = self.getBuiltComponents(model)
+        dirty, removed = self.getDirtyComponents(builtRoots)
+        if len(dirty) == len(self.guide.componentsIndex):
+            mgear.log("All the components have changed, "
+                      "building the full rig")
+            self.deleteRig(model)
+            return False
+
+        mgear.log("Incremental build, components to build: {}".format(
+            ", ".join([n for n in self.guide.componentsIndex
+                       if n in dirty]) or "None"))
+        if removed:
+            mgear.log("Components to delete: " + ", ".join(sorted(removed)))
+
+        self.rebuiltComponents = [n for n in self.guide.componentsIndex
+                                  if n in dirty]
+        self.changedComponents = dirty | removed
+        if model.hasAttr("custom_step_hashes"):
+            self.previousCustomStepHashes = json.loads(
+                model.attr("custom_step_hashes").get() or "{}")
+        self.deleteComponents(builtRoots, dirty | removed)
+
+        reuse = dict((name, root) for name, root in builtRoots.items()
+                     if name not in dirty and name not in removed)
+        self.deferControllerTags = True
+        try:
+            self.loadHierarchy(model)
+            self.processComponents(reuse)
+            self.commitControllerTags()
+        finally:
+            self.deferControllerTags = False
+        self.finalize()
+        self.storeBuildData()
+
+        return True
+
+    def resetBuild(self, keepModel=False):
+        """Delete the rig being built and reset the build state
+
+        Args:
+            keepModel (bool, optional): Keep the rig being built in the
+                scene.
+        """
+        if (not keepModel and getattr(self, "model", None) is not None
+                and self.model.exists()):
+            self.deleteRig(self.model)
+        self.model = None
+        self.changedComponents = None
+
+        self.groups = {}
+        self.subGroups = {}
+        self.components = {}
+        self.componentsIndex = []
+        self.ctlTags = []
+        self._pendingCtlTags = []
+        self.rebuiltComponents = []
+        self._createdNodes = {}
+
+    def findBuiltModel(self):
+        """Get the rig built from the guide
+
+        Returns:
+            dagNode: The rig model or None if there isn't any rig with the
+                build data of the incremental build.
+
+        """
+        for model in pm.ls("|" + self.options["rig_name"]):
+            if model.hasAttr("is_rig") and model.hasAttr("guide_fingerprint"):
+                return model
+
+    def getBuiltComponents(self, model):
+        """Get the roots of the components of a built rig
+
+        Args:
+            model (dagNode): The rig model
+
+        Returns:
+            dict: The component roots, keyed by component fullname
+
+        """
+        roots = cmds.listConnections(model.name() + ".rigComponents",
+                                     source=True,
+                                     destination=False) or []
+        return dict((self.getComponentName(root), pm.PyNode(root))
+                    for root in roots)
+
+    def getComponentFingerprint(self, name):
+        """Get the fingerprint of a component guide
+
+        The fingerprint includes the control shapes stored in the guide.
+
+        Args:
+            name (str): The component fullname
+
+        Returns:
+            str: The hexadecimal hash
+
+        """
+        shapes = []
+        for bufferName, ctl_ref in sorted(self.guide.controllers.items()):
+            if not bufferName.startswith(name + "_"):
+                continue
+            for shape in ctl_ref.getShapes():
+                if shape.type() == "nurbsCurve":
+                    shapes.append((shape.name(),
+                                   cmds.getAttr(shape.name() + ".cv[*]")))
+
+        return self.guides[name].getFingerprint(shapes)
+
+    def getComponentDependencies(self, name):
+        """Get the components a component depends on
+
+        Args:
+            name (str): The component fullname
+
+        Returns:
+            set: The parent component and the components referenced in the
+                settings, i.e: ui host and reference arrays.
+
+        """
+        guide_ = self.guides[name]
+        dependencies = set()
+        if guide_.parentComponent is not None:
+            dependencies.add(guide_.parentComponent.fullName)
+        for value in guide_.values.values():
+            if isinstance(value, basestring):
+                for ref in value.split(","):
+                    dependencies.add(self.getComponentName(ref))
+        dependencies.discard(name)
+
+        return dependencies
+
+    def getDirtyComponents(self, builtRoots):
+        """Get the components to build again
+
+        Args:
+            builtRoots (dict): The roots of the built components, keyed by
+                component fullname
+
+        Returns:
+            set, set: The components to build and the built components
+                without guide.
+
+        """
+        dirty = set()
+        for name in self.guide.componentsIndex:
+            root = builtRoots.get(name)
+            if (root is None or root.attr("componentFingerprint").get()
+                    != self.getComponentFingerprint(name)):
+                dirty.add(name)
+        removed = set(builtRoots) - set(self.guide.componentsIndex)
+
+        dependencies = dict((name, self.getComponentDependencies(name))
+                            for name in self.guide.componentsIndex)
+        changed = True
+        while changed:
+            changed = False
+            for name in self.guide.componentsIndex:
+                guide_ = self.guides[name]
+                if name in dirty:
+                    # the custom connectors modify the parent component
+                    parent = guide_.parentComponent
+                    if (guide_.values["connector"] != "standard"
+                            and parent is not None
+                            and parent.fullName not in dirty):
+                        dirty.add(parent.fullName)
+                        changed = True
+                elif dependencies[name] & (dirty | removed):
+                    dirty.add(name)
+                    changed = True
+
+        return dirty, removed
+
+    def deleteComponents(self, builtRoots, names):
+        """Delete built components
+
+        Deletes the component root hierarchy, the nodes created by the
+        component outside of it and the ui host channels of the component.
+
+        Args:
+            builtRoots (dict): The roots of the built components, keyed by
+                component fullname
+            names (set): The fullnames of the components to delete
+
+        """
+        roots = []
+        uuids = []
+        for name in names:
+            root = builtRoots.get(name)
+            if root is None:
+                continue
+            data = json.loads(root.attr("componentBuildData").get())
+            uuids.extend(data["nodes"])
+            roots.append(root.longName())
+
+            host = data["uihost"]
+            if (self.options["classicChannelNames"] and host
+                    and cmds.objExists(host)):
+                for attr in cmds.listAttr(host, userDefined=True) or []:
+                    if attr.startswith(name + "_"):
+                        cmds.deleteAttr(host, attribute=attr)
+
+        # the nodes can be deleted with a previous node of the list
+        nodes = roots
+        if uuids:
+            nodes = nodes + cmds.ls(uuids, long=True)
+        for n in nodes:
+            if cmds.objExists(n):
+                cmds.delete(n)
+
+    def deleteRig(self, model):
+        """Delete a built rig, with the nodes created by the components
+        outside of the rig hierarchy.
+
+        Args:
+            model (dagNode): The rig model
+
+        """
+        builtRoots = self.getBuiltComponents(model)
+        self.deleteComponents(builtRoots, set(builtRoots))
+        pm.delete(model)
+
+    def storeBuildData(self):
+        """Store the fingerprints and the build data of the built components
+        in the rig, for the next incremental build.
+        """
+        self.model.attr("guide_fingerprint").set(self.fingerprint)
+
+        plug = self.model.name() + ".rigComponents"
+        index = max(cmds.getAttr(plug, multiIndices=True) or [-1]) + 1
+        for name in self.rebuiltComponents:
+            comp = self.components.get(name)
+            if comp is None or not comp.root.exists():
+                continue
+            data = comp.getBuildData()
+            data["nodes"] = self.getCreatedNodes(name, comp.root)
+
+            attribute.addAttribute(comp.root, "componentFingerprint",
+                                   "string",
+                                   self.getComponentFingerprint(name))
+            attribute.addAttribute(comp.root, "componentBuildData",
+                                   "string", json.dumps(data))
+            cmds.connectAttr(comp.root.name() + ".message",
+                             "{}[{}]".format(plug, index))
+            index += 1
+
+    def getCreatedNodes(self, name, root):
+        """Get the nodes created by a component outside of its root
+        hierarchy
+
+        Args:
+            name (str): The component fullname
+            root (dagNode): The component root
+
+        Returns:
+            list of str: The node UUIDs
+
+        """
+        rootPath = root.longName() + "|"
+        uuids = []
+        for handle in self._createdNodes.get(name, []):
+            if not handle.isValid():
+                continue
+            mobject = handle.object()
+            if (mobject.hasFn(OpenMaya.MFn.kDagNode) and
+                    OpenMaya.MFnDagNode(mobject).fullPathName().startswith(
+                        rootPath)):
+                continue
+            uuids.append(
+                OpenMaya.MFnDependencyNode(mobject).uuid().asString())
+
+        return uuids
+
+    def planComponents(self):
+        """Compute the plan of the components before the creation steps
+
+        The plans are reused while the component guide, the rig options and
+        the component class don't change, so a rebuild of the same guide
+        skips the planning. Only the plans of the last built guide are kept.
+        """
+        for compName in _planCache.keys():
+            if compName not in self.componentsIndex:
+                del _planCache[compName]
+
+        for compName in self.componentsIndex:
+            comp = self.components[compName]
+            if isinstance(comp, component.BuiltComponent):
+                continue
+
+            # a reloaded component module has a new class
+            key = (type(comp), self.fingerprint,
+                   self.guides[compName].getFingerprint())
+            cached = _planCache.get(compName)
+            if cached and cached[0] == key:
+                comp.plan = cached[1]
+                continue
+
+            mgear.log("Plan : " + comp.fullName + " (" + comp.type + ")")
+            plan = component.ComponentPlan()
+            comp.planObjects(plan)
+            comp.plan = plan
+            _planCache[compName] = (key, plan)
+
+    def _nodeAdded(self, mobject, *args):
+        # track the nodes created by each component
+        if self._buildingComponent is not None:
+            self._createdNodes.setdefault(self._buildingComponent, []).append(
+                OpenMaya.MObjectHandle(mobject))
+
     def stepsList(self, checker, attr):
         if self.options[checker] and self.options[attr]:
             return self.options[attr].split(",")
@@ -171,16 +734,83 @@ class Rig(object):
             return None
 
     def customStep(self, customSteps=None):
+        """Run the custom steps and log the time and the number of nodes
+        created by each step.
+
+        Args:
+            customSteps (list of str, optional): The custom step paths
+        """
         if customSteps:
-            for step in customSteps:
-                if not self.stopBuild:
-                    if step.startswith("*"):
-                        continue
-                    self.stopBuild = guide.helperSlots.runStep(
-                        step.split("|")[-1][1:], self.customStepDic)
-                else:
-                    pm.displayWarning("Build Stopped")
-                    break
+            timings = []
+            createdNodes = [0]
+
+            def nodeAdded(*args):
+                createdNodes[0] += 1
+
+            callbackId = OpenMaya.MDGMessage.addNodeAddedCallback(nodeAdded)
+            try:
+                for step in customSteps:
+                    if not self.stopBuild:
+                        if step.startswith("*"):
+                            continue
+                        stepPath = step.split("|")[-1][1:]
+                        createdNodes[0] = 0
+                        start = datetime.datetime.now()
+                        self.stopBuild = guide.helperSlots.runStep(
+                            stepPath, self.customStepDic)
+                        timing = (stepPath,
+                                  datetime.datetime.now() - start,
+                                  createdNodes[0])
+                        self.customStepTimings.append(timing)
+                        timings.append(timing)
+                    else:
+                        pm.displayWarning("Build Stopped")
+                        break
+            finally:
+                OpenMaya.MMessage.removeCallback(callbackId)
+
+            mgear.maya.utils.logTimingReport(
+                "CUSTOM STEPS",
+                [("{} ({} nodes)".format(os.path.basename(path), count),
+                  duration) for path, duration, count in timings])
+
+    def skipCustomStep(self, stepPath, sourceHash, step):
+        """Check if a custom step can be skipped by the incremental build
+
+        Only the idempotent post custom steps are skipped, when the step
+        file and the components used by the step have not changed since the
+        previous build.
+
+        Args:
+            stepPath (str): The custom step path
+            sourceHash (str): The hash of the custom step source
+            step (customShifterMainStep): The custom step
+
+        Returns:
+            bool: True if the step doesn't need to run
+
+        """
+        if not getattr(step, "idempotent", False):
+            return False
+        if self.changedComponents is None:
+            return False
+        if self.previousCustomStepHashes.get(stepPath) != sourceHash:
+            return False
+
+        components = step.getComponents(self.customStepDic)
+        if components is None:
+            return not self.changedComponents
+        return not self.changedComponents.intersection(components)
+
+    def storeCustomStepHashes(self):
+        """Store the hashes of the post custom steps in the rig, for the
+        next incremental build.
+        """
+        if not self.model.hasAttr("custom_step_hashes"):
+            attribute.addAttribute(
+                self.model, "custom_step_hashes", "string", "")
+        self.model.attr("custom_step_hashes").set(
+            json.dumps(self.customStepHashes, sort_keys=True))
 
     def preCustomStep(self, selection):
         if (selection[0].hasAttr("ismodel") and
@@ -194,7 +824,13 @@ class Rig(object):
         customSteps = self.stepsList("doPostCustomStep", "postCustomStep")
         if customSteps:
             mgear.log("\n" + "= POST CUSTOM STEPS " + "=" * 46)
+            if self.changedComponents is not None:
+                mgear.log("Incremental build: the custom steps which are "
+                          "not idempotent run again on the updated rig. "
+                          "Build the full rig if they fail.",
+                          mgear.sev_warning)
             self.customStep(customSteps)
+        self.storeCustomStepHashes()
 
     def initialHierarchy(self):
         """Build the initial hierarchy of the rig.
@@ -229,6 +865,8 @@ class Rig(object):
             str(pm.mel.eval("getApplicationVersionAsFloat")))
         self.gearVersion_att = attribute.addAttribute(
             self.model, "gear_version", "string", mgear.getVersion())
+        self.guideFingerprint_att = attribute.addAttribute(
+            self.model, "guide_fingerprint", "string", "")
         self.synoptic_att = attribute.addAttribute(
             self.model, "synoptic", "string", str(self.options["synoptic"]))
         self.comments_att = attribute.addAttribute(
@@ -257,6 +895,8 @@ class Rig(object):
         self.rigGroups = self.model.addAttr("rigGroups", at='message', m=1)
         self.rigPoses = self.model.addAttr("rigPoses", at='message', m=1)
         self.rigCtlTags = self.model.addAttr("rigCtlTags", at='message', m=1)
+        self.rigComponents = self.model.addAttr("rigComponents",
+                                                at='message', m=1)
 
         # ------------------------- -------------------------
         # Global Ctl
@@ -292,9 +932,47 @@ class Rig(object):
             self.jnt_org = primitive.addTransformFromPos(self.model, "jnt_org")
             pm.connectAttr(self.jntVis_att, self.jnt_org.attr("visibility"))
 
-    def processComponents(self):
+    def loadHierarchy(self, model):
+        """Get the initial hierarchy of a built rig.
+
+        Get the rig model, the main properties and organisation nulls
+        created by initialHierarchy, for the incremental build.
+
+        Args:
+            model (dagNode): The rig model
+
+        """
+        mgear.log("Load Initial Hierarchy")
+
+        self.model = model
+
+        self.isRig_att = self.model.attr("is_rig")
+        self.date_att = self.model.attr("date")
+        self.date_att.set(str(datetime.datetime.now()))
+        self.user_att = self.model.attr("user")
+        self.user_att.set(getpass.getuser())
+        self.guideFingerprint_att = self.model.attr("guide_fingerprint")
+        self.ctlVis_att = self.model.attr("ctl_vis")
+        if versions.current() >= 201650:
+            self.ctlVisPlayback_att = self.model.attr("ctl_vis_on_playback")
+        self.jntVis_att = self.model.attr("jnt_vis")
+
+        if self.options["worldCtl"]:
+            self.global_ctl = dag.findChild(self.model, "world_ctl")
+        else:
+            self.global_ctl = dag.findChild(self.model, "global_C0_ctl")
+        self.setupWS = dag.findChild(self.model, "setup")
+        if self.options["joint_rig"]:
+            self.jnt_org = dag.findChild(self.model, "jnt_org")
+
+    def processComponents(self, reuse=None):
         """
         Process the components of the rig, following the creation steps.
+
+        Args:
+            reuse (dict, optional): The roots of the built components to
+                reuse, keyed by component fullname. The creation steps are
+                skipped for these components.
         """
 
         # Init
@@ -302,12 +980,17 @@ class Rig(object):
 
         for comp in self.guide.componentsIndex:
             guide_ = self.guides[comp]
-            mgear.log("Init : " + guide_.fullName + " (" + guide_.type + ")")
+            if reuse and guide_.fullName in reuse:
+                comp = component.BuiltComponent(self, guide_,
+                                                reuse[guide_.fullName])
+            else:
+                mgear.log("Init : " + guide_.fullName +
+                          " (" + guide_.type + ")")
 
-            module = importComponent(guide_.type)
-            Component = getattr(module, "Component")
+                module = importComponent(guide_.type)
+                Component = getattr(module, "Component")
 
-            comp = Component(self, guide_)
+                comp = Component(self, guide_)
             if comp.fullName not in self.componentsIndex:
                 self.components[comp.fullName] = comp
                 self.componentsIndex.append(comp.fullName)
@@ -315,22 +998,39 @@ class Rig(object):
                 self.components_infos[comp.fullName] = [
                     guide_.compType, guide_.getVersion(), guide_.author]
 
+        self.planComponents()
+
         # Creation steps
-        self.steps = component.Main.steps
-        for i, name in enumerate(self.steps):
-            # for count, compName in enumerate(self.componentsIndex):
-            for compName in self.componentsIndex:
-                comp = self.components[compName]
-                mgear.log(name + " : " + comp.fullName +
-                          " (" + comp.type + ")")
-                comp.stepMethods[i]()
-
-            if self.options["step"] >= 1 and i >= self.options["step"] - 1:
-                break
+        # the nodes created by each component are tracked, to delete them in
+        # the incremental build
+        callbackId = OpenMaya.MDGMessage.addNodeAddedCallback(
+            self._nodeAdded)
+        try:
+            self.steps = component.Main.steps
+            for i, name in enumerate(self.steps):
+                # for count, compName in enumerate(self.componentsIndex):
+                for compName in self.componentsIndex:
+                    comp = self.components[compName]
+                    if not isinstance(comp, component.BuiltComponent):
+                        mgear.log(name + " : " + comp.fullName +
+                                  " (" + comp.type + ")")
+                    self._buildingComponent = compName
+                    try:
+                        comp.stepMethods[i]()
+                    finally:
+                        self._buildingComponent = None
+
+                self.commitControllerTags()
+                mgear.flushLog()
+
+                if (self.options["step"] >= 1
+                        and i >= self.options["step"] - 1):
+                    break
+        finally:
+            OpenMaya.MMessage.removeCallback(callbackId)
 
     def finalize(self):
         """Finalize the rig."""
-        groupIdx = 0
 
         # Properties --------------------------------------
         mgear.log("Finalize")
@@ -338,9 +1038,7 @@ class Rig(object):
         # clean jnt_org --------------------------------------
         if self.options["joint_rig"]:
             mgear.log("Cleaning jnt org")
-            for jOrg in dag.findChildrenPartial(self.jnt_org, "org"):
-                if not jOrg.listRelatives(c=True):
-                    pm.delete(jOrg)
+            self.cleanJointOrg()
 
         # Groups ------------------------------------------
         mgear.log("Creating groups")
@@ -352,30 +1050,42 @@ class Rig(object):
             for name, objects in component_.subGroups.items():
                 self.addToSubGroup(objects, name)
 
-        # Create master set to group all the groups
-        masterSet = pm.sets(n=self.model.name() + "_sets_grp", em=True)
-        pm.connectAttr(masterSet.message, self.model.rigGroups[groupIdx])
-        groupIdx += 1
+        # The sets of a rig updated by the incremental build already exist
+        subgroups = set()
+        for parentGroup, names in self.subGroups.items():
+            subgroups.update(names)
+        names = set(["sets"]).union(self.groups, self.subGroups, subgroups)
+        sets, created = self.getGroupSets(sorted(names))
 
         # Creating all groups
-        pm.select(cl=True)
         for name, objects in self.groups.items():
-            s = pm.sets(n=self.model.name() + "_" + name + "_grp")
-            s.union(objects)
-            pm.connectAttr(s.message, self.model.rigGroups[groupIdx])
-            groupIdx += 1
-            masterSet.add(s)
-        for parentGroup, subgroups in self.subGroups.items():
-            pg = pm.PyNode(self.model.name() + "_" + parentGroup + "_grp")
-            for sg in subgroups:
-                sub = pm.PyNode(self.model.name() + "_" + sg + "_grp")
-                if sub in masterSet.members():
-                    masterSet.remove(sub)
-                pg.add(sub)
+            members = set(str(obj) for obj in objects)
+            if members:
+                cmds.sets(list(members), addElement=sets[name])
+        for parentGroup, names in self.subGroups.items():
+            cmds.sets([sets[sg] for sg in set(names)],
+                      addElement=sets[parentGroup])
+
+        # Master set to group all the groups, except the subgroups
+        masterSet = sets["sets"]
+        if "sets" not in created:
+            members = set(cmds.sets(masterSet, query=True) or [])
+            removed = members.intersection(sets[sg] for sg in subgroups)
+            if removed:
+                cmds.sets(list(removed), remove=masterSet)
+        added = [sets[n] for n in sorted(created.difference(subgroups))
+                 if n != "sets"]
+        if added:
+            cmds.sets(added, addElement=masterSet)
 
         # Bind pose ---------------------------------------
         # controls_grp = self.groups["controllers"]
         # pprint(controls_grp, stream=None, indent=1, width=100)
+        oldPoses = pm.listConnections(self.model.rigPoses[0],
+                                      source=True,
+                                      destination=False)
+        if oldPoses:
+            pm.delete(oldPoses)
         ctl_master_grp = pm.PyNode(self.model.name() + "_controllers_grp")
         pm.select(ctl_master_grp, replace=True)
         dag_node = pm.dagPose(save=True, selection=True)
@@ -383,7 +1093,11 @@ class Rig(object):
         print dag_node
 
         # Bind skin re-apply
-        if self.options["importSkin"]:
+        if self.options["importSkin"] and self.changedComponents is not None:
+            mgear.log("The skin is not imported by the incremental build. "
+                      "Build the full rig to import it again.",
+                      mgear.sev_warning)
+        elif self.options["importSkin"]:
             try:
                 pm.displayInfo("Importing Skin")
                 skin.importSkin(self.options["skin"])
@@ -393,6 +1107,76 @@ class Rig(object):
                     "Skin doesn't exist or is not correct. " +
                     self.options["skin"] + " Skipped!")
 
+    def getGroupSet(self, name):
+        """Get the set of a group, create it if it doesn't exist
+
+        The new sets are connected to the rigGroups of the model.
+
+        Args:
+            name (str): The group name
+
+        Returns:
+            objectSet, bool: The set and True if it has been created
+
+        """
+        sets, created = self.getGroupSets([name])
+        return pm.PyNode(sets[name]), name in created
+
+    def getGroupSets(self, names):
+        """Get the sets of several groups, create the missing ones
+
+        The new sets are connected to the rigGroups of the model. Only the
+        incremental build reuses the sets, when they are already connected
+        to the rigGroups of the model.
+
+        Args:
+            names (list of str): The group names
+
+        Returns:
+            dict, set: The set names keyed by group name and the names of
+                the created groups
+
+        """
+        model = self.model.name()
+        setNames = dict((name, model + "_" + name + "_grp") for name in names)
+        existing = set()
+        if setNames and self.changedComponents is not None:
+            existing.update(cmds.listConnections(model + ".rigGroups",
+                                                 source=True,
+                                                 destination=False,
+                                                 type="objectSet") or [])
+
+        groupIdx = max(cmds.getAttr(model + ".rigGroups", multiIndices=True)
+                       or [-1]) + 1
+        created = set()
+        for name in names:
+            if setNames[name] in existing:
+                continue
+            setNames[name] = cmds.sets(name=setNames[name], empty=True)
+            cmds.connectAttr(setNames[name] + ".message",
+                             "{}.rigGroups[{}]".format(model, groupIdx))
+            groupIdx += 1
+            created.add(name)
+
+        return setNames, created
+
+    def cleanJointOrg(self):
+        """Delete the empty org transforms under the joint org
+
+        The hierarchy is queried once. A parent org emptied by the deletion
+        of its children is kept.
+        """
+        descendants = cmds.listRelatives(self.jnt_org.name(),
+                                         allDescendents=True,
+                                         fullPath=True) or []
+        parents = set(path.rsplit("|", 1)[0] for path in descendants)
+        empty = [path for path in descendants
+                 if path.rsplit("|", 1)[-1].split("_")[-1] == "org"
+                 and path not in parents
+                 and cmds.nodeType(path) == "transform"]
+        if empty:
+            cmds.delete(empty)
+
     def addCtl(self, parent, name, m, color, iconShape, **kwargs):
         """Create the control and apply the shape, if this is alrealdy stored
         in the guide controllers grp.
@@ -430,9 +1214,7 @@ class Rig(object):
             oShape.isHistoricallyInteresting.set(False)
 
         # set controller tag
-        if versions.current() >= 201650:
-            pm.controller(ctl)
-            self.add_controller_tag(ctl, None)
+        self.add_controller_tag(ctl, None)
 
         return ctl
 
@@ -479,11 +1261,43 @@ class Rig(object):
             self.subGroups[pg].extend(subGroups)
 
     def add_controller_tag(self, ctl, tagParent):
-        ctt = node.add_controller_tag(ctl, tagParent)
-        if ctt:
-            ni = attribute.get_next_available_index(self.model.rigCtlTags)
-            pm.connectAttr(ctt.message,
-                           self.model.attr("rigCtlTags[{}]".format(str(ni))))
+        """Add the controller tag of a control
+
+        During the build the tags are created at the end of each step, all
+        the tags of the step in a single pass.
+
+        Args:
+            ctl (dagNode): The control
+            tagParent (dagNode): The control with the parent tag or None
+        """
+        self._pendingCtlTags.append((ctl, tagParent))
+        if not self.deferControllerTags:
+            self.commitControllerTags()
+
+    def commitControllerTags(self):
+        """Create the pending controller tags and connect them to the rig
+
+        The tags hierarchy and prepopulate follow the "ctlTagHierarchy" and
+        "ctlTagPrepopulate" options.
+        """
+        if not self._pendingCtlTags:
+            return
+
+        tags = node.add_controller_tags(
+            self._pendingCtlTags,
+            hierarchy=self.options["ctlTagHierarchy"],
+            prepopulate=self.options["ctlTagPrepopulate"])
+        self._pendingCtlTags = []
+
+        index = max(pm.getAttr(self.model.rigCtlTags, multiIndices=True)
+                    or [-1]) + 1
+        for tag in tags:
+            if tag in self.ctlTags:
+                continue
+            pm.connectAttr(tag + ".message",
+                           self.model.attr("rigCtlTags[{}]".format(index)))
+            self.ctlTags.append(tag)
+            index += 1
 
     def getLocalName(self, guideName):
         """This function return the local name, cutting the Maya fullname
@@ -6,6 +6,8 @@ Shifter component rig class.
 #############################################
 # GLOBAL
 #############################################
+import json
+
 # pymel
 import pymel.core as pm
 from pymel.core import datatypes
@@ -98,6 +100,10 @@ class Main(object):
 
         self.transform2Lock = []
 
+        # --------------------------------------------------
+        # Plan of the objects, set by the rig before the creation steps
+        self.plan = ComponentPlan()
+
         # --------------------------------------------------
         # Step
         self.stepMethods = [eval("self.step_0%s" % i)
@@ -206,6 +212,28 @@ class Main(object):
 
         return
 
+    def planObjects(self, plan):
+        """Compute the transforms and values used to create the objects.
+
+        The plan is computed for all the components before the creation
+        steps, from the guide and the settings only. It must not create or
+        query any node, nor modify the component, because the plan is reused
+        by the next builds while the guide doesn't change. addObjects reads
+        the plan from self.plan.
+
+        The plan only moves the matrix math out of addObjects, the objects
+        are still created one by one. chain_01 and lite_chain_01 implement
+        it, the other components compute their transforms in addObjects.
+
+        Note:
+            REIMPLEMENT. This method can be reimplemented in each component.
+
+        Args:
+            plan (ComponentPlan): The plan to fill.
+
+        """
+        return
+
     def addObjects(self):
         """This method creates the objects of the component.
 
@@ -466,24 +494,8 @@ class Main(object):
         for oShape in ctl.getShapes():
             oShape.isHistoricallyInteresting.set(False)
 
-        # set controller tag
-        if versions.current() >= 201650:
-            try:
-                oldTag = pm.PyNode(ctl.name() + "_tag")
-                if not oldTag.controllerObject.connections():
-                    # NOTE:  The next line is comment out. Because this will
-                    # happend alot since maya does't clean
-                    # controller tags after deleting the control Object of the
-                    # tag. This have been log to Autodesk.
-                    # If orphane tags are found, it will be clean in silence.
-                    # pm.displayWarning("Orphane Tag: %s  will be delete and
-                    # created new for: %s"%(oldTag.name(), ctl.name()))
-                    pm.delete(oldTag)
-
-            except TypeError:
-                pass
-
-            self.add_controller_tag(ctl, tp)
+        # set controller tag, created at the end of the step
+        self.add_controller_tag(ctl, tp)
 
         return ctl
 
@@ -1234,6 +1246,52 @@ class Main(object):
 
         return
 
+    # =====================================================
+    # INCREMENTAL BUILD
+    # =====================================================
+
+    def getBuildData(self):
+        """Get the data needed to reuse the component in a later
+        incremental build, without building it again.
+
+        Returns:
+            dict: The relatives, joints and ui host names.
+
+        """
+        def nodeName(obj):
+            if isinstance(obj, pm.PyNode):
+                return obj.name()
+
+        return {
+            "relatives": {k: nodeName(v)
+                          for k, v in self.relatives.items()},
+            "controlRelatives": {k: nodeName(v)
+                                 for k, v in self.controlRelatives.items()},
+            "jointRelatives": self.jointRelatives,
+            "aliasRelatives": self.aliasRelatives,
+            "jointList": [nodeName(j) for j in self.jointList],
+            "uihost": nodeName(getattr(self, "uihost", None))}
+
+    def setBuildData(self, data):
+        """Set the relatives and joints from the data of getBuildData
+
+        Args:
+            data (dict): The build data
+
+        """
+        def findNode(name):
+            if name and pm.objExists(name):
+                return pm.PyNode(name)
+
+        self.relatives = {k: findNode(v)
+                          for k, v in data["relatives"].items()}
+        self.controlRelatives = {k: findNode(v)
+                                 for k, v in data["controlRelatives"].items()}
+        self.jointRelatives = data["jointRelatives"]
+        self.aliasRelatives = data["aliasRelatives"]
+        self.jointList = [findNode(j) for j in data["jointList"]]
+        self.uihost = findNode(data["uihost"])
+
     # =====================================================
     # MISC
     # =====================================================
@@ -1288,5 +1346,66 @@ class Main(object):
     type = property(getType)
 
 
+class BuiltComponent(Main):
+    """A component of the rig kept from the previous build
+
+    Used by the incremental build for the components without changes. The
+    relatives are restored from the component root, so the rebuilt
+    components can connect to it. The building steps do nothing.
+
+    Attributes:
+        rig (Rig): The parent Rig of this component.
+        guide (ComponentGuide): The guide for this component.
+        root (dagNode): The root of the built component
+
+    """
+
+    def __init__(self, rig, guide, root):
+        super(BuiltComponent, self).__init__(rig, guide)
+
+        self.root = root
+        self.setBuildData(json.loads(root.attr("componentBuildData").get()))
+
+        # the connection step only gets the parent component, used by the
+        # joint structure of the rebuilt children
+        self.stepMethods = [self.step_skip] * len(self.steps)
+        self.stepMethods[self.steps.index("Connect")] = self.initConnector
+
+    def step_skip(self):
+        """The component is already built"""
+        return
+
+
+class ComponentPlan(object):
+    """The transforms and values computed before creating a component
+
+    Attributes:
+        transforms (dict): The matrices of the objects, keyed by local name
+        values (dict): The other computed values, keyed by name
+
+    """
+
+    def __init__(self):
+        self.transforms = {}
+        self.values = {}
+
+    def __len__(self):
+        return len(self.transforms) + len(self.values)
+
+    def asDict(self):
+        """Get the plan as a dictionary, to inspect or serialize it
+
+        Returns:
+            dict: The transforms as lists of 16 floats and the values
+
+        """
+        transforms = dict((name, [v for row in m.get() for v in row])
+                          for name, m in self.transforms.items())
+        values = dict((name, list(v) if isinstance(v, datatypes.Vector)
+                       else v) for name, v in self.values.items())
+
+        return {"transforms": transforms, "values": values}
+
+
 # Backwards compatibility alias
 MainComponent = Main
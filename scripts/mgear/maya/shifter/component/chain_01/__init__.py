@@ -19,6 +19,55 @@ class Component(component.Main):
     # =====================================================
     # OBJECTS
     # =====================================================
+    def planObjects(self, plan):
+        """Compute the transforms of the controllers from the guide."""
+
+        normal = self.guide.blades["blade"].z * -1
+        apos = self.guide.apos
+
+        # FK controllers and chain of deformers -------------
+        tOld = None
+        for i, t in enumerate(transform.getChainTransform(apos,
+                                                          normal,
+                                                          self.negate)):
+            if self.settings["neutralpose"] or tOld is None:
+                tnpo = t
+            else:
+                tnpo = transform.setMatrixPosition(
+                    tOld,
+                    transform.getPositionFromMatrix(t))
+            if i:
+                tref = transform.setMatrixPosition(
+                    tOld,
+                    transform.getPositionFromMatrix(t))
+            else:
+                tref = t
+
+            plan.transforms["fk%s_ref" % i] = tref
+            plan.transforms["fk%s_npo" % i] = tnpo
+            plan.transforms["fk%s_ctl" % i] = t
+            plan.values["fk%s_dist" % i] = vector.getDistance(apos[i],
+                                                              apos[i + 1])
+            tOld = t
+
+        # IK controllers ------------------------------------
+        ik_normal = vector.getTransposedVector(normal,
+                                               [apos[0], apos[1]],
+                                               [apos[-2], apos[-1]])
+        t = transform.getTransformLookingAt(apos[-2],
+                                            apos[-1],
+                                            ik_normal,
+                                            "xy",
+                                            self.negate)
+        plan.transforms["ik_ctl"] = transform.setMatrixPosition(t, apos[-1])
+
+        v = apos[-1] - apos[0]
+        v = v ^ normal
+        v.normalize()
+        v *= self.size
+        v += apos[1]
+        plan.values["upv_pos"] = v
+
     def addObjects(self):
         """Add all the objects needed to create the component."""
 
@@ -31,6 +80,8 @@ class Component(component.Main):
 
         self.WIP = self.options["mode"]
 
+        count = len(self.guide.apos) - 1
+
         # FK controllers ------------------------------------
         if self.isFk:
             self.fk_npo = []
@@ -41,39 +92,27 @@ class Component(component.Main):
             self.ik_cns = primitive.addTransform(
                 self.root, self.getName("ik_cns"), t)
             parent = self.ik_cns
-            tOld = False
             fk_ctl = None
             self.previusTag = self.parentCtlTag
-            for i, t in enumerate(transform.getChainTransform(self.guide.apos,
-                                                              self.normal,
-                                                              self.negate)):
-                dist = vector.getDistance(self.guide.apos[i],
-                                          self.guide.apos[i + 1])
-                if self.settings["neutralpose"] or not tOld:
-                    tnpo = t
-                else:
-                    tnpo = transform.setMatrixPosition(
-                        tOld,
-                        transform.getPositionFromMatrix(t))
+            for i in range(count):
+                dist = self.plan.values["fk%s_dist" % i]
+                tref = self.plan.transforms["fk%s_ref" % i]
                 if i:
-                    tref = transform.setMatrixPosition(
-                        tOld,
-                        transform.getPositionFromMatrix(t))
                     fk_ref = primitive.addTransform(
                         fk_ctl,
                         self.getName("fk%s_ref" % i),
                         tref)
                     self.fk_ref.append(fk_ref)
-                else:
-                    tref = t
                 fk_off = primitive.addTransform(
                     parent, self.getName("fk%s_off" % i), tref)
                 fk_npo = primitive.addTransform(
-                    fk_off, self.getName("fk%s_npo" % i), tnpo)
+                    fk_off,
+                    self.getName("fk%s_npo" % i),
+                    self.plan.transforms["fk%s_npo" % i])
                 fk_ctl = self.addCtl(
                     fk_npo,
                     "fk%s_ctl" % i,
-                    t,
+                    self.plan.transforms["fk%s_ctl" % i],
                     self.color_fk,
                     "cube",
                     w=dist,
@@ -85,22 +124,11 @@ class Component(component.Main):
                 self.fk_off.append(fk_off)
                 self.fk_npo.append(fk_npo)
                 self.fk_ctl.append(fk_ctl)
-                tOld = t
                 self.previusTag = fk_ctl
 
         # IK controllers ------------------------------------
         if self.isIk:
-
-            normal = vector.getTransposedVector(
-                self.normal,
-                [self.guide.apos[0], self.guide.apos[1]],
-                [self.guide.apos[-2], self.guide.apos[-1]])
-            t = transform.getTransformLookingAt(self.guide.apos[-2],
-                                                self.guide.apos[-1],
-                                                normal,
-                                                "xy",
-                                                self.negate)
-            t = transform.setMatrixPosition(t, self.guide.apos[-1])
+            t = self.plan.transforms["ik_ctl"]
 
             self.ik_cns = primitive.addTransform(self.root,
                                                  self.getName("ik_cns"),
@@ -123,13 +151,9 @@ class Component(component.Main):
                                       tp=self.ikcns_ctl)
             attribute.setKeyableAttributes(self.ik_ctl, self.t_params)
 
-            v = self.guide.apos[-1] - self.guide.apos[0]
-            v = v ^ self.normal
-            v.normalize()
-            v *= self.size
-            v += self.guide.apos[1]
             self.upv_cns = primitive.addTransformFromPos(
-                self.root, self.getName("upv_cns"), v)
+                self.root, self.getName("upv_cns"),
+                self.plan.values["upv_pos"])
 
             self.upv_ctl = self.addCtl(self.upv_cns,
                                        "upv_ctl",
@@ -151,10 +175,10 @@ class Component(component.Main):
         # Chain of deformers -------------------------------
         self.loc = []
         parent = self.root
-        for i, t in enumerate(transform.getChainTransform(self.guide.apos,
-                                                          self.normal,
-                                                          self.negate)):
-            loc = primitive.addTransform(parent, self.getName("%s_loc" % i), t)
+        for i in range(count):
+            loc = primitive.addTransform(parent,
+                                         self.getName("%s_loc" % i),
+                                         self.plan.transforms["fk%s_ctl" % i])
 
             self.loc.append(loc)
             self.jnt_pos.append([loc, i, None, False])
@@ -257,6 +257,94 @@ class ComponentGuide(guide.Main):
 
         self.size = self.getSize()
 
+    def getSnapshot(self):
+        """Get the component data for a guide snapshot.
+
+        Returns:
+            dict: The json serializable type, version, parent, parameters,
+                transforms and blades of the component.
+
+        """
+        def matrixData(m):
+            return [list(row) for row in m.get()]
+
+        parent = None
+        if self.parentComponent is not None:
+            parent = [self.parentComponent.fullName, self.parentLocalName]
+
+        return {"type": self.type,
+                "version": list(self.version),
+                "parent": parent,
+                "values": self.getSnapshotValues(),
+                "transforms": dict((name, matrixData(m))
+                                   for name, m in self.tra.items()),
+                "blades": dict((name, matrixData(blade.transform))
+                               for name, blade in self.blades.items())}
+
+    def setFromSnapshot(self, data):
+        """Set the component guide from the component data of a guide
+        snapshot.
+
+        The parent component is set by the rig guide.
+
+        Args:
+            data (dict): The component data, see getSnapshot
+
+        """
+        self.root = None
+        self.model = None
+
+        missing = self.setSnapshotValues(data["values"])
+        for scriptName in missing:
+            mgear.log("Can't find parameter '%s' in %s" %
+                      (scriptName, self.fullName), mgear.sev_warning)
+            self.valid = False
+
+        transforms = data["transforms"]
+        for name in self.save_transform:
+            if "#" in name:
+                i = 0
+                while True:
+                    localName = string.replaceSharpWithPadding(name, i)
+                    if localName not in transforms:
+                        break
+                    self._setTransform(localName, transforms[localName])
+                    i += 1
+
+                if i < self.minmax[name].min:
+                    mgear.log("Minimum of object requiered for " +
+                              name + " hasn't been reached!!",
+                              mgear.sev_warning)
+                    self.valid = False
+
+            elif name not in transforms:
+                mgear.log("Object missing : %s" % (
+                    self.getName(name)), mgear.sev_warning)
+                self.valid = False
+
+            else:
+                self._setTransform(name, transforms[name])
+
+        for name in self.save_blade:
+            if name not in data["blades"]:
+                mgear.log("Object missing : %s" % (
+                    self.getName(name)), mgear.sev_warning)
+                self.valid = False
+                continue
+
+            self.blades[name] = vector.Blade(
+                datatypes.Matrix(data["blades"][name]))
+
+        self.size = self.getSize()
+
+    def _setTransform(self, name, m):
+        m = datatypes.Matrix(m)
+        pos = datatypes.Vector(m[3][0], m[3][1], m[3][2])
+        self.tra[name] = m
+        self.atra.append(m)
+        self.pos[name] = pos
+        self.apos.append(pos)
+
     # ====================================================
     # DRAW
 
@@ -717,6 +805,28 @@ class ComponentGuide(guide.Main):
         """
         return self.fullName + "_" + name
 
+    def getFingerprint(self, *extraData):
+        """Get a hash of the settings, transforms, blades, version and
+        parent of the component.
+
+        Args:
+            *extraData: Other data to include in the hash
+
+        Returns:
+            str: The hexadecimal hash.
+
+        """
+        parentName = None
+        if self.parentComponent is not None:
+            parentName = self.parentComponent.getName(self.parentLocalName)
+
+        blades = [(name, blade.transform)
+                  for name, blade in sorted(self.blades.items())]
+
+        return super(ComponentGuide, self).getFingerprint(
+            self.type, self.version, parentName, sorted(self.tra.items()),
+            blades, *extraData)
+
     def getFullName(self):
         """Return the fullname of the component.
 
@@ -17,6 +17,29 @@ class Component(component.Main):
     # =====================================================
     # OBJECTS
     # =====================================================
+    def planObjects(self, plan):
+        """Compute the transforms of the controllers from the guide."""
+
+        normal = self.guide.blades["blade"].z * -1
+        negate = self.negate and not self.settings["overrideNegate"]
+
+        tOld = None
+        for i, t in enumerate(transform.getChainTransform(self.guide.apos,
+                                                          normal,
+                                                          negate)):
+            if self.settings["neutralpose"] or tOld is None:
+                tnpo = t
+            else:
+                tnpo = transform.setMatrixPosition(
+                    tOld,
+                    transform.getPositionFromMatrix(t))
+
+            plan.transforms["fk%s_npo" % i] = tnpo
+            plan.transforms["fk%s_ctl" % i] = t
+            plan.values["fk%s_dist" % i] = vector.getDistance(
+                self.guide.apos[i], self.guide.apos[i + 1])
+            tOld = t
+
     def addObjects(self):
         """Add all the objects needed to create the component."""
 
@@ -41,30 +64,20 @@ class Component(component.Main):
         # FK controllers ------------------------------------
         self.fk_npo = []
         self.fk_ctl = []
-        t = self.guide.tra["root"]
 
         parent = self.root
-        tOld = False
-        fk_ctl = None
         self.previusTag = self.parentCtlTag
-        for i, t in enumerate(transform.getChainTransform(self.guide.apos,
-                                                          self.normal,
-                                                          self.negate)):
-            dist = vector.getDistance(self.guide.apos[i],
-                                      self.guide.apos[i + 1])
-            if self.settings["neutralpose"] or not tOld:
-                tnpo = t
-            else:
-                tnpo = transform.setMatrixPosition(
-                    tOld,
-                    transform.getPositionFromMatrix(t))
+        for i in range(len(self.guide.apos) - 1):
+            dist = self.plan.values["fk%s_dist" % i]
 
             fk_npo = primitive.addTransform(
-                parent, self.getName("fk%s_npo" % i), tnpo)
+                parent,
+                self.getName("fk%s_npo" % i),
+                self.plan.transforms["fk%s_npo" % i])
             fk_ctl = self.addCtl(
                 fk_npo,
                 "fk%s_ctl" % i,
-                t,
+                self.plan.transforms["fk%s_ctl" % i],
                 self.color_fk,
                 "cube",
                 w=dist,
@@ -76,7 +89,6 @@ class Component(component.Main):
 
             self.fk_npo.append(fk_npo)
             self.fk_ctl.append(fk_ctl)
-            tOld = t
             self.previusTag = fk_ctl
             parent = fk_ctl
 
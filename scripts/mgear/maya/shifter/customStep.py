@@ -1,11 +1,58 @@
+import os
+import sys
+import imp
+import hashlib
+
 import pymel.core as pm
 
 
+# compiled custom steps, keyed by file path
+_stepCache = {}
+
+
+def loadCustomStep(path):
+    """Load a custom step module.
+
+    The compiled code is cached by path and modification time, so the
+    step file is only read and compiled again when it changes. The module
+    is executed at each call, like imp.load_source.
+
+    Args:
+        path (str): The custom step file path
+
+    Returns:
+        module, str: The custom step module and the hash of its source
+    """
+    mtime = os.path.getmtime(path)
+    cached = _stepCache.get(path)
+    if cached is None or cached[0] != mtime:
+        with open(path, "rU") as f:
+            source = f.read()
+        cached = (mtime,
+                  compile(source, path, "exec"),
+                  hashlib.md5(source).hexdigest())
+        _stepCache[path] = cached
+
+    name = os.path.split(path)[1].split(".")[0]
+    module = imp.new_module(name)
+    module.__file__ = path
+    sys.modules[name] = module
+    exec(cached[1], module.__dict__)
+
+    return module, cached[2]
+
+
 class customShifterMainStep(object):
     '''
     Main Class for shifter custom steps
+
+    An idempotent step is skipped by the incremental build when the step
+    file and the components returned by getComponents have not changed
+    since the previous build.
     '''
 
+    idempotent = False
+
     def run(self, storedDic):
         """This function mus be re implemented for each custom step.
 
@@ -18,6 +65,18 @@ class customShifterMainStep(object):
         """
         raise Exception("'run' must be implemented")
 
+    def getComponents(self, storedDic):
+        """Get the components used by an idempotent step.
+
+        Args:
+            storedDic (dic): The stored dictionary of the build
+
+        Returns:
+            list of str or None: The fullnames of the components. None if
+                the step uses the whole rig.
+        """
+        return None
+
     def dup(self, source, name=None):
         """Duplicate the source object and rename it
 
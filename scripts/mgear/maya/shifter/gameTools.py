@@ -1,5 +1,8 @@
 import pymel.core as pm
+from maya import cmds
+from maya import mel
 import json
+import datetime
 from functools import partial
 import traceback
 import os.path
@@ -14,54 +17,85 @@ import mgear.maya.pyqt as gqt
 from mgear.vendor.Qt import QtCore, QtWidgets
 
 
+# joint plugs in the order used by the connection dictionary "attrs" lists.
+# The last item is the parentInverseMatrix output.
+JOINT_PLUGS = ["translate", "rotate", "scale", "scaleX", "scaleY", "scaleZ",
+               "shear"]
+PARENT_INVERSE_PLUG = "parentInverseMatrix[0]"
+
+
+def _runCommands(commands):
+    """Run a batch of MEL commands with a single call
+
+    The commands are undoable, and in one undo chunk when called from a
+    mutils.one_undo function.
+
+    Args:
+        commands (list of str): The MEL commands
+    """
+    if commands:
+        mel.eval(";\n".join(commands) + ";")
+
+
 @mutils.one_undo
 def disconnect(cnxDict):
+    """Disconnect the joints from the rig.
+
+    All the disconnections are done in a single batch of undoable commands.
+
+    Args:
+        cnxDict (dict): The connection dictionary, from exportConnections
+    """
+    commands = []
     for i, jnt in enumerate(cnxDict["joints"]):
         # we don't need to disconnect blended joint since the connection is
         # from other joints
         if not jnt.startswith("blend_"):
-            oJnt = pm.PyNode(jnt)
-
-            for e, plug in enumerate([oJnt.translate, oJnt.rotate, oJnt.scale,
-                                      oJnt.scale.scaleX, oJnt.scale.scaleY,
-                                      oJnt.scale.scaleZ, oJnt.shear]):
+            for e, plug in enumerate(JOINT_PLUGS):
                 if cnxDict["attrs"][i][e]:
-                    pm.disconnectAttr(cnxDict["attrs"][i][e], plug)
+                    commands.append('disconnectAttr "{}" "{}.{}"'.format(
+                        cnxDict["attrs"][i][e], jnt, plug))
             if cnxDict["attrs"][i][7]:
-                pm.disconnectAttr(
-                    oJnt.parentInverseMatrix[0], cnxDict["attrs"][i][7])
+                commands.append('disconnectAttr "{}.{}" "{}"'.format(
+                    jnt, PARENT_INVERSE_PLUG, cnxDict["attrs"][i][7]))
+    _runCommands(commands)
 
 
+@mutils.one_undo
 def connect(cnxDict, nsRig=None, nsSkin=None):
-    for i, jnt in enumerate(cnxDict["joints"]):
-        try:
-            if nsSkin:
-                oJnt = pm.PyNode(nsSkin + ":" + jnt)
-            else:
-                oJnt = pm.PyNode(jnt)
-            for e, plug in enumerate([oJnt.translate, oJnt.rotate, oJnt.scale,
-                                      oJnt.scale.scaleX, oJnt.scale.scaleY,
-                                      oJnt.scale.scaleZ, oJnt.shear]):
-                if cnxDict["attrs"][i][e]:
-                    if nsRig:
-                        pm.connectAttr(
-                            nsRig + ":" + cnxDict["attrs"][i][e], plug, f=True)
-                    else:
-                        pm.connectAttr(cnxDict["attrs"][i][e], plug, f=True)
+    """Connect the joints to the rig.
 
-            if cnxDict["attrs"][i][7]:
-                if nsRig:
-                    pm.connectAttr(
-                        oJnt.parentInverseMatrix[0], nsRig + ":" +
-                        cnxDict["attrs"][i][7], f=True)
-                else:
-                    pm.connectAttr(
-                        oJnt.parentInverseMatrix[0],
-                        cnxDict["attrs"][i][7],
-                        f=True)
-
-        except Exception:
+    All the connections are done in a single batch of undoable commands.
+
+    Args:
+        cnxDict (dict): The connection dictionary, from exportConnections
+        nsRig (str, optional): Namespace of the rig
+        nsSkin (str, optional): Namespace of the joints
+    """
+    rigPrefix = nsRig + ":" if nsRig else ""
+    skinPrefix = nsSkin + ":" if nsSkin else ""
+
+    commands = []
+    for i, jnt in enumerate(cnxDict["joints"]):
+        cnx = []
+        for e, plug in enumerate(JOINT_PLUGS):
+            if cnxDict["attrs"][i][e]:
+                cnx.append((rigPrefix + cnxDict["attrs"][i][e],
+                            skinPrefix + jnt + "." + plug))
+
+        if cnxDict["attrs"][i][7]:
+            cnx.append((skinPrefix + jnt + "." + PARENT_INVERSE_PLUG,
+                        rigPrefix + cnxDict["attrs"][i][7]))
+
+        # check all the plugs of the joint before connecting so a missing
+        # node doesn't leave the joint half connected
+        if not all(cmds.objExists(p) for c in cnx for p in c):
             pm.displayError("{} is not found in the scene".format(jnt))
+            continue
+
+        for src, dst in cnx:
+            commands.append('connectAttr -force "{}" "{}"'.format(src, dst))
+    _runCommands(commands)
 
 
 def connectCns(cnxDict, nsRig=None, nsSkin=None):
@@ -90,36 +124,37 @@ def exportConnections(source=None, filePath=None, disc=False):
     connections["attrs"] = []
     if not source:
         source = pm.selected()
-    for x in source:
-        if not x.name().startswith("blend_"):
-            connections["joints"].append(x.name())
-            trans_attr = pm.listConnections(
-                x.translate, p=True, type="decomposeMatrix")
-            rot_attr = pm.listConnections(
-                x.rotate, p=True, type="decomposeMatrix")
-            scl_attr = pm.listConnections(
-                x.scale, p=True, type="decomposeMatrix")
-            sclX_attr = pm.listConnections(
-                x.scale.scaleX, p=True, type="decomposeMatrix")
-            sclY_attr = pm.listConnections(
-                x.scale.scaleY, p=True, type="decomposeMatrix")
-            sclZ_attr = pm.listConnections(
-                x.scale.scaleZ, p=True, type="decomposeMatrix")
-            shear_attr = pm.listConnections(
-                x.shear, p=True, type="decomposeMatrix")
-            parentInv_attr = pm.listConnections(
-                x.parentInverseMatrix[0], d=True, p=True)
-
-            attrs_list = [trans_attr, rot_attr, scl_attr, sclX_attr,
-                          sclY_attr, sclZ_attr, shear_attr, parentInv_attr]
-            attrs_list_checked = []
-            for at in attrs_list:
-                if at:
-                    attrs_list_checked.append(at[0].name())
-                else:
-                    attrs_list_checked.append(None)
-
-            connections["attrs"].append(attrs_list_checked)
+
+    joints = [x.name() for x in source if not x.name().startswith("blend_")]
+    if joints:
+        # gather all the connections with only 2 graph queries.
+        # The node names returned by the plugs are the same unique names
+        # returned by name()
+        plugCnx = {}
+        inCnx = cmds.listConnections(joints,
+                                     connections=True,
+                                     plugs=True,
+                                     source=True,
+                                     destination=False,
+                                     type="decomposeMatrix") or []
+        outCnx = cmds.listConnections(
+            [j + "." + PARENT_INVERSE_PLUG for j in joints],
+            connections=True,
+            plugs=True,
+            source=False,
+            destination=True) or []
+        for jntPlug, plug in zip(inCnx[::2] + outCnx[::2],
+                                 inCnx[1::2] + outCnx[1::2]):
+            # keep the first connection, like listConnections()[0]
+            plugCnx.setdefault(jntPlug, plug)
+
+    for jnt in joints:
+        connections["joints"].append(jnt)
+        attrs_list_checked = [
+            plugCnx.get(jnt + "." + at)
+            for at in JOINT_PLUGS + [PARENT_INVERSE_PLUG]]
+
+        connections["attrs"].append(attrs_list_checked)
 
     data_string = json.dumps(connections, indent=4, sort_keys=True)
     if not filePath:
@@ -180,6 +215,14 @@ def runScript(path=None):
 
 @mutils.one_undo
 def exportAssetAssembly(name, rigTopNode, meshTopNode, path, postScript=None):
+    timings = []
+    stepTime = datetime.datetime.now()
+
+    def endStep(step):
+        stepEnd = datetime.datetime.now()
+        timings.append((step, stepEnd - stepTime))
+        return stepEnd
+
     if pm.ls(rigTopNode):
         rigTopNode = pm.PyNode(rigTopNode)
     else:
@@ -195,6 +238,8 @@ def exportAssetAssembly(name, rigTopNode, meshTopNode, path, postScript=None):
             "{} doesn't exist or duplicated. Please check "
             "your scene".format(meshTopNode))
         return
+    stepTime = endStep("Check top nodes")
+
     # check the folder and script
     # if the target name exist abort and request another name
 
@@ -202,6 +247,7 @@ def exportAssetAssembly(name, rigTopNode, meshTopNode, path, postScript=None):
     if not deformer_jnts:
         pm.displayError(
             "{} is empty. The tool can't find any joint".format(meshTopNode))
+    stepTime = endStep("Gather deformer joints")
 
     # export connections and cut joint connections
 
@@ -220,13 +266,18 @@ def exportAssetAssembly(name, rigTopNode, meshTopNode, path, postScript=None):
                                  message + "\n\n" + traceback.format_exc(),
                                  "Continue", "Cancel")
             if not cont:
+                endStep("Post script")
+                mutils.logTimingReport("EXPORT ASSET ASSEMBLY", timings)
                 pm.undo()
                 return
+    stepTime = endStep("Post script")
 
     # export rig model
 
     # export mesh and joints
 
+    mutils.logTimingReport("EXPORT ASSET ASSEMBLY", timings)
+
 
 def _importAssetAssembly(paht=None, reference=False):
     return
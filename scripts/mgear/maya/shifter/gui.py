@@ -81,6 +81,8 @@ class Guide_UI(object):
 
         # List of components
         # doGrouping = 1 < len(shifter.COMPONENTS_DIRECTORIES.keys())
+        # pick up new and modified components
+        shifter.getComponentRegistry().reload()
         compDir = shifter.getComponentDirectories()
         trackLoadComponent = []
         for path, comps in compDir.iteritems():
@@ -104,7 +106,6 @@ class Guide_UI(object):
 
                 module = shifter.importComponentGuide(comp_name)
 
-                reload(module)
                 image = os.path.join(path, comp_name, "icon.jpg")
 
                 buttonSize = 25
@@ -152,6 +153,16 @@ class Guide_UI(object):
     # @utils.one_undo
     @classmethod
     def buildFromSelection(self, *args):
+        self._build(False)
+
+    @classmethod
+    def updateFromSelection(self, *args):
+        """Update the rig built from the selected guide, rebuilding only
+        the modified components"""
+        self._build(True)
+
+    @classmethod
+    def _build(self, incremental):
 
         logWin = pm.window(title="Shifter Build Log", iconName='Shifter Log')
         pm.columnLayout(adjustableColumn=True)
@@ -163,7 +174,7 @@ class Guide_UI(object):
         pm.showWindow(logWin)
         mgear.logInfos()
         rg = shifter.Rig()
-        rg.buildFromSelection()
+        rg.buildFromSelection(incremental)
 
     @classmethod
     def duplicate(self, sym, *args):
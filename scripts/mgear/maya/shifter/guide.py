@@ -1,25 +1,30 @@
 # Built-in
 import os
 import sys
-import imp
 import json
 import shutil
+import hashlib
 import getpass
 import datetime
 import traceback
 import subprocess
 from functools import partial
 
+# Maya
+from maya import cmds
+import maya.OpenMaya as OpenMaya
+
 # pymel
 import pymel.core as pm
 from pymel.core import datatypes
 
 # mgear
 import mgear
-from .. import attribute, dag, vector, pyqt, skin
+from .. import attribute, curve, dag, fcurve, vector, pyqt, skin
 from ... import string
 from ...vendor.Qt import QtCore, QtWidgets, QtGui
 
+from . import customStep as cstp
 from . import guideUI as guui
 from . import customStepUI as csui
 
@@ -34,6 +39,9 @@ TYPE = "mgear_guide_root"
 
 MGEAR_SHIFTER_CUSTOMSTEP_KEY = "MGEAR_SHIFTER_CUSTOMSTEP_PATH"
 
+# version of the guide snapshot format
+SNAPSHOT_VERSION = 1
+
 
 class Main(object):
     """The main guide class
@@ -101,26 +109,111 @@ class Main(object):
     def setParamDefValuesFromProperty(self, node):
         """Set the parameter definition values from the attributes of an object
 
+        All the parameters are read in a single pass: the attribute names
+        and the incoming connections are queried once for the node and the
+        values are read from the plugs.
+
         Arguments:
             node (dagNode): The object with the attributes.
         """
+        nodeName = str(node)
+
+        attrs = set(cmds.listAttr(nodeName, userDefined=True) or [])
+        missing = set(self.paramDefs) - attrs
+        for scriptName in sorted(missing):
+            mgear.log("Can't find parameter '%s' in %s" %
+                      (scriptName, node), mgear.sev_warning)
+            self.valid = False
+
+        # the first source of each connected parameter
+        sources = {}
+        cnx = cmds.listConnections(nodeName,
+                                   connections=True,
+                                   destination=False,
+                                   source=True) or []
+        for plug, source in zip(cnx[::2], cnx[1::2]):
+            sources.setdefault(plug.split(".", 1)[1], source)
+
+        sel = OpenMaya.MSelectionList()
+        sel.add(nodeName)
+        mobject = OpenMaya.MObject()
+        sel.getDependNode(0, mobject)
+        fnNode = OpenMaya.MFnDependencyNode(mobject)
 
         for scriptName, paramDef in self.paramDefs.items():
-            if not pm.attributeQuery(scriptName, node=node, exists=True):
-                mgear.log("Can't find parameter '%s' in %s" %
-                          (scriptName, node), mgear.sev_warning)
-                self.valid = False
+            if scriptName in missing:
+                continue
+            if scriptName in sources:
+                paramDef.value = None
+                self.values[scriptName] = pm.PyNode(sources[scriptName])
             else:
-                cnx = pm.listConnections(
-                    node + "." + scriptName,
-                    destination=False, source=True)
-                if cnx:
-                    paramDef.value = None
-                    self.values[scriptName] = cnx[0]
+                value = _getPlugValue(fnNode.findPlug(scriptName, False))
+                paramDef.value = value
+                self.values[scriptName] = value
+
+    def getSnapshotValues(self):
+        """Get the parameter values for a guide snapshot
+
+        Returns:
+            dict: The json serializable values, keyed by parameter
+                scriptname. The values of the fcurve parameters are the keys
+                of the curve.
+
+        """
+        values = {}
+        for scriptName in self.paramNames:
+            paramDef = self.paramDefs[scriptName]
+            value = self.values.get(scriptName)
+            if isinstance(paramDef, attribute.FCurveParamDef):
+                if value:
+                    fcv = fcurve.FCurve(value)
+                    value = [list(k) for k in zip(fcv.inputs, fcv.values)]
                 else:
-                    paramDef.value = pm.getAttr(node + "." + scriptName)
-                    self.values[scriptName] = pm.getAttr(
-                        node + "." + scriptName)
+                    value = paramDef.keys
+            elif isinstance(value, pm.PyNode):
+                value = value.name()
+            elif isinstance(value, tuple):
+                value = list(value)
+            values[scriptName] = value
+
+        return values
+
+    def setSnapshotValues(self, values):
+        """Set the parameter values from a guide snapshot
+
+        Arguments:
+            values (dict): The values, keyed by parameter scriptname.
+
+        Returns:
+            list: The names of the parameters missing in the snapshot.
+
+        """
+        for scriptName, value in values.items():
+            paramDef = self.paramDefs.get(scriptName)
+            if paramDef is None:
+                continue
+            if isinstance(paramDef, attribute.FCurveParamDef):
+                paramDef.keys = value
+                self.values[scriptName] = None
+            else:
+                self.setParamDefValue(scriptName, value)
+
+        return sorted(set(self.paramDefs) - set(values))
+
+    def getFingerprint(self, *extraData):
+        """Get a hash of the parameter values
+
+        Used to find the guides modified since the last build.
+
+        Arguments:
+            *extraData: Other data to include in the hash
+
+        Returns:
+            str: The hexadecimal hash.
+
+        """
+        data = [sorted(self.values.items())] + list(extraData)
+        return hashlib.md5(repr(_fingerprintData(data))).hexdigest()
 
     def addColorParam(self, scriptName, value=False):
         """Add color paramenter to the paramenter definition Dictionary.
@@ -210,6 +303,50 @@ class Main(object):
 
         return paramDef
 
+
+def _getPlugValue(plug):
+    # the value as returned by getAttr, without the command overhead
+    if plug.isCompound():
+        return tuple([_getPlugValue(plug.child(i))
+                      for i in range(plug.numChildren())])
+
+    attr = plug.attribute()
+    if attr.hasFn(OpenMaya.MFn.kTypedAttribute):
+        attrType = OpenMaya.MFnTypedAttribute(attr).attrType()
+        if attrType == OpenMaya.MFnData.kString:
+            return plug.asString()
+    elif attr.hasFn(OpenMaya.MFn.kEnumAttribute):
+        return plug.asInt()
+    elif attr.hasFn(OpenMaya.MFn.kNumericAttribute):
+        numType = OpenMaya.MFnNumericAttribute(attr).unitType()
+        if numType == OpenMaya.MFnNumericData.kBoolean:
+            return plug.asBool()
+        if numType in (OpenMaya.MFnNumericData.kShort,
+                       OpenMaya.MFnNumericData.kInt,
+                       OpenMaya.MFnNumericData.kByte,
+                       OpenMaya.MFnNumericData.kChar):
+            return plug.asInt()
+        return plug.asDouble()
+
+    # unit and other data attributes
+    return cmds.getAttr(plug.name())
+
+
+def _fingerprintData(data):
+    # rounded values so float noise doesn't modify the fingerprint
+    if isinstance(data, float):
+        return round(data, 4)
+    if isinstance(data, (datatypes.Matrix, datatypes.Vector)):
+        return _fingerprintData(list(data.get()))
+    if isinstance(data, (list, tuple)):
+        return [_fingerprintData(d) for d in data]
+    if isinstance(data, dict):
+        return _fingerprintData(sorted(data.items()))
+    if isinstance(data, (bool, int, long, basestring)) or data is None:
+        return data
+    return str(data)
+
+
 ##########################################################
 # RIG GUIDE
 ##########################################################
@@ -250,6 +387,10 @@ class Rig(Main):
         self.valid = True
 
         self.controllers = {}
+        # controllers shapes of a guide loaded from a snapshot
+        self.controllersData = None
+        # the guide is loaded from a snapshot and not read from the scene
+        self.fromSnapshot = False
         self.components = {}  # Keys are the component fullname (ie. 'arm_L0')
         self.componentsIndex = []
         self.parents = []
@@ -278,6 +419,9 @@ class Rig(Main):
             True)
         self.pProxyChannels = self.addParam("proxyChannels", "bool", False)
         self.pWorldCtl = self.addParam("worldCtl", "bool", False)
+        self.pCtlTagHierarchy = self.addParam("ctlTagHierarchy", "bool", True)
+        self.pCtlTagPrepopulate = self.addParam("ctlTagPrepopulate",
+                                                "bool", False)
 
         # --------------------------------------------------
         # skin
@@ -352,6 +496,7 @@ class Rig(Main):
         startTime = datetime.datetime.now()
         # Start
         mgear.log("Checking guide")
+        self.fromSnapshot = False
 
         # Get the model and the root
         self.model = root.getParent(generations=-1)
@@ -500,6 +645,127 @@ class Rig(Main):
 
         return ComponentGuide()
 
+    # =====================================================
+    # SNAPSHOT
+
+    def getControllersData(self):
+        """Get the controllers shapes data
+
+        Returns:
+            dict: The curves data, see curve.collect_curve_data
+
+        """
+        if self.controllersData is not None:
+            return self.controllersData
+        if not self.controllers:
+            return {"curves_names": []}
+        return curve.collect_curve_data(
+            [self.controllers[name] for name in sorted(self.controllers)])
+
+    def getSnapshot(self):
+        """Get the guide snapshot.
+
+        The snapshot is a json serializable description of the guide: the
+        rig options, the controllers shapes and for each component the type,
+        parameters, transforms, blades and parent.
+
+        Returns:
+            dict: The snapshot
+
+        """
+        components = dict((name, self.components[name].getSnapshot())
+                          for name in self.componentsIndex)
+        return {"snapshotVersion": SNAPSHOT_VERSION,
+                "gearVersion": mgear.getVersion(),
+                "options": self.getSnapshotValues(),
+                "controllers": self.getControllersData(),
+                "componentsIndex": list(self.componentsIndex),
+                "components": components}
+
+    def setFromSnapshot(self, data):
+        """Set the guide from a guide snapshot, without reading the scene.
+
+        The guide can be validated and drawn in the scene, but it can't be
+        built: the controllers shapes and the fcurve parameters are only
+        read from the scene. Draw the guide and build the drawn guide.
+
+        Arguments:
+            data (dict): The snapshot, see getSnapshot
+
+        """
+        startTime = datetime.datetime.now()
+        mgear.log("Checking guide snapshot")
+
+        self.model = None
+        self.fromSnapshot = True
+        if data.get("snapshotVersion", 0) > SNAPSHOT_VERSION:
+            mgear.log("The guide snapshot is from a newer version of mGear",
+                      mgear.sev_warning)
+
+        for scriptName in self.setSnapshotValues(data["options"]):
+            mgear.log("Can't find parameter '%s' in the guide options" %
+                      scriptName, mgear.sev_warning)
+            self.valid = False
+
+        self.controllers = {}
+        self.controllersData = data["controllers"]
+
+        for name in data["componentsIndex"]:
+            compData = data["components"][name]
+            comp_guide = self.getComponentGuide(compData["type"])
+            comp_guide.setFromSnapshot(compData)
+            mgear.log(comp_guide.fullName + " (" + compData["type"] + ")")
+            if not comp_guide.valid:
+                self.valid = False
+
+            self.componentsIndex.append(comp_guide.fullName)
+            self.components[comp_guide.fullName] = comp_guide
+
+        # Parenting
+        for name in self.componentsIndex:
+            parent = data["components"][name]["parent"]
+            if not parent:
+                continue
+            pName, pLocal = parent
+            if pName not in self.components:
+                mgear.log("Can't find parent component %s for %s" %
+                          (pName, name), mgear.sev_warning)
+                self.valid = False
+                continue
+            self.components[name].parentComponent = self.components[pName]
+            self.components[name].parentLocalName = pLocal
+
+        if self.valid:
+            self.addOptionsValues()
+        else:
+            mgear.log("The guide snapshot doesn't seem to be up to date."
+                      "Check logged messages and update the guide.",
+                      mgear.sev_warning)
+
+        finalTime = datetime.datetime.now() - startTime
+        mgear.log("Guide loaded from snapshot in  [ " + str(finalTime) +
+                  " ]")
+
+    def saveSnapshot(self, filePath):
+        """Save the guide snapshot in a json file
+
+        Arguments:
+            filePath (str): The file path
+
+        """
+        with open(filePath, "w") as f:
+            json.dump(self.getSnapshot(), f, sort_keys=True)
+
+    def loadSnapshot(self, filePath):
+        """Set the guide from a guide snapshot json file
+
+        Arguments:
+            filePath (str): The file path
+
+        """
+        with open(filePath) as f:
+            self.setFromSnapshot(json.load(f))
+
     # =====================================================
     # DRAW
 
@@ -589,6 +855,43 @@ class Rig(Main):
 
             comp_guide.draw(parent)
 
+    def draw(self):
+        """Draw the guide in the scene.
+
+        Creates a new guide model with the rig options, the controllers
+        shapes and the components. i.e: To write a guide snapshot back to
+        the scene.
+
+        """
+        controllersData = self.getControllersData()
+
+        self.initialHierarchy()
+
+        # controls shape
+        buffers = curve.create_curve_from_data(controllersData)
+        for name, buffer in zip(controllersData["curves_names"], buffers):
+            pm.parent(buffer, self.controllers_org)
+            pm.rename(buffer, name.split("|")[-1])
+
+        # Components
+        for name in self.componentsIndex:
+            comp_guide = self.components[name]
+
+            parent = None
+            if comp_guide.parentComponent is not None:
+                parent = dag.findChild(
+                    self.model,
+                    comp_guide.parentComponent.getName(
+                        comp_guide.parentLocalName))
+            if not parent:
+                parent = self.model
+
+            # Reset the root so we force the draw
+            comp_guide.root = None
+            comp_guide.draw(parent)
+
+        pm.select(self.model)
+
     def update(self, sel, force=False):
         """Update the guide if a parameter is missing"""
 
@@ -865,25 +1168,33 @@ class HelperSlots(object):
             with pm.UndoChunk():
                 pm.displayInfo(
                     "EXEC: Executing custom step: %s" % stepPath)
-                fileName = os.path.split(stepPath)[1].split(".")[0]
                 if os.environ.get(MGEAR_SHIFTER_CUSTOMSTEP_KEY, ""):
                     runPath = os.path.join(
                         os.environ.get(
                             MGEAR_SHIFTER_CUSTOMSTEP_KEY, ""), stepPath)
                 else:
                     runPath = stepPath
-                customStep = imp.load_source(fileName, runPath)
+                customStep, sourceHash = cstp.loadCustomStep(runPath)
+                rig = customStepDic.get("mgearRun")
                 if hasattr(customStep, "CustomShifterStep"):
                     cs = customStep.CustomShifterStep()
-                    cs.run(customStepDic)
+                    if rig is not None and rig.skipCustomStep(
+                            stepPath, sourceHash, cs):
+                        pm.displayInfo(
+                            "SKIPPED: Custom Shifter Step Class: %s. "
+                            "Unchanged" % stepPath)
+                    else:
+                        cs.run(customStepDic)
+                        pm.displayInfo(
+                            "SUCCEED: Custom Shifter Step Class: %s. "
+                            "Succeed!!" % stepPath)
                     customStepDic[cs.name] = cs
-                    pm.displayInfo(
-                        "SUCCEED: Custom Shifter Step Class: %s. "
-                        "Succeed!!" % stepPath)
                 else:
                     pm.displayInfo(
                         "SUCCEED: Custom Step simple script: %s. "
                         "Succeed!!" % stepPath)
+                if rig is not None:
+                    rig.customStepHashes[stepPath] = sourceHash
 
         except Exception as ex:
             template = "An exception of type {0} occured. "
@@ -1002,6 +1313,11 @@ class GuideSettings(MayaQWidgetDockableMixin, QtWidgets.QDialog, HelperSlots):
             self.guideSettingsTab.proxyChannels_checkBox, "proxyChannels")
 
         self.populateCheck(self.guideSettingsTab.worldCtl_checkBox, "worldCtl")
+        self.populateCheck(
+            self.guideSettingsTab.ctlTagHierarchy_checkBox, "ctlTagHierarchy")
+        self.populateCheck(
+            self.guideSettingsTab.ctlTagPrepopulate_checkBox,
+            "ctlTagPrepopulate")
 
         self.populateCheck(
             self.guideSettingsTab.classicChannelNames_checkBox,
@@ -1080,6 +1396,14 @@ class GuideSettings(MayaQWidgetDockableMixin, QtWidgets.QDialog, HelperSlots):
             partial(self.updateCheck,
                     tap.worldCtl_checkBox,
                     "worldCtl"))
+        tap.ctlTagHierarchy_checkBox.stateChanged.connect(
+            partial(self.updateCheck,
+                    tap.ctlTagHierarchy_checkBox,
+                    "ctlTagHierarchy"))
+        tap.ctlTagPrepopulate_checkBox.stateChanged.connect(
+            partial(self.updateCheck,
+                    tap.ctlTagPrepopulate_checkBox,
+                    "ctlTagPrepopulate"))
         tap.classicChannelNames_checkBox.stateChanged.connect(
             partial(self.updateCheck,
                     tap.classicChannelNames_checkBox,
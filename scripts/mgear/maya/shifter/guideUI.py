@@ -268,6 +268,12 @@ class Ui_Form(object):
         self.worldCtl_checkBox = QtWidgets.QCheckBox(self.groupBox_7)
         self.worldCtl_checkBox.setObjectName("worldCtl_checkBox")
         self.gridLayout_9.addWidget(self.worldCtl_checkBox, 0, 0, 1, 1)
+        self.ctlTagHierarchy_checkBox = QtWidgets.QCheckBox(self.groupBox_7)
+        self.ctlTagHierarchy_checkBox.setObjectName("ctlTagHierarchy_checkBox")
+        self.gridLayout_9.addWidget(self.ctlTagHierarchy_checkBox, 1, 0, 1, 1)
+        self.ctlTagPrepopulate_checkBox = QtWidgets.QCheckBox(self.groupBox_7)
+        self.ctlTagPrepopulate_checkBox.setObjectName("ctlTagPrepopulate_checkBox")
+        self.gridLayout_9.addWidget(self.ctlTagPrepopulate_checkBox, 2, 0, 1, 1)
         self.gridLayout_2.addWidget(self.groupBox_7, 2, 0, 1, 1)
 
         self.retranslateUi(Form)
@@ -316,4 +322,8 @@ class Ui_Form(object):
         self.groupBox_7.setTitle(gqt.fakeTranslate("Form", "Base Rig Control", None, -1))
         self.worldCtl_checkBox.setToolTip(gqt.fakeTranslate("Form", "<html><head/><body><p>Shifter creates by default a Base control called &quot;<span style=\" font-weight:600;\">global_C0_ctl</span>&quot;. </p><p>Since this control is not accesible from any guide locator. Is not possible to add it as a space reference.</p><p>If this option is active, The base control will be named &quot;<span style=\" font-weight:600;\">world_ctl</span>&quot; and we can add &quot;<span style=\" font-weight:600;\">global_C0_ctl</span>&quot; as a regular &quot;Control_01&quot; component. </p><p>This way we can use it as space reference.</p><p>The biped guide template is configured with this structure.</p></body></html>", None, -1))
         self.worldCtl_checkBox.setText(gqt.fakeTranslate("Form", "Use World Ctl", None, -1))
+        self.ctlTagHierarchy_checkBox.setToolTip(gqt.fakeTranslate("Form", "<html><head/><body><p>Parent the controller tags following the components hierarchy. The pick walk and the parallel evaluation use this hierarchy.</p></body></html>", None, -1))
+        self.ctlTagHierarchy_checkBox.setText(gqt.fakeTranslate("Form", "Controller Tags Hierarchy", None, -1))
+        self.ctlTagPrepopulate_checkBox.setToolTip(gqt.fakeTranslate("Form", "<html><head/><body><p>Set the prepopulate of the controller tags, so the parallel evaluation graph includes the controllers before they are manipulated.</p></body></html>", None, -1))
+        self.ctlTagPrepopulate_checkBox.setText(gqt.fakeTranslate("Form", "Prepopulate Controller Tags", None, -1))
 
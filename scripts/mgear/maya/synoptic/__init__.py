@@ -7,8 +7,9 @@ from maya.app.general.mayaMixin import MayaQWidgetDockableMixin
 
 import mgear
 from mgear.maya import pyqt
-from mgear.vendor.Qt import QtGui, QtCore, QtWidgets
+from mgear.vendor.Qt import QtGui, QtCore, QtWidgets, QtCompat
 import mgear.maya.utils
+from . import rigRegistry
 
 
 SYNOPTIC_WIDGET_NAME = "synoptic_view"
@@ -61,6 +62,8 @@ class Synoptic(MayaQWidgetDockableMixin, QtWidgets.QDialog):
         # Delete old instances of the componet settings window.
         pyqt.deleteInstances(self, MayaQDockWidget)
         super(Synoptic, self).__init__(parent)
+        # tab widgets kept when switching models, keyed by tab name
+        self._tabPool = {}
         self.create_widgets()
         self.setAttribute(QtCore.Qt.WA_DeleteOnClose)
 
@@ -179,12 +182,11 @@ class Synoptic(MayaQWidgetDockableMixin, QtWidgets.QDialog):
         except RuntimeError:
             pass
 
-        rig_models = [item for item in pm.ls(transforms=True)
-                      if item.hasAttr("is_rig")]
+        rig_models = rigRegistry.getRigRegistry().getRigs()
 
         self.model_list.clear()
         for item in rig_models:
-            self.model_list.addItem(item.name(), item.name())
+            self.model_list.addItem(item.name, item.name)
 
         # restore event and update tabs for reflecting self.model_list
         self.model_list.currentIndexChanged.connect(self.updateTabs)
@@ -192,18 +194,13 @@ class Synoptic(MayaQWidgetDockableMixin, QtWidgets.QDialog):
 
     def updateTabs(self):
 
+        # the tabs are kept in the pool and bound to the new model
         for i in range(self.tabs.count()):
-            self.tabs.widget(i).close()
+            synoptic_tab = self.tabs.widget(i).synoptic_tab
+            if QtCompat.isValid(synoptic_tab):
+                synoptic_tab.unbindModel()
         self.tabs.clear()
 
-        # safety clean of  synoticTab script jobs
-        # this is neded when we switch models witout close synopticwindow.
-        oldJobs = pm.scriptJob(listJobs=True)
-        for oldjob in oldJobs:
-            if "SynopticTab" in str(oldjob):
-                id = oldjob.split(" ")[0][:-1]
-                pm.scriptJob(kill=int(id), force=True)
-
         currentModelName = self.model_list.currentText()
         currentModels = pm.ls(currentModelName)
         if not currentModels:
@@ -213,27 +210,20 @@ class Synoptic(MayaQWidgetDockableMixin, QtWidgets.QDialog):
 
         max_h = 0
         max_w = 0
+        used = []
         for i, tab_name in enumerate(tab_names):
             try:
                 if tab_name:
-                    # instantiate SynopticTab widget
-                    module = importTab(tab_name)
-                    synoptic_tab = getattr(module, "SynopticTab")()
-
-                    # set minimum size for auto fit (stretch) scroll area
-                    if synoptic_tab.minimumHeight() == 0:
-                        synoptic_tab.setMinimumHeight(synoptic_tab.height())
-                    if synoptic_tab.minimumWidth() == 0:
-                        synoptic_tab.setMinimumWidth(synoptic_tab.width())
+                    tab = self.getTab(tab_name, used)
+                    used.append(tab)
 
                     # store tab size for set container size later
-                    h = synoptic_tab.minimumHeight()
-                    w = synoptic_tab.minimumWidth()
+                    h = tab.synoptic_tab.minimumHeight()
+                    w = tab.synoptic_tab.minimumWidth()
 
                     max_h = h if max_h < h else max_h
                     max_w = w if max_w < w else max_w
 
-                    tab = self.wrapTabContents(synoptic_tab)
                     self.tabs.insertTab(i, tab, tab_name)
 
                 else:
@@ -256,6 +246,39 @@ class Synoptic(MayaQWidgetDockableMixin, QtWidgets.QDialog):
         header_space = 45
         self.resize(max_w + self.margin, max_h + self.margin + header_space)
 
+    def getTab(self, tab_name, used=()):
+        # type: (str, list) -> SynopticTabWrapper
+        """Get a pooled tab, or create it.
+
+        Args:
+            tab_name (str): Synoptic tab name
+            used (list, optional): The tabs already in the synoptic
+
+        Returns:
+            SynopticTabWrapper: The wrapped tab
+        """
+        pool = self._tabPool.setdefault(tab_name, [])
+        for tab in list(pool):
+            if not QtCompat.isValid(tab.synoptic_tab):
+                pool.remove(tab)
+            elif tab not in used:
+                tab.synoptic_tab.bindModel()
+                return tab
+
+        # instantiate SynopticTab widget
+        module = importTab(tab_name)
+        synoptic_tab = getattr(module, "SynopticTab")()
+
+        # set minimum size for auto fit (stretch) scroll area
+        if synoptic_tab.minimumHeight() == 0:
+            synoptic_tab.setMinimumHeight(synoptic_tab.height())
+        if synoptic_tab.minimumWidth() == 0:
+            synoptic_tab.setMinimumWidth(synoptic_tab.width())
+
+        tab = self.wrapTabContents(synoptic_tab)
+        pool.append(tab)
+        return tab
+
     def wrapTabContents(self, synoptic_tab):
         # type: (SynopticTab) -> QtWidgets.QWidget
 
@@ -281,6 +304,7 @@ class Synoptic(MayaQWidgetDockableMixin, QtWidgets.QDialog):
                                              QtWidgets.QSizePolicy.Minimum)
 
         wrapperWidget.setSpacerLeft(spacer_left)
+        wrapperWidget.synoptic_tab = synoptic_tab
 
         horizontalLayout.addItem(spacer_left)
         horizontalLayout.addWidget(synoptic_tab)
@@ -311,6 +335,7 @@ class SynopticTabWrapper(QtWidgets.QWidget):
             QtWidgets.QRubberBand.Rectangle, self)
 
         self.offset = QtCore.QPoint()
+        self.synoptic_tab = None
 
     def setSpacerLeft(self, spacer):
         # type: (QtWidgets.QSpacerItem) -> None
@@ -0,0 +1,479 @@
+"""Scene rig registry
+
+Find the rigs of the scene from the "is_rig" attribute without scanning all
+the transforms, and cache the per rig data used by the synoptic (namespace,
+control sets, their search index, keyable plugs, quick selections, mirror
+axis table and the nodes resolved from their names).
+
+The rig list is refreshed lazily after a reference, import or node
+added/removed event. The cached set members are dropped when the set is
+modified. The resolved nodes are dropped when they are renamed or deleted.
+"""
+
+from maya import cmds
+import maya.OpenMaya as OpenMaya
+import pymel.core as pm
+
+from . import searchIndex
+
+
+def _getMObject(name):
+    sel = OpenMaya.MSelectionList()
+    sel.add(name)
+    mobject = OpenMaya.MObject()
+    sel.getDependNode(0, mobject)
+    return mobject
+
+
+def _isUnder(mobject, rootPath):
+    # True if the dag node is the root or one of its descendants
+    if not mobject.hasFn(OpenMaya.MFn.kDagNode):
+        return False
+    path = OpenMaya.MFnDagNode(mobject).fullPathName()
+    return path == rootPath or path.startswith(rootPath + "|")
+
+
+def _getHandle(name, rootPath):
+    # the handle of the node under the root, or None
+    sel = OpenMaya.MSelectionList()
+    try:
+        sel.add(name)
+    except RuntimeError:
+        return None
+    for i in range(sel.length()):
+        mobject = OpenMaya.MObject()
+        sel.getDependNode(i, mobject)
+        if _isUnder(mobject, rootPath):
+            return OpenMaya.MObjectHandle(mobject)
+
+
+PLUGS_CHANGED_MSG = (OpenMaya.MNodeMessage.kAttributeAdded |
+                     OpenMaya.MNodeMessage.kAttributeRemoved |
+                     OpenMaya.MNodeMessage.kAttributeLocked |
+                     OpenMaya.MNodeMessage.kAttributeUnlocked |
+                     OpenMaya.MNodeMessage.kAttributeKeyable |
+                     OpenMaya.MNodeMessage.kAttributeUnkeyable)
+
+
+def _getPathName(mobject):
+    if mobject.hasFn(OpenMaya.MFn.kDagNode):
+        return OpenMaya.MFnDagNode(mobject).partialPathName()
+    return OpenMaya.MFnDependencyNode(mobject).name()
+
+
+class RigData(object):
+    """Cached data of a rig.
+
+    Arguments:
+        model (PyNode): The rig top node
+        watch (bool, optional): If True the cached data is dropped when the
+            sets or the quick selection attributes are modified. The
+            resolved nodes of the registered rigs are dropped by the
+            registry when they are renamed or deleted.
+
+    """
+
+    def __init__(self, model, watch=True):
+        self.model = model
+        self.watch = watch
+        self._sets = {}
+        self._setNames = {}
+        self._quickSel = {}
+        self._nameIndexes = {}
+        self._plugs = {}
+        self._nodePlugs = {}
+        self._defaults = {}
+        self._nodes = {}
+        self._nodesNamespace = None
+        self.mirrorAxisTable = None
+        self._callbackIds = {}
+        if watch:
+            self._callbackIds[None] = \
+                OpenMaya.MNodeMessage.addAttributeChangedCallback(
+                    self.model.__apimobject__(), self._attrChanged)
+
+    @property
+    def name(self):
+        return self.model.name()
+
+    @property
+    def namespace(self):
+        name = self.name
+        if len(name.split(":")) >= 2:
+            return ":".join(name.split(":")[:-1])
+        return ""
+
+    def clear(self):
+        """Drop the cached data and stop watching the scene"""
+        for cbId in self._callbackIds.values():
+            try:
+                OpenMaya.MMessage.removeCallback(cbId)
+            except RuntimeError:
+                pass
+        self._callbackIds = {}
+        self._setModified()
+        self.clearPlugs()
+        self._nodes = {}
+        self.mirrorAxisTable = None
+
+    def clearPlugs(self):
+        """Drop the cached keyable plugs and default values"""
+        self._plugs = {}
+        self._nodePlugs = {}
+        self._defaults = {}
+
+    def _setModified(self, *args):
+        self._sets = {}
+        self._setNames = {}
+        self._quickSel = {}
+        self._plugs = {}
+
+    def _attrChanged(self, msg, plug, *args):
+        if plug.partialName(False, False, False, False, False, True) \
+                .startswith("quicksel"):
+            self._quickSel = {}
+
+    def _nodePlugsChanged(self, msg, plug, otherPlug, name):
+        if msg & PLUGS_CHANGED_MSG:
+            self._nodePlugs.pop(name, None)
+            self._plugs = {}
+
+    def _watchNodePlugs(self, name):
+        key = ("plugs", name)
+        if self.watch and key not in self._callbackIds:
+            self._callbackIds[key] = \
+                OpenMaya.MNodeMessage.addAttributeChangedCallback(
+                    _getMObject(name), self._nodePlugsChanged, name)
+
+    def nodeRenamed(self, prevName):
+        """Drop the resolved node of a renamed node
+
+        Arguments:
+            prevName (str): The previous name of the node
+
+        """
+        self._nodes.pop(prevName.split("|")[-1].split(":")[-1], None)
+
+    def nodeRemoved(self, name):
+        """Drop the resolved node of a deleted node
+
+        Arguments:
+            name (str): The node name
+
+        """
+        self._nodes.pop(name.split(":")[-1], None)
+
+    def _watchSet(self, setName):
+        if self.watch and setName not in self._callbackIds:
+            self._callbackIds[setName] = \
+                OpenMaya.MObjectSetMessage.addSetMembersModifiedCallback(
+                    _getMObject(setName), self._setModified)
+
+    def getSetMembers(self, suffix):
+        """Get the members of a rig set
+
+        Arguments:
+            suffix (str): The set suffix. i.e: "_controllers_grp"
+
+        Returns:
+            list: The set members PyNodes or None if the set doesn't exist
+
+        """
+        if suffix not in self._sets:
+            setName = self.name + suffix
+            if not cmds.objExists(setName):
+                return None
+            self._sets[suffix] = pm.PyNode(setName).members()
+            self._watchSet(setName)
+
+        return self._sets[suffix]
+
+    def getSetMemberNames(self, suffix):
+        """Get the names of the members of a rig set and its sub sets
+
+        Arguments:
+            suffix (str): The set suffix. i.e: "_controllers_grp"
+
+        Returns:
+            list: The members names, the sets are not included.
+
+        """
+        if suffix not in self._setNames:
+            setName = self.name + suffix
+            if not cmds.objExists(setName):
+                return []
+
+            names = []
+            toVisit = [setName]
+            while toVisit:
+                s = toVisit.pop(0)
+                for child in cmds.sets(s, q=True) or []:
+                    if cmds.nodeType(child) == "objectSet":
+                        toVisit.append(child)
+                        self._watchSet(child)
+                    else:
+                        names.append(child)
+
+            self._setNames[suffix] = names
+            self._watchSet(setName)
+
+        return self._setNames[suffix]
+
+    def getNameIndex(self, suffix):
+        """Get the search index of the members of a rig set and its sub sets
+
+        The index is built once and only updated with the members added or
+        removed when the sets are modified.
+
+        Arguments:
+            suffix (str): The set suffix. i.e: "_controllers_grp"
+
+        Returns:
+            NameIndex: The index of the members names, without namespace
+
+        """
+        names = self.getSetMemberNames(suffix)
+        index, indexedNames = self._nameIndexes.get(suffix, (None, None))
+        if index is None:
+            index = searchIndex.NameIndex()
+        if names is not indexedNames:
+            index.update(n.split(":")[-1] for n in names)
+            self._nameIndexes[suffix] = (index, names)
+
+        return index
+
+    def getNodePlugs(self, name):
+        """Get the keyable and unlocked plugs of a node
+
+        The cached plugs of the node are dropped when one of its attributes
+        is added, removed, locked, unlocked or its keyable state changes.
+
+        Arguments:
+            name (str): The node name
+
+        Returns:
+            list: The plugs names. i.e: "arm_L0_fk0_ctl.translateX"
+
+        """
+        if name not in self._nodePlugs:
+            attrs = cmds.listAttr(name, keyable=True, unlocked=True) or []
+            self._nodePlugs[name] = ["%s.%s" % (name, a) for a in attrs]
+            self._watchNodePlugs(name)
+
+        return self._nodePlugs[name]
+
+    def getKeyablePlugs(self, suffix):
+        """Get the keyable plugs of the members of a rig set and its sub sets
+
+        Arguments:
+            suffix (str): The set suffix. i.e: "_controllers_grp"
+
+        Returns:
+            list: The plugs names
+
+        """
+        if suffix not in self._plugs:
+            plugs = []
+            for name in self.getSetMemberNames(suffix):
+                plugs.extend(self.getNodePlugs(name))
+            self._plugs[suffix] = plugs
+
+        return self._plugs[suffix]
+
+    def getDefaultValues(self, plugs):
+        """Get the default values of plugs
+
+        The default values are queried once and stored.
+
+        Arguments:
+            plugs (list): The plugs names
+
+        Returns:
+            list: The default value of each plug. None if the plug doesn't
+                have a default value.
+
+        """
+        values = []
+        for plug in plugs:
+            if plug not in self._defaults:
+                node, attr = plug.split(".", 1)
+                try:
+                    value = cmds.attributeQuery(attr.split("[")[0],
+                                                node=node,
+                                                listDefault=True)[0]
+                except (RuntimeError, TypeError):
+                    value = None
+                self._defaults[plug] = value
+            values.append(self._defaults[plug])
+
+        return values
+
+    def getNodePaths(self, names):
+        """Get the existing nodes from names without namespace
+
+        The names are resolved with the rig namespace, in the rig hierarchy.
+        The resolved nodes are kept until they are renamed or deleted.
+
+        Arguments:
+            names (list): The node names, the namespace is ignored
+
+        Returns:
+            list: The unique path names of the existing nodes
+
+        """
+        nameSpace = self.namespace
+        if nameSpace != self._nodesNamespace:
+            self._nodes = {}
+            self._nodesNamespace = nameSpace
+        prefix = nameSpace + ":" if nameSpace else ""
+        rootPath = OpenMaya.MFnDagNode(
+            self.model.__apimobject__()).fullPathName()
+
+        paths = []
+        for name in names:
+            if not name:
+                continue
+            name = name.split(":")[-1]
+            handle = self._nodes.get(name)
+            # the node can be moved out of the rig
+            if (handle is None or not handle.isValid()
+                    or not _isUnder(handle.object(), rootPath)):
+                handle = _getHandle(prefix + name, rootPath)
+                if handle is None:
+                    continue
+                self._nodes[name] = handle
+            paths.append(_getPathName(handle.object()))
+
+        return paths
+
+    def getQuickSel(self, channel):
+        """Get the names stored on a quick selection channel
+
+        Arguments:
+            channel (str): The quick selection channel. i.e: "A"
+
+        Returns:
+            list: The names
+
+        """
+        if channel not in self._quickSel:
+            value = self.model.attr("quicksel%s" % channel).get()
+            self._quickSel[channel] = value.split(",") if value else []
+
+        return self._quickSel[channel]
+
+    def setQuickSel(self, channel, names):
+        """Store the names on a quick selection channel
+
+        Arguments:
+            channel (str): The quick selection channel. i.e: "A"
+            names (list): The names to store
+
+        """
+        self.model.attr("quicksel%s" % channel).set(",".join(names))
+        self._quickSel[channel] = list(names)
+
+
+class RigRegistry(object):
+    """Registry of the rigs of the scene"""
+
+    def __init__(self):
+        self._rigs = {}
+        self._dirty = True
+        self._callbackIds = []
+
+    def _addCallbacks(self):
+        if self._callbackIds:
+            return
+
+        ids = [OpenMaya.MDGMessage.addNodeAddedCallback(self._setDirty,
+                                                        "transform"),
+               OpenMaya.MDGMessage.addNodeRemovedCallback(self._nodeRemoved),
+               # a null MObject watches the renaming of all the nodes
+               OpenMaya.MNodeMessage.addNameChangedCallback(
+                   OpenMaya.MObject(), self._nodeRenamed)]
+        for msg in (OpenMaya.MSceneMessage.kAfterNew,
+                    OpenMaya.MSceneMessage.kAfterOpen,
+                    OpenMaya.MSceneMessage.kAfterImport,
+                    OpenMaya.MSceneMessage.kAfterCreateReference,
+                    OpenMaya.MSceneMessage.kAfterLoadReference,
+                    OpenMaya.MSceneMessage.kAfterUnloadReference,
+                    OpenMaya.MSceneMessage.kAfterRemoveReference):
+            ids.append(OpenMaya.MSceneMessage.addCallback(msg,
+                                                          self._setDirty))
+        self._callbackIds = ids
+
+    def _setDirty(self, *args):
+        self._dirty = True
+
+    def _nodeRenamed(self, mobject, prevName, *args):
+        for data in self._rigs.values():
+            data.nodeRenamed(prevName)
+
+    def _nodeRemoved(self, mobject, *args):
+        if mobject.hasFn(OpenMaya.MFn.kTransform):
+            self._dirty = True
+        name = OpenMaya.MFnDependencyNode(mobject).name()
+        for data in self._rigs.values():
+            data.nodeRemoved(name)
+
+    def _scan(self):
+        self._addCallbacks()
+        self._dirty = False
+
+        # the attribute lookup doesn't need to visit all the transforms
+        names = cmds.ls("*.is_rig", objectsOnly=True, recursive=True) or []
+        rigs = {}
+        for name in names:
+            model = pm.PyNode(name)
+            rigs[model] = self._rigs.get(model) or RigData(model)
+
+        for model, data in self._rigs.items():
+            if model not in rigs:
+                data.clear()
+        self._rigs = rigs
+
+    def refresh(self):
+        """Scan again the rigs and drop all the cached data"""
+        for data in self._rigs.values():
+            data.clear()
+        self._rigs = {}
+        self._scan()
+
+    def getRigs(self):
+        """Get the rigs of the scene
+
+        Returns:
+            list: The RigData of each rig, sorted by name
+
+        """
+        if self._dirty:
+            self._scan()
+        return sorted(self._rigs.values(), key=lambda r: r.name)
+
+    def getRig(self, model):
+        """Get the data of a rig
+
+        Arguments:
+            model (PyNode or str): The rig top node
+
+        Returns:
+            RigData: The rig data
+
+        """
+        if not isinstance(model, pm.PyNode):
+            model = pm.PyNode(model)
+        if self._dirty:
+            self._scan()
+        if model not in self._rigs:
+            # not a registered rig, we don't keep it
+            return RigData(model, watch=False)
+        return self._rigs[model]
+
+
+_rigRegistry = RigRegistry()
+
+
+def getRigRegistry():
+    """Get the scene rig registry"""
+    return _rigRegistry
@@ -1,6 +1,6 @@
 import maya.cmds as mc
 
-from . import utils
+from . import utils, rigRegistry, searchIndex
 
 from mgear.vendor.Qt import QtWidgets
 
@@ -12,11 +12,13 @@ def getControlsFromSets(desiredSet, listToPopulate):
         desiredSet (string): name of set to crawl
         listToPopulate (list): where to append found nodes
     """
-    for child in mc.sets(desiredSet, q=True):
-        if mc.nodeType(child) == "objectSet":
-            getControlsFromSets(child, listToPopulate)
-        else:
-            listToPopulate.append(child)
+    toVisit = [desiredSet]
+    while toVisit:
+        for child in mc.sets(toVisit.pop(0), q=True) or []:
+            if mc.nodeType(child) == "objectSet":
+                toVisit.append(child)
+            else:
+                listToPopulate.append(child)
 
 
 def getBaseNames(nodes):
@@ -56,8 +58,7 @@ def getTokens(userInput):
     Returns:
         list: of all tokens that were seperated via comma
     """
-    allTokens = userInput.replace(" ", "").split(',')
-    return allTokens
+    return searchIndex.getTokens(userInput)
 
 
 class ControlListerUI(QtWidgets.QWidget):
@@ -70,6 +71,8 @@ class ControlListerUI(QtWidgets.QWidget):
         self.model = None
         self.modelControls = []
         self.namespace = None
+        self.nameIndex = searchIndex.NameIndex()
+        self.resultItems = {}
         self.gui()
         self.connectSignals()
         # self.refresh()
@@ -88,8 +91,8 @@ class ControlListerUI(QtWidgets.QWidget):
         Args:
             resultsToDisplay (list): of results to display
         """
-        self.resultWidget.clear()
-        self.resultWidget.addItems(resultsToDisplay)
+        self.resultItems = searchIndex.fillResultList(self.resultWidget,
+                                                      resultsToDisplay)
 
     def getNodeWithNameSpace(self, node):
         """In the future this will need to change to allow for set name prefix
@@ -108,29 +111,25 @@ class ControlListerUI(QtWidgets.QWidget):
 
     def queryNames(self, userInput):
         """Take the userInput and query against all controls
-        remove duplicates and sort
+        the matching controls are shown ranked, the others hidden
 
         Args:
             userInput (string): from UI
         """
-        searchResults = set()
-        # userInput = userInput.toString()
-        allTokens = getTokens(userInput)
-        [searchResults.update(getMatching(token, self.modelControls))
-         for token in allTokens]
-        searchResults = sorted(searchResults)
-        self.displayResults(searchResults)
+        searchResults = self.nameIndex.search(userInput)
+        searchIndex.showRankedResults(self.resultWidget,
+                                      self.resultItems,
+                                      searchResults)
 
     def setControlsToQuery(self):
         """Query the controls set in the scene from the scene.
         TODO: Open this up to select multiple areas for query
         """
-        setControls = []
-        controlerSet = "{0}{1}".format(self.model, utils.CTRL_GRP_SUFFIX)
-        if mc.objExists(controlerSet):
-            getControlsFromSets(controlerSet, setControls)
-        baseControlNames = set(getBaseNames(setControls))
-        self.modelControls = list(baseControlNames)
+        self.nameIndex = searchIndex.NameIndex()
+        if self.model:
+            rig = rigRegistry.getRigRegistry().getRig(self.model)
+            self.nameIndex = rig.getNameIndex(utils.CTRL_GRP_SUFFIX)
+        self.modelControls = list(self.nameIndex.names)
 
     def selectAllResults(self):
         """Select all items in results widget
@@ -157,8 +156,8 @@ class ControlListerUI(QtWidgets.QWidget):
         print self.namespace
         print self.model
         self.searchLineEdit.clear()
-        self.resultWidget.clear()
         self.setControlsToQuery()
+        self.displayResults(self.modelControls)
         self.queryNames("")
 
     def gui(self):
@@ -168,7 +167,8 @@ class ControlListerUI(QtWidgets.QWidget):
         self.setLayout(self.mainLayout)
         #  -------------------------------------------------------------------
         self.searchLineEdit = QtWidgets.QLineEdit()
-        self.searchLineEdit.setPlaceholderText("Filter via ',' seperated...")
+        self.searchLineEdit.setPlaceholderText(
+            "Filter via ',' seperated, side:L, comp:arm...")
         self.mainLayout.addWidget(self.searchLineEdit)
         #  -------------------------------------------------------------------
         bodyLayout = QtWidgets.QHBoxLayout()
@@ -0,0 +1,256 @@
+"""Search index for the synoptic control and geometry lists
+
+The names are indexed once by lower-cased trigrams, so a search only checks
+the names sharing the trigrams of the searched token instead of all the
+names. The index can be updated incrementally when names are added or
+removed.
+
+The user input is a comma separated list of tokens, all the names are
+returned if there is no token. The results matching any of the tokens are
+returned ranked: exact match, then prefix, then match at
+the start of a "_" separated part, then any other match. The tokens
+"side:<side>" and "comp:<component>" filter the results with the side
+(L, R, C) and component name, parsed from the mGear naming convention.
+"""
+
+import re
+
+from mgear.vendor.Qt import QtCore
+from mgear.vendor.Qt import QtWidgets
+
+
+NGRAM = 3
+SIDE_EXPR = re.compile(r"^([LRC])\d+$")
+
+RANK_EXACT = 0
+RANK_PREFIX = 1
+RANK_PART = 2
+RANK_CONTAINS = 3
+
+RANK_ROLE = QtCore.Qt.UserRole
+
+
+def getTokens(userInput):
+    """splits up the userInput via commas, strips spaces
+
+    Args:
+        userInput (string): comma seperated search tokens, filters
+
+    Returns:
+        list: of all tokens that were seperated via comma
+    """
+    return userInput.replace(" ", "").split(",")
+
+
+def getFacets(name):
+    """Get the component and side of a name
+
+    Args:
+        name (str): The name, without namespace. i.e: "arm_L0_fk0_ctl"
+
+    Returns:
+        tuple: (component, side) in lower case. None if not found.
+    """
+    parts = name.lower().split("_")
+    if len(parts) < 2:
+        return None, None
+    match = SIDE_EXPR.match(parts[1].upper())
+    side = match.group(1).lower() if match else None
+    return parts[0], side
+
+
+def _rank(token, lname):
+    if token == lname:
+        return RANK_EXACT
+    if lname.startswith(token):
+        return RANK_PREFIX
+    if "_" + token in lname:
+        return RANK_PART
+    return RANK_CONTAINS
+
+
+class NameIndex(object):
+    """Trigram index of names, with component and side facets
+
+    Args:
+        names (list, optional): The names to index
+    """
+
+    def __init__(self, names=None):
+        self._lower = {}
+        self._facets = {}
+        self._grams = {}
+        for name in names or []:
+            self.add(name)
+
+    @property
+    def names(self):
+        return self._lower.keys()
+
+    def __len__(self):
+        return len(self._lower)
+
+    def __contains__(self, name):
+        return name in self._lower
+
+    def add(self, name):
+        """Add a name to the index
+
+        Args:
+            name (str): The name
+        """
+        if name in self._lower:
+            return
+        lname = name.lower()
+        self._lower[name] = lname
+        self._facets[name] = getFacets(name)
+        for i in range(len(lname) - NGRAM + 1):
+            self._grams.setdefault(lname[i:i + NGRAM], set()).add(name)
+
+    def remove(self, name):
+        """Remove a name from the index
+
+        Args:
+            name (str): The name
+        """
+        lname = self._lower.pop(name, None)
+        if lname is None:
+            return
+        del self._facets[name]
+        for i in range(len(lname) - NGRAM + 1):
+            gram = self._grams.get(lname[i:i + NGRAM])
+            if gram is not None:
+                gram.discard(name)
+                if not gram:
+                    del self._grams[lname[i:i + NGRAM]]
+
+    def update(self, names):
+        """Update the index to contain only the given names
+
+        Only the names added or removed since the last update are indexed.
+
+        Args:
+            names (iterable): The names
+        """
+        names = set(names)
+        current = set(self._lower)
+        for name in current - names:
+            self.remove(name)
+        for name in names - current:
+            self.add(name)
+
+    def _candidates(self, token):
+        if len(token) < NGRAM:
+            return self._lower.keys()
+        grams = [self._grams.get(token[i:i + NGRAM], set())
+                 for i in range(len(token) - NGRAM + 1)]
+        grams.sort(key=len)
+        candidates = set(grams[0])
+        for gram in grams[1:]:
+            candidates &= gram
+            if not candidates:
+                break
+        return candidates
+
+    def search(self, userInput):
+        """Search the names matching the user input
+
+        Args:
+            userInput (str): Comma separated search tokens and filters
+
+        Returns:
+            list: The matching names, ranked
+        """
+        tokens = []
+        filters = {}
+        for token in getTokens(userInput.lower()):
+            if token.startswith("side:"):
+                filters[1] = token[len("side:"):]
+            elif token.startswith("comp:"):
+                filters[0] = token[len("comp:"):]
+            elif token:
+                tokens.append(token)
+        ranks = {}
+        if not tokens:
+            ranks = dict.fromkeys(self._lower, RANK_EXACT)
+        for token in tokens:
+            for name in self._candidates(token):
+                lname = self._lower[name]
+                if token not in lname:
+                    continue
+                rank = _rank(token, lname)
+                if rank < ranks.get(name, RANK_CONTAINS + 1):
+                    ranks[name] = rank
+
+        if filters:
+            for name in ranks.keys():
+                facets = self._facets[name]
+                for i, value in filters.items():
+                    if facets[i] != value:
+                        del ranks[name]
+                        break
+
+        if not tokens:
+            return sorted(ranks)
+        return sorted(ranks, key=lambda n: (ranks[n], len(n), n))
+
+
+class RankedListItem(QtWidgets.QListWidgetItem):
+    """List item sorted by the rank stored in its RANK_ROLE data"""
+
+    def __lt__(self, other):
+        return self.data(RANK_ROLE) < other.data(RANK_ROLE)
+
+
+def fillResultList(listWidget, names):
+    """Clear the list widget and add an item for each name
+
+    Args:
+        listWidget (QListWidget): The results list widget
+        names (list): The names
+
+    Returns:
+        dict: The list items, by name
+    """
+    listWidget.clear()
+    items = {}
+    for i, name in enumerate(sorted(set(names))):
+        item = RankedListItem(name)
+        item.setData(RANK_ROLE, i)
+        listWidget.addItem(item)
+        items[name] = item
+    return items
+
+
+def showRankedResults(listWidget, items, results):
+    """Show the results in the list, in rank order, hiding the other items
+
+    The items are not recreated, only the items changing visibility are
+    updated. Each item gets its rank as sort data and the list is sorted
+    once, so the shown items are at the top of the list, in rank order,
+    followed by the hidden items in name order.
+
+    Args:
+        listWidget (QListWidget): The results list widget
+        items (dict): The list items by name, from fillResultList
+        results (list): The ranked names to show
+    """
+    ranks = dict((name, i) for i, name in enumerate(results))
+    hiddenRank = len(ranks)
+
+    listWidget.setUpdatesEnabled(False)
+    try:
+        for name in sorted(items):
+            item = items[name]
+            rank = ranks.get(name)
+            hidden = rank is None
+            if hidden:
+                rank = hiddenRank
+                hiddenRank += 1
+            if item.isHidden() != hidden:
+                item.setHidden(hidden)
+            item.setData(RANK_ROLE, rank)
+
+        listWidget.sortItems(QtCore.Qt.AscendingOrder)
+    finally:
+        listWidget.setUpdatesEnabled(True)
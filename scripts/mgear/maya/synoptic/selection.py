@@ -0,0 +1,136 @@
+"""Synoptic selection service
+
+Keep the synoptic tabs buttons in sync with Maya selection.
+
+A single SelectionChanged callback is shared by all the synoptic tabs. The
+selection events are coalesced and processed once Maya is idle, and only the
+selection delta (added and removed node names) is sent to the tabs. So a burst
+of selection events costs one UI update and each tab only repaints the buttons
+whose state changed.
+"""
+
+import traceback
+
+from maya import cmds
+import maya.OpenMaya as OpenMaya
+import maya.utils
+
+import mgear
+from mgear.vendor.Qt import QtCompat
+
+
+class SelectionService(object):
+    """Send the selection changes to the registered synoptic tabs.
+
+    The tabs have to implement selectChanged(added, removed) where added and
+    removed are sets of node names.
+
+    """
+
+    def __init__(self):
+        self.tabs = []
+        self._newTabs = []
+        self._selection = set()
+        self._callbackId = None
+        self._pending = False
+
+    def register(self, tab):
+        """Register a tab. The tab is updated with the whole selection on the
+        next idle.
+
+        Args:
+            tab (MainSynopticTab): The synoptic tab
+        """
+        if tab in self.tabs:
+            return
+        self.tabs.append(tab)
+        self._newTabs.append(tab)
+
+        if self._callbackId is None:
+            self._selection = set(cmds.ls(sl=True))
+            self._callbackId = OpenMaya.MEventMessage.addEventCallback(
+                "SelectionChanged", self._selectionChanged)
+
+        self._schedule()
+
+    def unregister(self, tab):
+        """Unregister a tab
+
+        Args:
+            tab (MainSynopticTab): The synoptic tab
+        """
+        if tab in self.tabs:
+            self.tabs.remove(tab)
+        if tab in self._newTabs:
+            self._newTabs.remove(tab)
+        if not self.tabs:
+            self._removeCallback()
+
+    def _removeCallback(self):
+        if self._callbackId is not None:
+            try:
+                OpenMaya.MMessage.removeCallback(self._callbackId)
+            except RuntimeError:
+                pass
+            self._callbackId = None
+
+    def _selectionChanged(self, *args):
+        self._schedule()
+
+    def _schedule(self):
+        # coalesce the events until Maya is idle
+        if not self._pending:
+            self._pending = True
+            maya.utils.executeDeferred(self.flush)
+
+    def flush(self):
+        """Send the selection changes since the last flush to the tabs"""
+        self._pending = False
+
+        selection = set(cmds.ls(sl=True))
+        added = selection - self._selection
+        removed = self._selection - selection
+        self._selection = selection
+
+        newTabs = self._newTabs
+        self._newTabs = []
+
+        for tab in list(self.tabs):
+            if not QtCompat.isValid(tab):
+                self.unregister(tab)
+                continue
+
+            try:
+                if tab in newTabs:
+                    tab.selectChanged(selection, set())
+                elif added or removed:
+                    tab.selectChanged(added, removed)
+
+            except Exception as e:
+                mes = traceback.format_exc()
+                mes = "error has occur in synoptic selection " \
+                      "update\n{0}\n{1}".format(mes, e)
+                mgear.log(mes, mgear.sev_error)
+                self.unregister(tab)
+                tab.close()
+
+
+_selectionService = SelectionService()
+
+
+def register(tab):
+    """Register a synoptic tab to the selection service
+
+    Args:
+        tab (MainSynopticTab): The synoptic tab
+    """
+    _selectionService.register(tab)
+
+
+def unregister(tab):
+    """Unregister a synoptic tab from the selection service
+
+    Args:
+        tab (MainSynopticTab): The synoptic tab
+    """
+    _selectionService.unregister(tab)
@@ -1,11 +1,9 @@
-import traceback
-
 import pymel.core as pm
-import maya.OpenMayaUI as OpenMayaUI
+from maya import cmds
 
 import mgear
-from .. import widgets, utils
-from mgear.vendor.Qt import QtCore, QtWidgets, QtGui, QtCompat
+from .. import widgets, utils, selection
+from mgear.vendor.Qt import QtCore, QtWidgets, QtGui
 
 ##################################################
 # SYNOPTIC TAB WIDGET
@@ -43,8 +41,11 @@ class MainSynopticTab(QtWidgets.QDialog):
         klass.setupUi(self)
         klass.setBackground()
         klass.connectSignals()
-        klass.connectMaya()
         self._buttonGeometry = {}  # for cachinig
+        self._buttonIndex = None
+        self._indexNameSpace = None
+        self._scriptJobs = []
+        klass.connectMaya()
 
         # This is necessary for not to be zombie job on close.
         # Qt does not actually destroy the object by just pressing
@@ -82,63 +83,93 @@ class MainSynopticTab(QtWidgets.QDialog):
 
     def connectMaya(self):
         # type: () -> None
-        # script job callback
-        # ptr = long(QtCompat.getCppPointer(self)[0])
-        # ptr = QtCompat.getCppPointer(self)
-        ptr = long(QtCompat.getCppPointer(self))
-
-        gui = OpenMayaUI.MQtUtil.fullName(ptr)
-        self.selJob = pm.scriptJob(e=("SelectionChanged",
-                                      self.selectChanged),
-                                   parent=gui)
-
-    def selectChanged(self, *args):
-        # wrap to catch exception guaranteeing maya does not stop at this
-        try:
-            self.__selectChanged(*args)
-
-        except Exception as e:
-            mes = traceback.format_exc()
-            mes = "error has occur in scriptJob " \
-                  "SelectionChanged\n{0}".format(mes)
-
-            mes = "{0}\n{1}".format(mes, e)
-            mgear.log(mes, mgear.sev_error)
-            pm.scriptJob(kill=self.selJob)
-            self.close()
-
-    def __selectChanged(self, *args):
-
-        sels = []
-        [sels.append(x.name()) for x in pm.ls(sl=True)]
-
-        oModel = utils.getModel(self)
-        if not oModel:
-            mes = "model not found for synoptic {}".format(self.name)
-            mgear.log(mes, mgear.sev_info)
-
-            # self.close()
+        # selection callback, shared by all the tabs
+        selection.register(self)
 
-            syn_widget = utils.getSynopticWidget(self)
-            syn_widget.updateModelList()
+    def disconnectMaya(self):
+        # type: () -> None
+        selection.unregister(self)
+        for jobId in self._scriptJobs:
+            if cmds.scriptJob(exists=jobId):
+                cmds.scriptJob(kill=jobId, force=True)
+        self._scriptJobs = []
+
+    def addScriptJob(self, **kwargs):
+        # type: (**object) -> int
+        """Create a script job, killed when the tab is closed or unbound
+
+        Returns:
+            int: The script job id
+        """
+        jobId = cmds.scriptJob(**kwargs)
+        self._scriptJobs.append(jobId)
+        return jobId
+
+    def bindModel(self):
+        # type: () -> None
+        """Bind a pooled tab to the current model of the synoptic"""
+        self._buttonIndex = None
+        self._indexNameSpace = None
+        for combo in self.findChildren(widgets.toggleCombo):
+            combo.reset()
+        self.connectMaya()
+
+    def unbindModel(self):
+        # type: () -> None
+        """Disconnect a tab removed from the synoptic and kept in the pool"""
+        self.disconnectMaya()
 
-            return
+    def closeEvent(self, event):
+        # type: (QtGui.QCloseEvent) -> None
+        self.disconnectMaya()
+        super(MainSynopticTab, self).closeEvent(event)
 
-        nameSpace = utils.getNamespace(oModel.name())
+    def buildButtonIndex(self, nameSpace=""):
+        # type: (str) -> None
+        """Index the select buttons by the name of their object"""
 
-        selButtons = self.findChildren(widgets.SelectButton)
-        for selB in selButtons:
+        self._buttonIndex = {}
+        self._indexNameSpace = nameSpace
+        for selB in self.findChildren(widgets.SelectButton):
             obj = str(selB.property("object")).split(",")
             if len(obj) == 1:
                 if nameSpace:
                     checkName = ":".join([nameSpace, obj[0]])
                 else:
                     checkName = obj[0]
+                self._buttonIndex.setdefault(checkName, []).append(selB)
 
-                if checkName in sels:
-                    selB.paintSelected(True)
-                else:
+    def selectChanged(self, added, removed):
+        # type: (set, set) -> None
+        """Repaint the buttons of the added and removed selected objects.
+
+        Called by the selection service.
+        """
+        syn_widget = utils.getSynopticWidget(self)
+        modelName = syn_widget.model_list.currentText()
+        if not modelName or not cmds.objExists(modelName):
+            mes = "model not found for synoptic {}".format(self.name)
+            mgear.log(mes, mgear.sev_info)
+
+            syn_widget.updateModelList()
+
+            return
+
+        nameSpace = utils.getNamespace(modelName)
+        if self._buttonIndex is None or nameSpace != self._indexNameSpace:
+            self.buildButtonIndex(nameSpace)
+            for buttons in self._buttonIndex.values():
+                for selB in buttons:
                     selB.paintSelected(False)
+            added = set(cmds.ls(sl=True))
+            removed = set()
+
+        for name in removed:
+            for selB in self._buttonIndex.get(name, []):
+                selB.paintSelected(False)
+        for name in added:
+            for selB in self._buttonIndex.get(name, []):
+                selB.paintSelected(True)
 
     def _getButtonAbsoluteGeometry(self, button):
         # type: (widgets.SelectButton) -> QtCore.QSize
@@ -203,11 +234,12 @@ class MainSynopticTab(QtWidgets.QDialog):
 
     def resetAll_clicked(self):
         # type: () -> None
-        print "resetAll"
+        model = utils.getModel(self)
+        utils.resetAll(model)
 
     def resetSel_clicked(self):
         # type: () -> None
-        print "resetSel"
+        utils.resetSelTrans()
 
     def keyAll_clicked(self):
         # type: () -> None
@@ -3,7 +3,7 @@ from functools import partial
 import maya.cmds as mc
 
 import mgear.maya.pyqt as gqt
-from mgear.maya.synoptic import utils
+from mgear.maya.synoptic import utils, searchIndex
 QtGui, QtCore, QtWidgets, wrapInstance = gqt.qt_import()
 
 # ==============================================================================
@@ -110,8 +110,7 @@ def getTokens(userInput):
     Returns:
         list: of all tokens that were seperated via comma
     """
-    allTokens = userInput.replace(" ", "").split(',')
-    return allTokens
+    return searchIndex.getTokens(userInput)
 
 
 class ToggleGeoVisibility(QtWidgets.QWidget):
@@ -132,6 +131,8 @@ class ToggleGeoVisibility(QtWidgets.QWidget):
         self.model = None
         self.nameSpace = None
         self.modelControls = []
+        self.nameIndex = searchIndex.NameIndex()
+        self.resultItems = {}
         self.gui()
         self.connectSignals()
         # self.setInfomation()
@@ -196,8 +197,8 @@ class ToggleGeoVisibility(QtWidgets.QWidget):
         Args:
             resultsToDisplay (list): of results to display
         """
-        self.resultWidget.clear()
-        self.resultWidget.addItems(sorted(set(resultsToDisplay)))
+        self.resultItems = searchIndex.fillResultList(self.resultWidget,
+                                                      resultsToDisplay)
 
     def hideResults(self, resultsToDisplay):
         """clear and display the provided list
@@ -229,16 +230,15 @@ class ToggleGeoVisibility(QtWidgets.QWidget):
 
     def queryNames(self, userInput):
         """Take the userInput and query against all controls
-        remove duplicates and sort
+        the matching meshes are shown ranked, the others hidden
 
         Args:
             userInput (string): from UI
         """
-        searchResults = []
-        allTokens = getTokens(userInput)
-        [searchResults.extend(getMatching(token, self.modelControls))
-         for token in allTokens]
-        self.hideResults(searchResults)
+        searchResults = self.nameIndex.search(userInput)
+        searchIndex.showRankedResults(self.resultWidget,
+                                      self.resultItems,
+                                      searchResults)
 
     def setNodeInfoForQuery(self, nodesToGet="all"):
         """Query the controls set in the scene from the scene.
@@ -257,6 +257,8 @@ class ToggleGeoVisibility(QtWidgets.QWidget):
             meshNodes = getVisible(meshNodes)
         baseNodeNames = set(getBaseNames(meshNodes))
         self.modelControls = list(baseNodeNames)
+        # only the meshes added or removed since the last query are indexed
+        self.nameIndex.update(baseNodeNames)
 
     def selectAllResults(self):
         """Select all items in results widget
@@ -323,7 +325,6 @@ class ToggleGeoVisibility(QtWidgets.QWidget):
         self.showVisibleButton.setChecked(False)
         self.showHiddenButton.setChecked(False)
         self.searchLineEdit.clear()
-        self.resultWidget.clear()
         self.setNodeInfoForQuery()
         self.displayResults(self.modelControls)
         self.upateAllResultColors()
@@ -336,7 +337,6 @@ class ToggleGeoVisibility(QtWidgets.QWidget):
             nodesToGet (TYPE): Description
         """
         self.searchLineEdit.clear()
-        self.resultWidget.clear()
         self.setNodeInfoForQuery(nodesToGet=nodesToGet)
         self.displayResults(self.modelControls)
         self.upateAllResultColors()
@@ -364,7 +364,8 @@ class ToggleGeoVisibility(QtWidgets.QWidget):
         self.setLayout(self.mainLayout)
         #  -------------------------------------------------------------------
         self.searchLineEdit = QtWidgets.QLineEdit()
-        self.searchLineEdit.setPlaceholderText("Filter via ',' seperated...")
+        self.searchLineEdit.setPlaceholderText(
+            "Filter via ',' seperated, side:L, comp:arm...")
         self.mainLayout.addWidget(self.searchLineEdit)
         #  -------------------------------------------------------------------
         bodyLayout = QtWidgets.QHBoxLayout()
@@ -1,15 +1,20 @@
+import math
 import re
 import traceback
 from functools import partial
 
 
+from maya import cmds
+import maya.OpenMaya as OpenMaya
 import pymel.core as pm
 from pymel import versions
+from pymel.core import datatypes
 
 import mgear
 
 from mgear.vendor.Qt import QtCore, QtWidgets
 from mgear.maya import pyqt, dag, transform, utils, attribute, vector
+from . import rigRegistry
 
 # ==============================================================================
 # constants
@@ -19,6 +24,11 @@ SYNOPTIC_WIDGET_NAME = "synoptic_view"
 CTRL_GRP_SUFFIX = "_controllers_grp"
 PLOT_GRP_SUFFIX = "_PLOT_grp"
 
+# mirror pose modes
+MIRROR_CHANNELS = "channels"
+MIRROR_MATRIX = "matrix"
+SRT_CHANNELS = ["tx", "ty", "tz", "rx", "ry", "rz", "sx", "sy", "sz"]
+
 
 EXPR_LEFT_SIDE = re.compile("L(\d+)")
 EXPR_RIGHT_SIDE = re.compile("R(\d+)")
@@ -191,13 +201,7 @@ def getControlers(model, gSuffix=CTRL_GRP_SUFFIX):
     Returns:
         list: The members of the group
     """
-    try:
-        ctl_set = pm.PyNode(model.name() + gSuffix)
-        members = ctl_set.members()
-
-        return members
-    except TypeError:
-        return None
+    return rigRegistry.getRigRegistry().getRig(model).getSetMembers(gSuffix)
 
 
 def getNamespace(modelName):
@@ -249,6 +253,24 @@ def getNode(nodeName):
         return None
 
 
+def getNodeNames(model, object_names):
+    """Get the existing nodes from names without namespace
+
+    The names are resolved with the rig namespace, the resolved nodes are
+    cached by the rig registry.
+
+    Args:
+        model (PyNode): The rig top node
+        object_names (list): The names of the objects, the namespace is
+            ignored
+
+    Returns:
+        list: The names of the existing nodes
+    """
+    return rigRegistry.getRigRegistry().getRig(model).getNodePaths(
+        object_names)
+
+
 def listAttrForMirror(node):
     """List attributes to invert the value for mirror posing
 
@@ -298,62 +320,33 @@ def selectObj(model, object_names, mouse_button, key_modifier):
     if not model:
         return
 
-    nameSpace = getNamespace(model)
+    nodes = getNodeNames(model, object_names)
+    if not nodes:
+        return
 
     with pm.UndoChunk():
-        nodes = []
-        for name in object_names:
-            if nameSpace:
-                node = getNode(nameSpace + ":" + name)
-            else:
-                node = getNode(name)
-
-            if not node:
-                continue
-
-            if not node and nameSpace:
-                mgear.log("Can't find object : %s:%s" % (nameSpace, name),
-                          mgear.sev_error)
-            elif not node:
-                mgear.log("Can't find object : %s" % (name), mgear.sev_error)
-            nodes.append(node)
-
-        if not nodes:
-            return
         if mouse_button == QtCore.Qt.RightButton:
-            mirrorPose(False, nodes)
+            mirrorPose(False, [pm.PyNode(n) for n in nodes])
             return
         if mouse_button == QtCore.Qt.MiddleButton:
-            mirrorPose(True, nodes)
+            mirrorPose(True, [pm.PyNode(n) for n in nodes])
             return
+
         # Key pressed
-        if key_modifier is None:
-            pm.select(nodes)
-        elif key_modifier == QtCore.Qt.NoModifier:  # No Key
-            pm.select(nodes)
-        elif key_modifier == QtCore.Qt.ControlModifier:  # ctrl
-            pm.select(nodes, deselect=True)
-        elif key_modifier == QtCore.Qt.ShiftModifier:  # shift
-            pm.select(nodes, toggle=True)
-        elif int(key_modifier) == (QtCore.Qt.ControlModifier
-                                   | QtCore.Qt.ShiftModifier):  # ctrl + shift
-            pm.select(nodes, add=True)
-        elif key_modifier == QtCore.Qt.AltModifier:  # alt
-            pm.select(nodes)
-        elif int(key_modifier) == (QtCore.Qt.ControlModifier
-                                   | QtCore.Qt.AltModifier):  # ctrl + alt
-            pm.select(nodes, deselect=True)
-        elif int(key_modifier) == (QtCore.Qt.ShiftModifier
-                                   | QtCore.Qt.AltModifier):  # shift + alt
-            pm.select(nodes, toggle=True)
-
-            # Ctrl + alt + shift
-        elif int(key_modifier) == (QtCore.Qt.ControlModifier
-                                   | QtCore.Qt.AltModifier
-                                   | QtCore.Qt.ShiftModifier):
-            pm.select(nodes, add=True)
+        ctrl = int(QtCore.Qt.ControlModifier)
+        shift = int(QtCore.Qt.ShiftModifier)
+        alt = int(QtCore.Qt.AltModifier)
+        if key_modifier is not None:
+            key_modifier = int(key_modifier)
+        if key_modifier in (ctrl, ctrl | alt):
+            cmds.select(nodes, deselect=True)
+        elif key_modifier in (shift, shift | alt):
+            cmds.select(nodes, toggle=True)
+        elif key_modifier in (ctrl | shift, ctrl | shift | alt):
+            cmds.select(nodes, add=True)
         else:
-            pm.select(nodes)
+            # no key, alt and the other modifiers
+            cmds.select(nodes, replace=True)
 
 # ================================================
 
@@ -369,26 +362,22 @@ def quickSel(model, channel, mouse_button):
     Returns:
         None
     """
-    qs_attr = model.attr("quicksel%s" % channel)
+    rig = rigRegistry.getRigRegistry().getRig(model)
 
     if mouse_button == QtCore.Qt.LeftButton:  # Call Selection
-        names = qs_attr.get().split(",")
+        names = getNodeNames(model, rig.getQuickSel(channel))
         if not names:
             return
-        pm.select(clear=True)
-        for name in names:
-            ctl = dag.findChild(model, name)
-            if ctl:
-                ctl.select(add=True)
+        cmds.select(names, replace=True)
     elif mouse_button == QtCore.Qt.MidButton:  # Save Selection
         names = [sel.name().split("|")[-1]
                  for sel in pm.ls(selection=True)
                  if sel.name().endswith("_ctl")]
 
-        qs_attr.set(",".join(names))
+        rig.setQuickSel(channel, names)
 
     elif mouse_button == QtCore.Qt.RightButton:  # Key Selection
-        names = qs_attr.get().split(",")
+        names = rig.getQuickSel(channel)
         if not names:
             return
         else:
@@ -416,8 +405,8 @@ def selGroup(model, groupSuffix):
         model (PyNode): Rig top node
         groupSuffix (str): Set suffix name
     """
-    controlers = getControlers(model, groupSuffix)
-    pm.select(controlers)
+    rig = rigRegistry.getRigRegistry().getRig(model)
+    cmds.select(rig.getSetMemberNames(groupSuffix), replace=True)
 
 
 ##################################################
@@ -442,29 +431,12 @@ def keyObj(model, object_names):
     Returns:
         None
     """
-    with pm.UndoChunk():
-        nodes = []
-        nameSpace = getNamespace(model)
-        for name in object_names:
-            if nameSpace:
-                node = getNode(nameSpace + ":" + name)
-            else:
-                node = getNode(name)
+    rig = rigRegistry.getRigRegistry().getRig(model)
+    plugs = []
+    for name in getNodeNames(model, object_names):
+        plugs.extend(rig.getNodePlugs(name))
 
-            if not node:
-                continue
-
-            if not node and nameSpace:
-                mgear.log("Can't find object : %s:%s" % (nameSpace, name),
-                          mgear.sev_error)
-            elif not node:
-                mgear.log("Can't find object : %s" % (name), mgear.sev_error)
-            nodes.append(node)
-
-        if not nodes:
-            return
-
-        pm.setKeyframe(*nodes)
+    _keyPlugs(rig, plugs)
 
 # ================================================
 
@@ -477,8 +449,7 @@ def keyAll(model):
     Args:
         model (PyNode): Rig top node
     """
-    controlers = getControlers(model)
-    pm.setKeyframe(controlers)
+    keyGroup(model, CTRL_GRP_SUFFIX)
 
 # ================================================
 
@@ -490,8 +461,27 @@ def keyGroup(model, groupSuffix):
         model (PyNode): Rig top node
         groupSuffix (str): The group preffix
     """
-    controlers = getControlers(model, groupSuffix)
-    pm.setKeyframe(controlers)
+    rig = rigRegistry.getRigRegistry().getRig(model)
+    _keyPlugs(rig, rig.getKeyablePlugs(groupSuffix))
+
+
+def _keyPlugs(rig, plugs):
+    """Key the plugs in a single setKeyframe call
+
+    The cached plugs of the rig are dropped if some of them are not valid
+    anymore. i.e: a renamed control or a deleted attribute.
+
+    Args:
+        rig (RigData): The rig data
+        plugs (list): The plugs names
+    """
+    if not plugs:
+        return
+    try:
+        cmds.setKeyframe(plugs)
+    except (RuntimeError, ValueError):
+        rig.clearPlugs()
+        cmds.setKeyframe(cmds.ls(plugs))
 
 # ================================================
 
@@ -758,12 +748,16 @@ def spine_FKToIK(fkControls, ikControls, matchMatrix_dict=None):
 ##################################################
 
 
-def mirrorPose(flip=False, nodes=None):
+def mirrorPose(flip=False, nodes=None, mode=MIRROR_CHANNELS):
     """Summary
 
     Args:
         flip (bool, optiona): Set the function behaviout to flip
         nodes (None,  [PyNode]): Controls to mirro/flip the pose
+        mode (str, optional): MIRROR_CHANNELS inverts the channels with the
+            "inv" attributes of the controls. MIRROR_MATRIX mirrors the local
+            matrices with the mirror axis table of the rig, the controls
+            without mirror axis use the channels mode.
     """
     if nodes is None:
         nodes = pm.selected()
@@ -771,12 +765,18 @@ def mirrorPose(flip=False, nodes=None):
     pm.undoInfo(ock=1)
     try:
         nameSpace = False
+        mirrorAxisTable = None
         if nodes:
             nameSpace = getNamespace(nodes[0])
+            if mode == MIRROR_MATRIX:
+                model = getRigModel(nodes[0])
+                if model:
+                    mirrorAxisTable = getMirrorAxisTable(model)
 
         mirrorEntries = []
         for oSel in nodes:
-            mirrorEntries.extend(gatherMirrorData(nameSpace, oSel, flip))
+            mirrorEntries.extend(gatherMirrorData(nameSpace, oSel, flip,
+                                                  mirrorAxisTable))
 
         for dat in mirrorEntries:
             applyMirror(nameSpace, dat)
@@ -816,13 +816,16 @@ def applyMirror(nameSpace, mirrorEntry):
                   mgear.sev_error)
 
 
-def gatherMirrorData(nameSpace, node, flip):
+def gatherMirrorData(nameSpace, node, flip, mirrorAxisTable=None):
     """Get the data to mirror
 
     Args:
         nameSpace (str): Namespace
         node (PyNode): No
         flip (TYPE): flip option
+        mirrorAxisTable (dict, optional): The mirror axis of the controls,
+            from getMirrorAxisTable. If None the channels are inverted with
+            the "inv" attributes.
 
     Returns:
         [dict[str]: The mirror data
@@ -835,19 +838,35 @@ def gatherMirrorData(nameSpace, node, flip):
 
         oTarget = getNode(nameTarget)
 
+    else:
+        oTarget = node
+        flip = False
+
+    mirrorAxis = None
+    if mirrorAxisTable:
+        mirrorAxis = mirrorAxisTable.get(
+            stripNamespace(node.name()).split("|")[-1])
+
+    if mirrorAxis is None:
         return calculateMirrorData(node, oTarget, flip=flip)
 
-    else:
-        return calculateMirrorData(node, node, flip=False)
+    results = calculateMatrixMirrorData(node, oTarget, mirrorAxis, flip=flip)
+    attributes = [a for a in listAttrForMirror(node)
+                  if a not in SRT_CHANNELS]
+    results.extend(calculateMirrorData(node, oTarget, flip=flip,
+                                       attributes=attributes))
+    return results
 
 
-def calculateMirrorData(srcNode, targetNode, flip=False):
+def calculateMirrorData(srcNode, targetNode, flip=False, attributes=None):
     """Calculate the mirror data
 
     Args:
         srcNode (str): The source Node
         targetNode ([dict[str]]): Target node
         flip (bool, optional): flip option
+        attributes (list, optional): The attributes to mirror. If None all
+            the attributes from listAttrForMirror.
 
     Returns:
         [{"target": node, "attr": at, "val": flipVal}]
@@ -855,23 +874,25 @@ def calculateMirrorData(srcNode, targetNode, flip=False):
 
     results = []
 
+    if attributes is None:
+        attributes = listAttrForMirror(srcNode)
+
+    # the "inv" attributes are listed once instead of a query per channel
+    invAttrs = set(cmds.listAttr(srcNode.name(), userDefined=True) or [])
+
     # mirror attribute of source
-    for attrName in listAttrForMirror(srcNode):
+    for attrName in attributes:
 
         # whether does attribute "invTx" exists when attrName is "tx"
         invCheckName = getInvertCheckButtonAttrName(attrName)
-        if not pm.attributeQuery(invCheckName,
-                                 node=srcNode,
-                                 shortName=True,
-                                 exists=True):
+        if invCheckName not in invAttrs:
 
             # if not exists, straight
             inv = 1
 
         else:
             # if exists, check its value
-            invAttr = srcNode.attr(invCheckName)
-            if invAttr.get():
+            if cmds.getAttr(srcNode.name() + "." + invCheckName):
                 inv = -1
             else:
                 inv = 1
@@ -896,6 +917,162 @@ def calculateMirrorData(srcNode, targetNode, flip=False):
     return results
 
 
+def _getMirrorChannels(node, mirrorNode, mirrorAxis):
+    # mirror the local matrix and decompose it in the rotate order of the
+    # mirror node, with the euler solution closest to its current rotation
+    m = datatypes.Matrix(cmds.getAttr(node.name() + ".matrix"))
+    m = transform.getMirrorLocalMatrix(m, mirrorAxis)
+    tm = OpenMaya.MTransformationMatrix(m)
+
+    translation = tm.getTranslation(OpenMaya.MSpace.kTransform)
+
+    rotateOrder = cmds.getAttr(mirrorNode.name() + ".rotateOrder")
+    current = [math.radians(v)
+               for v in cmds.getAttr(mirrorNode.name() + ".rotate")[0]]
+    rotation = tm.eulerRotation()
+    rotation.reorderIt(rotateOrder)
+    rotation.setToClosestSolution(
+        OpenMaya.MEulerRotation(current[0], current[1], current[2],
+                                rotateOrder))
+
+    util = OpenMaya.MScriptUtil()
+    util.createFromList([1.0, 1.0, 1.0], 3)
+    ptr = util.asDoublePtr()
+    tm.getScale(ptr, OpenMaya.MSpace.kTransform)
+    scale = [OpenMaya.MScriptUtil.getDoubleArrayItem(ptr, i)
+             for i in range(3)]
+
+    return [translation.x, translation.y, translation.z,
+            math.degrees(rotation.x),
+            math.degrees(rotation.y),
+            math.degrees(rotation.z)] + scale
+
+
+def calculateMatrixMirrorData(srcNode, targetNode, mirrorAxis, flip=False):
+    """Calculate the mirror data of the translation, rotation and scale from
+    the local matrix
+
+    The local matrix is mirrored with the control mirror axis, so the result
+    doesn't depend on the "inv" attributes.
+
+    Args:
+        srcNode (PyNode): The source Node
+        targetNode (PyNode): Target node
+        mirrorAxis (list of list of int): The mirror axis of the source node
+        flip (bool, optional): flip option
+
+    Returns:
+        [{"target": node, "attr": at, "val": flipVal}]
+    """
+    results = []
+
+    # if flip enabled record self also, the mirror axis of the target is
+    # the inverse (transpose) of the source mirror axis
+    if flip:
+        values = _getMirrorChannels(targetNode, srcNode,
+                                    [list(r) for r in zip(*mirrorAxis)])
+        for attrName, val in zip(SRT_CHANNELS, values):
+            results.append({"target": srcNode,
+                            "attr": attrName,
+                            "val": val})
+
+    values = _getMirrorChannels(srcNode, targetNode, mirrorAxis)
+    for attrName, val in zip(SRT_CHANNELS, values):
+        results.append({"target": targetNode,
+                        "attr": attrName,
+                        "val": val})
+
+    return results
+
+
+def _getBindPoseMatrices(model):
+    # world matrices of the controls stored in the bind pose saved by
+    # Shifter at build time, with the guide orientations
+    plug = model.name() + ".rigPoses[0]"
+    if not cmds.objExists(plug):
+        return {}
+    poses = cmds.listConnections(plug, source=True, destination=False,
+                                 type="dagPose")
+    if not poses:
+        return {}
+
+    matrices = {}
+    members = cmds.listConnections(poses[0] + ".members",
+                                   connections=True,
+                                   source=True,
+                                   destination=False) or []
+    for memberPlug, member in zip(members[::2], members[1::2]):
+        index = memberPlug.rsplit("[", 1)[-1][:-1]
+        m = cmds.getAttr("{}.worldMatrix[{}]".format(poses[0], index))
+        matrices[stripNamespace(member).split("|")[-1]] = datatypes.Matrix(m)
+
+    return matrices
+
+
+def computeMirrorAxisTable(model):
+    """Compute the mirror axis of each control of the rig
+
+    The mirror axis maps the local axis of a control to the local axis of
+    its symmetrical control (or itself for the center controls), across the
+    YZ plane of the rig. It is derived from the rest world matrices stored
+    in the rig bind pose, so the rig doesn't need to be at rest.
+
+    Args:
+        model (PyNode): The rig top node
+
+    Returns:
+        dict: The 3x3 mirror axis by control name, without namespace. None
+            for the controls without symmetrical rest pose.
+    """
+    restMatrices = _getBindPoseMatrices(model)
+    rig = rigRegistry.getRigRegistry().getRig(model)
+
+    table = {}
+    for name in rig.getSetMemberNames(CTRL_GRP_SUFFIX):
+        name = stripNamespace(name).split("|")[-1]
+        mirrorName = name
+        if isSideElement(name):
+            mirrorName = swapSideLabel(name)
+
+        m = restMatrices.get(name)
+        mirrorM = restMatrices.get(mirrorName)
+        if m is None or mirrorM is None:
+            table[name] = None
+        else:
+            table[name] = transform.getMirrorAxis(m, mirrorM)
+
+    return table
+
+
+def getMirrorAxisTable(model):
+    """Get the mirror axis table of the rig, computed once per rig
+
+    Args:
+        model (PyNode): The rig top node
+
+    Returns:
+        dict: The 3x3 mirror axis by control name, without namespace
+    """
+    rig = rigRegistry.getRigRegistry().getRig(model)
+    if rig.mirrorAxisTable is None:
+        rig.mirrorAxisTable = computeMirrorAxisTable(model)
+    return rig.mirrorAxisTable
+
+
+def getRigModel(node):
+    """Get the rig top node of a control
+
+    Args:
+        node (PyNode): The control
+
+    Returns:
+        PyNode: The rig top node or None
+    """
+    top = node.longName().split("|")[1]
+    if cmds.attributeQuery("is_rig", node=top, exists=True):
+        return pm.PyNode(top)
+
+
 def mirrorPoseOld(flip=False, nodes=False):
     """Deprecated: Mirror pose
 
@@ -977,6 +1154,27 @@ def bindPose(model):
     pm.dagPose(dagPoseName, restore=True)
 
 
+def resetAll(model, groupSuffix=CTRL_GRP_SUFFIX):
+    """Reset the keyable channels of the controls to their default value
+
+    Args:
+        model (PyNode): Rig top node
+        groupSuffix (str, optional): The controls set suffix
+    """
+    rig = rigRegistry.getRigRegistry().getRig(model)
+    plugs = rig.getKeyablePlugs(groupSuffix)
+    values = rig.getDefaultValues(plugs)
+    with pm.UndoChunk():
+        for plug, value in zip(plugs, values):
+            if value is None:
+                continue
+            try:
+                cmds.setAttr(plug, value)
+            except RuntimeError:
+                # connected or deleted channel
+                pass
+
+
 def resetSelTrans():
     """Reset the transfom values (SRT) for the selected objects"""
     with pm.UndoChunk():
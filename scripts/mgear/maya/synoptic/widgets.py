@@ -19,6 +19,13 @@ class toggleCombo(QtWidgets.QComboBox):
     def wheelEvent(self, event):
         event.ignore()
 
+    def reset(self):
+        """Remove the items, they are filled again for the current model"""
+        self.firstUpdate = False
+        self.blockSignals(True)
+        self.clear()
+        self.blockSignals(False)
+
     # def focusInEvent(self, event):
     def enterEvent(self, event):
         self.model = utils.getModel(self)
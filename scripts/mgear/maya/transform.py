@@ -481,6 +481,69 @@ def getSymmetricalTransform(t, axis="yz", fNegScale=False):
     return t
 
 
+def getMirrorAxis(m, mirrorM, axis="yz", tolerance=1e-3):
+    """Get the local axis mapping between a transformation and its
+    symmetrical
+
+    The mapping F is the signed permutation of the local axis verifying
+    mirrorM = F * m * S, where S is the mirror plane symmetry.
+
+    Arguments:
+        m (matrix): The world matrix.
+        mirrorM (matrix): The world matrix of the symmetrical. Same as m for
+            a transformation in the mirror plane.
+        axis (str): The mirror plane.
+        tolerance (float): The tolerance to the exact symmetry.
+
+    Returns:
+        list of list of int: The 3x3 axis mapping, None if the
+            transformations are not symmetrical.
+    """
+    scale = {"yz": [-1, 1, 1], "xy": [1, 1, -1], "zx": [1, -1, 1]}[axis]
+    mirror = datatypes.Matrix([[scale[0], 0, 0, 0],
+                               [0, scale[1], 0, 0],
+                               [0, 0, scale[2], 0],
+                               [0, 0, 0, 1]])
+    f = datatypes.Matrix(mirrorM) * mirror * datatypes.Matrix(m).inverse()
+
+    mirrorAxis = []
+    columns = set()
+    for i in range(3):
+        row = [f[i][j] for j in range(3)]
+        length = math.sqrt(sum([v * v for v in row]))
+        if length < tolerance:
+            return None
+        row = [v / length for v in row]
+        rounded = [int(round(v)) for v in row]
+        if max([abs(v - r) for v, r in zip(row, rounded)]) > tolerance:
+            return None
+        columns.update([j for j in range(3) if rounded[j]])
+        mirrorAxis.append(rounded)
+
+    if len(columns) != 3:
+        return None
+
+    return mirrorAxis
+
+
+def getMirrorLocalMatrix(m, mirrorAxis):
+    """Mirror a local transformation with the axis mapping of getMirrorAxis
+
+    Arguments:
+        m (matrix): The local matrix.
+        mirrorAxis (list of list of int): The 3x3 axis mapping.
+
+    Returns:
+        matrix: The local matrix of the symmetrical.
+    """
+    f = datatypes.Matrix([list(mirrorAxis[0]) + [0],
+                          list(mirrorAxis[1]) + [0],
+                          list(mirrorAxis[2]) + [0],
+                          [0, 0, 0, 1]])
+
+    return f * datatypes.Matrix(m) * f.transpose()
+
+
 def resetTransform(node, t=True, r=True, s=True):
     """Reset the scale, rotation and translation for a given dagNode.
 
@@ -3,6 +3,7 @@
 
 import os
 import sys
+import datetime
 from functools import wraps
 
 from maya import cmds
@@ -128,12 +129,29 @@ def importFromStandardOrCustomDirectories(directories,
     except ImportError:
         moduleBasePath = getModuleBasePath(directories, moduleName)
         module_name = customFormatter.format(moduleName)
-        sys.path.append(pm.dirmap(cd=moduleBasePath))
+        moduleBasePath = pm.dirmap(cd=moduleBasePath)
+        if moduleBasePath not in sys.path:
+            sys.path.append(moduleBasePath)
         module = __import__(module_name, globals(), locals(), ["*"], -1)
 
     return module
 
 
+def logTimingReport(title, timings):
+    """Log the duration of each step of a process
+
+    Arguments:
+        title (str): Title of the report
+        timings (list): list of (step name, timedelta) tuples
+
+    """
+    mgear.log("\n" + "= {} TIMING ".format(title) + "=" * 46)
+    for step, duration in timings:
+        mgear.log("{} : [ {} ]".format(step, duration))
+    mgear.log("Total : [ {} ]".format(
+        sum([d for s, d in timings], datetime.timedelta())))
+
+
 # -----------------------------------------------------------------------------
 # Decorators
 # -----------------------------------------------------------------------------
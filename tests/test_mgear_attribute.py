@@ -4,8 +4,11 @@ import pymel.core as pm
 import mgear.maya.attribute as att
 
 from nose.tools import (
+    assert_almost_equal,
+    assert_equal,
     assert_false,
     assert_is_none,
+    assert_true,
     with_setup,
 )
 
@@ -60,3 +63,50 @@ def test_moveChannel_fullName():
         assert_is_none(
             att.moveChannel("chanName", source, "source1", "fullName")
         )
+
+
+@with_setup(source_nodes)
+def test_attributeBatch():
+    """AttributeBatch creates the attributes of several nodes at once"""
+    batch = att.AttributeBatch()
+    plugs = batch.add(["source1", "target"], "angle", "doubleAngle", 90,
+                      minValue=0, keyable=False, channelBox=True)
+    assert_equal(plugs, ["source1.angle", "target.angle"])
+    assert_is_none(batch.add("source1", "chanName", "double", 1))
+    assert_is_none(batch.add("source1", "angle", "double", 1))
+    batch.addEnum("target", "mode", 1, ["a", "b"])
+    batch.addColor("target", "tint", [1, .5, 0])
+    assert_false(cmds.objExists("target.angle"))
+
+    batch.doIt()
+    assert_almost_equal(cmds.getAttr("target.angle"), 90)
+    assert_true(cmds.getAttr("target.angle", channelBox=True))
+    assert_equal(cmds.getAttr("target.mode"), 1)
+    assert_almost_equal(cmds.getAttr("target.tint_g"), .5)
+
+    batch.undoIt()
+    assert_false(cmds.objExists("source1.angle"))
+
+
+@with_setup(source_nodes)
+def test_add_mirror_config_channels():
+    """the mirror channels are added to a list of nodes"""
+    att.add_mirror_config_channels([pm.PyNode("source1"), "target"],
+                                   [1, 0, 0, 0, 1, 0, 0, 0, 0])
+    assert_true(cmds.getAttr("target.invTx"))
+    assert_true(cmds.getAttr("source1.invRy"))
+    assert_false(cmds.getAttr("source1.invSz"))
+    assert_equal(cmds.attributeQuery("invTx", node="target", niceName=True),
+                 "Invert Mirror TX")
+
+
+@with_setup(source_nodes)
+def test_add_mirror_config_channels_undo():
+    """the default mirror channels are undoable, not the batched ones"""
+    cmds.undoInfo(state=True)
+    att.add_mirror_config_channels(pm.PyNode("source1"))
+    pm.undo()
+    assert_false(cmds.objExists("source1.invTx"))
+
+    att.add_mirror_config_channels("target", batch=True)
+    assert_true(cmds.objExists("target.invSz"))
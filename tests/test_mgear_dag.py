@@ -0,0 +1,54 @@
+from maya import cmds
+import pymel.core as pm
+
+import mgear.maya.dag as dag
+
+from nose.tools import (
+    assert_equal,
+    assert_false,
+    with_setup,
+)
+
+
+def hierarchy():
+    cmds.file(new=True, force=True)
+
+    root = pm.createNode("transform", name="rig")
+    arm = pm.createNode("transform", name="arm_L0_root", parent=root)
+    pm.createNode("transform", name="arm_L0_fk0_ctl", parent=arm)
+    pm.createNode("transform", name="arm_L0_fk1_ctl", parent=arm)
+    pm.createNode("transform", name="arm_R0_root", parent=root)
+    pm.createNode("transform", name="arm_L0_fk0_ctl", parent=None)
+
+
+@with_setup(hierarchy)
+def test_findChild():
+    """findChild only returns descendants"""
+    child = dag.findChild(pm.PyNode("rig"), "arm_L0_fk0_ctl")
+    assert_equal(child.longName(), "|rig|arm_L0_root|arm_L0_fk0_ctl")
+    assert_false(dag.findChild(pm.PyNode("arm_R0_root"), "arm_L0_fk0_ctl"))
+
+
+@with_setup(hierarchy)
+def test_findChildren_partial_and_component():
+    """findChildrenPartial and findComponentChildren"""
+    root = pm.PyNode("rig")
+    assert_equal(len(dag.findChildrenPartial(root, "ctl")), 2)
+    assert_equal(len(dag.findComponentChildren(root, "arm", "L0")), 3)
+
+
+@with_setup(hierarchy)
+def test_index_follows_scene_changes():
+    """the hierarchy index is updated on rename, reparent and delete"""
+    root = pm.PyNode("rig")
+    assert_equal(len(dag.findChildrenPartial(root, "ctl")), 2)
+
+    pm.rename("|rig|arm_L0_root|arm_L0_fk1_ctl", "arm_L0_fk1_npo")
+    pm.createNode("transform", name="arm_R0_fk0_ctl", parent="arm_R0_root")
+    assert_equal(len(dag.findChildrenPartial(root, "ctl")), 2)
+    assert_equal(len(dag.findChildrenPartial(root, "npo")), 1)
+
+    pm.parent("|arm_L0_fk0_ctl", root)
+    pm.delete("arm_R0_root")
+    assert_equal(len(dag.findChildren(root, "arm_L0_fk0_ctl")), 2)
+    assert_false(dag.findChild(root, "arm_R0_fk0_ctl"))
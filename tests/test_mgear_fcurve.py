@@ -0,0 +1,53 @@
+from maya import cmds
+import pymel.core as pm
+
+import mgear.maya.attribute as att
+import mgear.maya.fcurve as fcu
+
+from nose.tools import (
+    assert_almost_equal,
+    assert_equal,
+    with_setup,
+)
+
+
+def profile_curve():
+    cmds.file(new=True, force=True)
+
+    node = pm.createNode("transform", name="profile")
+    att.FCurveParamDef("st_profile",
+                       [[0, 0], [.3, -1], [.6, .4], [1, 0]]).create(node)
+
+
+def dg_values(fcv, division):
+    values = []
+    for i in range(division):
+        pm.setAttr(fcv + ".input", i / (division - 1.0))
+        values.append(pm.getAttr(fcv + ".output"))
+    return values
+
+
+def get_curve():
+    return pm.listConnections("profile.st_profile", type="animCurveUU")[0]
+
+
+@with_setup(profile_curve)
+def test_getFCurveValues():
+    """getFCurveValues matches the DG evaluation"""
+    fcv = get_curve()
+    values = fcu.getFCurveValues(fcv, 23)
+    assert_equal(len(values), 23)
+    for value, expected in zip(values, dg_values(fcv, 23)):
+        assert_almost_equal(value, expected, places=5)
+
+
+@with_setup(profile_curve)
+def test_getFCurveValues_weighted():
+    """getFCurveValues matches the DG evaluation on weighted tangents"""
+    fcv = get_curve()
+    pm.keyTangent(fcv, edit=True, weightedTangents=True)
+    pm.keyTangent(fcv, index=[1], edit=True, lock=False,
+                  outWeight=3, inWeight=.2)
+    for value, expected in zip(fcu.getFCurveValues(fcv, 31, 2),
+                               dg_values(fcv, 31)):
+        assert_almost_equal(value, expected * 2, places=4)
@@ -0,0 +1,45 @@
+import json
+import os
+import tempfile
+
+import mgear
+
+from nose.tools import assert_equal, with_setup
+
+
+def reset_log():
+    mgear.setLogLevel(mgear.sev_comment)
+    mgear.setLogFile()
+
+
+@with_setup(reset_log, reset_log)
+def test_log_level():
+    """the messages above the log level are ignored"""
+    mgear.setLogLevel(mgear.sev_warning)
+    mgear.log("test_log_level comment")
+    mgear.log("test_log_level warning", mgear.sev_warning)
+    messages = [r[2] for r in mgear.getLogRecords()]
+    assert "test_log_level comment" not in messages
+    assert_equal(messages[-1], "test_log_level warning")
+
+
+@with_setup(reset_log, reset_log)
+def test_buffered_log():
+    """the buffered messages are written to the file at the end"""
+    fd, filePath = tempfile.mkstemp(suffix=".jsonl")
+    os.close(fd)
+    try:
+        mgear.setLogFile(filePath)
+        with mgear.bufferedLog():
+            mgear.log("first")
+            mgear.log("second", mgear.sev_info)
+            assert_equal(os.path.getsize(filePath), 0)
+        mgear.setLogFile()
+
+        with open(filePath) as f:
+            records = [json.loads(line) for line in f]
+        assert_equal([(r["severity"], r["message"]) for r in records],
+                     [(mgear.sev_comment, "first"),
+                      (mgear.sev_info, "second")])
+    finally:
+        os.remove(filePath)
@@ -0,0 +1,73 @@
+from maya import cmds
+import pymel.core as pm
+
+import mgear.maya.node as nod
+
+from nose.tools import (
+    assert_almost_equal,
+    assert_equal,
+    assert_is_instance,
+    with_setup,
+)
+
+
+def new_scene():
+    cmds.file(new=True, force=True)
+
+    cmds.createNode("transform", name="ctl")
+    cmds.createNode("transform", name="out")
+
+
+@with_setup(new_scene)
+def test_immediate_helpers():
+    """outside of a builder the helpers return PyNodes"""
+    mul_node = nod.createMulNode("ctl.tx", 2, "out.tx")
+    assert_is_instance(mul_node, pm.PyNode)
+    cmds.setAttr("ctl.tx", 3)
+    assert_almost_equal(cmds.getAttr("out.tx"), 6)
+
+
+@with_setup(new_scene)
+def test_network_builder():
+    """the builder creates, sets and connects the network on commit"""
+    with nod.NetworkBuilder() as nb:
+        mul_node = nod.createMulNode("ctl.tx", 2)
+        rev_node = nod.createReverseNode(mul_node + ".outputX")
+        nod.createPlusMinusAverage1D([rev_node + ".outputX", 1.5],
+                                     output="out.ty")
+        assert_equal(cmds.ls(type="reverse"), [])
+
+    assert_equal(len(nb.nodes), 3)
+    assert_equal(cmds.getAttr(mul_node.name() + ".input2X"), 2)
+    cmds.setAttr("ctl.tx", .25)
+    assert_almost_equal(cmds.getAttr("out.ty"), 2)
+
+    nb.undoIt()
+    assert_equal(cmds.ls(type="reverse"), [])
+
+
+@with_setup(new_scene)
+def test_add_controller_tags():
+    """the tags of several controls are created and parented at once"""
+    cmds.createNode("transform", name="child")
+    tags = nod.add_controller_tags([("ctl", None),
+                                    ("child", "out"),
+                                    ("out", "ctl"),
+                                    ("child", "ctl")],
+                                   prepopulate=True)
+    assert_equal(tags, ["ctl_tag", "child_tag", "out_tag"])
+    assert_equal(cmds.getAttr("ctl_tag.children", multiIndices=True),
+                 [0, 1])
+    assert_equal(cmds.getAttr("child_tag.prepopulate"), True)
+
+    cmds.delete("child")
+    cmds.createNode("transform", name="child")
+    # the orphan tag of a deleted control is replaced, not renamed
+    assert_equal(nod.add_controller_tags([("child", "ctl")]), ["child_tag"])
+
+    cmds.delete("child")
+    # a tag without control made by the user
+    cmds.createNode("controller", name="group_tag")
+    assert_equal(nod.clean_orphan_controller_tags(["ctl", "child"]),
+                 ["child_tag"])
+    assert_equal(len(cmds.ls(type="controller")), 3)
@@ -0,0 +1,53 @@
+from pymel.core import datatypes
+
+import mgear.maya.transform as tra
+
+from nose.tools import (
+    assert_almost_equal,
+    assert_equal,
+    assert_is_none,
+)
+
+
+MIRROR_X = datatypes.Matrix([[-1, 0, 0, 0],
+                             [0, 1, 0, 0],
+                             [0, 0, 1, 0],
+                             [0, 0, 0, 1]])
+
+
+def test_getMirrorAxis():
+    """the mirror axis maps the local axis of the symmetrical controls"""
+    center = datatypes.Matrix()
+    assert_equal(tra.getMirrorAxis(center, center),
+                 [[-1, 0, 0], [0, 1, 0], [0, 0, 1]])
+
+    # behavior mirror: all the axis are negated
+    left = datatypes.TransformationMatrix()
+    left.setRotation(datatypes.EulerRotation(30, 0, 90, unit="degrees"))
+    left.setTranslation(datatypes.Vector(2, 1, 0), "transform")
+    left = left.asMatrix()
+    right = datatypes.Matrix(-1, 0, 0, 0,
+                             0, -1, 0, 0,
+                             0, 0, -1, 0,
+                             0, 0, 0, 1) * left * MIRROR_X
+    assert_equal(tra.getMirrorAxis(left, right),
+                 [[-1, 0, 0], [0, -1, 0], [0, 0, -1]])
+
+    # not symmetrical
+    assert_is_none(tra.getMirrorAxis(left, center))
+
+
+def test_getMirrorLocalMatrix():
+    """the local matrix of a center control is mirrored across YZ"""
+    local = datatypes.TransformationMatrix()
+    local.setRotation(datatypes.EulerRotation(10, 20, 30, unit="degrees"))
+    local.setTranslation(datatypes.Vector(1, 2, 3), "transform")
+    mirror = tra.getMirrorLocalMatrix(local.asMatrix(),
+                                      [[-1, 0, 0], [0, 1, 0], [0, 0, 1]])
+    mirror = datatypes.TransformationMatrix(mirror)
+
+    for v, e in zip(mirror.getTranslation("transform"), [-1, 2, 3]):
+        assert_almost_equal(v, e)
+    rotation = mirror.getRotation().asDegrees()
+    for v, e in zip(rotation, [10, -20, -30]):
+        assert_almost_equal(v, e)
@@ -0,0 +1,83 @@
+from maya import cmds
+import pymel.core as pm
+
+import mgear.maya.node as nod
+import mgear.maya.pickWalk as pw
+
+from nose.tools import (
+    assert_equal,
+    assert_is_none,
+    with_setup,
+)
+
+
+def new_scene():
+    cmds.file(new=True, force=True)
+    pw.clearWalkGraphs()
+
+    cmds.createNode("transform", name="rig")
+    cmds.createNode("transform", name="global_C0_ctl", parent="rig")
+    for name in ("arm_L0_ctl", "arm_R0_ctl", "spine_C0_ctl"):
+        cmds.createNode("transform", name=name, parent="global_C0_ctl")
+    # a control tagged outside of the rig
+    cmds.createNode("transform", name="other_C0_ctl")
+
+    nod.add_controller_tags([("global_C0_ctl", None),
+                             ("arm_L0_ctl", "global_C0_ctl"),
+                             ("arm_R0_ctl", "global_C0_ctl"),
+                             ("spine_C0_ctl", "global_C0_ctl"),
+                             ("other_C0_ctl", "global_C0_ctl")])
+
+
+@with_setup(new_scene)
+def test_walk_graph():
+    """the graph only holds the controls under the rig top node"""
+    graph = pw.getWalkGraph(pm.PyNode("arm_L0_ctl"))
+    glob, armL, armR, spine = [pm.PyNode(n) for n in ("global_C0_ctl",
+                                                      "arm_L0_ctl",
+                                                      "arm_R0_ctl",
+                                                      "spine_C0_ctl")]
+    assert_equal(len(graph.nodes), 4)
+    assert_is_none(graph.get(pm.PyNode("other_C0_ctl"), "parent"))
+
+    assert_is_none(graph.get(glob, "parent"))
+    assert_equal(graph.get(armL, "parent"), glob)
+    assert_equal(graph.get(glob, "children"), [armL, armR, spine])
+
+    # the siblings walk wraps around
+    assert_equal(graph.get(armL, "right"), armR)
+    assert_equal(graph.get(armL, "left"), spine)
+    assert_equal(graph.get(spine, "right"), armL)
+    assert_equal(graph.get(armR, "siblings"), [armL, armR, spine])
+
+    assert_equal(graph.get(armL, "mirror"), armR)
+    assert_equal(graph.get(armR, "mirror"), armL)
+    assert_is_none(graph.get(spine, "mirror"))
+
+
+@with_setup(new_scene)
+def test_controller_walk():
+    """the walks select the graph neighbours"""
+    armL = pm.PyNode("arm_L0_ctl")
+    pw.controllerWalkUp(armL)
+    assert_equal(pm.selected(), [pm.PyNode("global_C0_ctl")])
+
+    pw.controllerWalkDown(pm.PyNode("global_C0_ctl"), multi=True)
+    assert_equal(pm.selected(), [armL,
+                                 pm.PyNode("arm_R0_ctl"),
+                                 pm.PyNode("spine_C0_ctl")])
+
+    pw.walkMirror(armL)
+    assert_equal(pm.selected(), [pm.PyNode("arm_R0_ctl")])
+
+
+@with_setup(new_scene)
+def test_graph_rebuilt_on_tag_change():
+    """the cached graph is dropped when a tag connection changes"""
+    graph = pw.getWalkGraph(pm.PyNode("arm_L0_ctl"))
+    cmds.disconnectAttr("spine_C0_ctl_tag.parent",
+                        "global_C0_ctl_tag.children[2]")
+    newGraph = pw.getWalkGraph(pm.PyNode("arm_L0_ctl"))
+    assert_equal(len(newGraph.get(pm.PyNode("global_C0_ctl"), "children")),
+                 2)
+    assert_equal(graph is newGraph, False)
@@ -5,7 +5,10 @@ from mgear.maya.rigbits import channelWrangler
 from mgear.maya import attribute
 
 from nose.tools import (
+    assert_equal,
+    assert_false,
     assert_is_none,
+    assert_true,
     with_setup,
 )
 
@@ -51,3 +54,48 @@ def source_nodes():
 @with_setup(source_nodes)
 def test_applyChannelConfig():
     assert_is_none(channelWrangler._applyChannelConfig(self.config))
+
+
+@with_setup(source_nodes)
+def test_planChannelConfig():
+    pm.polyCube(name="armUI_L0_ctl")
+    ops = channelWrangler.planChannelConfig(self.config)
+    assert_equal(len(ops.moves), 3)
+    assert_true(ops.moves[2]["merge"])
+    assert_true(cmds.objExists("armUI_R0_ctl.shoulder_ik"))
+
+    ops.doIt()
+    assert_false(cmds.objExists("armUI_R0_ctl.shoulder_ik"))
+    assert_true(cmds.objExists("armUI_L0_ctl.shoulder_rotRef"))
+    assert_equal(cmds.listConnections("armUI_R1_ctl.ty", plugs=True),
+                 ["armUI_L0_ctl.shoulder_rotRef"])
+
+
+@with_setup(source_nodes)
+def test_chainedMoves():
+    pm.polyCube(name="armUI_L0_ctl")
+    pm.polyCube(name="armUI_C0_ctl")
+    config = dict(self.config)
+    config["map"] = [
+        ["shoulder_rotRef", "armUI_R0_ctl", "armUI_L0_ctl", 0],
+        ["shoulder_rotRef", "armUI_L0_ctl", "armUI_C0_ctl", 0]
+    ]
+    ops = channelWrangler.planChannelConfig(config)
+    assert_equal(len(ops.moves), 1)
+
+    ops.doIt()
+    assert_false(cmds.objExists("armUI_L0_ctl.shoulder_rotRef"))
+    assert_equal(cmds.listConnections("armUI_R0_ctl.ty", plugs=True),
+                 ["armUI_C0_ctl.shoulder_rotRef"])
+
+
+@with_setup(source_nodes)
+def test_applyChannelConfig_undo():
+    cmds.undoInfo(state=True)
+    pm.polyCube(name="armUI_L0_ctl")
+    channelWrangler._applyChannelConfig(self.config)
+    assert_false(cmds.objExists("armUI_R0_ctl.shoulder_ik"))
+
+    pm.undo()
+    assert_true(cmds.objExists("armUI_R0_ctl.shoulder_ik"))
+    assert_false(cmds.objExists("armUI_L0_ctl.shoulder_ik"))
@@ -0,0 +1,74 @@
+from maya import cmds
+import pymel.core as pm
+
+from mgear.maya import shifter
+from mgear.maya.shifter import guide
+
+from nose.tools import (
+    assert_equal,
+    assert_not_equal,
+    with_setup,
+)
+
+
+class BuiltRoot(object):
+    """The root of a built component, with the stored fingerprint"""
+
+    def __init__(self, fingerprint):
+        self.fingerprint = fingerprint
+
+    def attr(self, name):
+        return self
+
+    def get(self):
+        return self.fingerprint
+
+
+def guide_scene():
+    cmds.file(new=True, force=True)
+
+    rig_guide = guide.Rig()
+    rig_guide.initialHierarchy()
+    parent = rig_guide.getComponentGuide("control_01")
+    parent.draw(rig_guide.model)
+    rig_guide.getComponentGuide("control_01").draw(parent.root)
+
+
+def get_rig():
+    rig = shifter.Rig()
+    rig.guide.setFromHierarchy(pm.PyNode("guide"))
+    rig.guides = rig.guide.components
+    return rig
+
+
+def built_roots(rig):
+    return dict((name, BuiltRoot(rig.getComponentFingerprint(name)))
+                for name in rig.guide.componentsIndex)
+
+
+@with_setup(guide_scene)
+def test_getComponentFingerprint():
+    rig = get_rig()
+    fingerprint = rig.getComponentFingerprint("control_C1")
+    assert_equal(fingerprint, get_rig().getComponentFingerprint("control_C1"))
+
+    rig.guides["control_C1"].setParamDefValue("ctlSize", 2.0)
+    assert_not_equal(rig.getComponentFingerprint("control_C1"), fingerprint)
+
+
+@with_setup(guide_scene)
+def test_getDirtyComponents():
+    rig = get_rig()
+    builtRoots = built_roots(rig)
+    assert_equal(rig.getDirtyComponents(builtRoots), (set(), set()))
+
+    # the children are built again with their parent
+    rig.guides["control_C0"].setParamDefValue("ctlSize", 2.0)
+    assert_equal(rig.getDirtyComponents(builtRoots),
+                 ({"control_C0", "control_C1"}, set()))
+
+    rig = get_rig()
+    rig.guides["control_C1"].setParamDefValue("ctlSize", 2.0)
+    builtRoots["arm_L0"] = BuiltRoot("")
+    assert_equal(rig.getDirtyComponents(builtRoots),
+                 ({"control_C1"}, {"arm_L0"}))
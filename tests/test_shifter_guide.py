@@ -0,0 +1,35 @@
+from maya import cmds
+
+from mgear.maya.shifter import guide
+
+from nose.tools import (
+    assert_equal,
+    assert_false,
+    assert_true,
+    with_setup,
+)
+
+
+def new_scene():
+    cmds.file(new=True, force=True)
+
+
+@with_setup(new_scene)
+def test_snapshot():
+    """the guide snapshot is the same once loaded"""
+    rig_guide = guide.Rig()
+    rig_guide.initialHierarchy()
+    comp_guide = rig_guide.getComponentGuide("control_01")
+    comp_guide.draw(rig_guide.model)
+
+    scene_guide = guide.Rig()
+    scene_guide.setFromHierarchy(rig_guide.model)
+    snapshot = scene_guide.getSnapshot()
+    assert_equal(snapshot["componentsIndex"], ["control_C0"])
+
+    snapshot_guide = guide.Rig()
+    snapshot_guide.setFromSnapshot(snapshot)
+    assert_true(snapshot_guide.valid)
+    assert_true(snapshot_guide.fromSnapshot)
+    assert_false(scene_guide.fromSnapshot)
+    assert_equal(snapshot_guide.getSnapshot(), snapshot)